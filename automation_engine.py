@@ -0,0 +1,768 @@
+import asyncio
+import gc
+import os
+import re
+import threading
+from datetime import datetime, timedelta
+import site_profile
+from contact_index import ContactIndex
+from crawl_checkpoint import CrawlCheckpoint
+from crawl_metrics import CrawlMetrics
+from dead_letters import DeadLetterFile
+from fetch_backend import backoff_delay
+from listing_index import ListingIndex, content_hash, facility_key
+from listing_refresh import ChangeLog, changed_fields, refresh_queue, refresh_target
+from memory_governor import MemoryGovernor
+from output_sinks import export_path, open_sink, read_csv_rows
+from row_normalizer import normalize_rows, province_of
+
+# A facility cell holding only digits and date/number punctuation (or nothing) is the wrong column
+NOT_A_NAME_PATTERN = re.compile(r'^[\d\s\-./:,()]*$')
+
+
+class CrawlConfig:
+    """Everything a crawl needs, captured once before the run starts"""
+
+    def __init__(self, list_url=site_profile.LIST_URL, backend='Browser', worker_count=3,
+                 headless=False, date_filter_enabled=True, days_back=7, incremental=False,
+                 output_file='주소록_샘플.csv', index_file='listing_index.db',
+                 output_format='csv', flush_rows=25, flush_interval=5.0,
+                 requests_per_second=4.0, wait_timeout=30, resume=False,
+                 checkpoint_file='crawl_checkpoint.json', checkpoint_every=25,
+                 metrics_file=None, prometheus_file=None, shard_count=1, shard_index=0,
+                 user_data_dir=None, block_resources=True, max_retries=2, retry_backoff=1.0,
+                 dead_letter_file='dead_letters.jsonl', retry_failed=False, server_date_filter=True,
+                 probe_pages=False, contact_policy='merge', export_formats=(), since_date=None,
+                 normalize_rows=True, provinces=(), recycle_every=500, memory_limit_mb=0, refresh=False,
+                 refresh_days=14, refresh_limit=0, change_log_file='listing_changes.jsonl'):
+        self.list_url = list_url
+        self.backend = backend  # 'Browser' (Playwright) or 'HTTP' (form posts, no browser)
+        self.worker_count = max(1, int(worker_count))
+        self.headless = bool(headless)
+        self.date_filter_enabled = bool(date_filter_enabled)
+        self.days_back = int(days_back)
+        self.incremental = bool(incremental)  # Skip known listings and keep the existing template rows
+        self.output_file = output_file
+        self.index_file = index_file
+        self.output_format = output_format
+        self.flush_rows = flush_rows  # Rows buffered before a write
+        self.flush_interval = flush_interval  # Seconds before buffered rows are written anyway
+        self.requests_per_second = requests_per_second  # Politeness limit, 0 = unlimited
+        self.wait_timeout = wait_timeout  # Seconds to wait for a page element or response
+        self.resume = bool(resume)  # Continue from the last checkpoint, appending to the output
+        self.checkpoint_file = checkpoint_file
+        self.checkpoint_every = max(1, int(checkpoint_every))  # Saved rows between checkpoints
+        self.metrics_file = metrics_file  # Per-run stage timings as JSON, None to skip
+        self.prometheus_file = prometheus_file  # Same metrics in Prometheus text format, None to skip
+        self.shard_count = max(1, int(shard_count))  # Worker processes splitting the pager (see shard_coordinator)
+        self.shard_index = int(shard_index)  # This crawl handles pages shard_index + 1, + shard_count, ...
+        self.user_data_dir = user_data_dir  # Persistent browser profile (cookies, cache), None for a fresh one
+        self.block_resources = bool(block_resources)  # Skip images, fonts and stylesheets in the browser
+        self.max_retries = max(0, int(max_retries))  # Extra attempts per listing or results page
+        self.retry_backoff = retry_backoff  # Seconds before the first retry, doubled for each further one
+        self.dead_letter_file = dead_letter_file  # Listings that failed every attempt
+        self.retry_failed = bool(retry_failed)  # Only refetch the dead-letter listings instead of crawling
+        self.server_date_filter = bool(server_date_filter)  # Pass the date window to the site search when it has one
+        self.probe_pages = bool(probe_pages)  # Binary-search the pager for the last page in range before crawling
+        self.contact_policy = contact_policy  # 'keep', 'merge' or 'skip' (see contact_index.CONTACT_POLICIES)
+        self.export_formats = tuple(export_formats)  # Copies streamed next to the output (output_sinks.EXPORT_FORMATS)
+        self.since_date = since_date  # YYYY-MM-DD high-water mark of an earlier run; older listings are not new
+        self.normalize_rows = bool(normalize_rows)  # Clean emails and split the address into province/city/district
+        self.provinces = tuple(provinces)  # Only fetch listings in these provinces (row_normalizer names), () for all
+        self.recycle_every = max(0, int(recycle_every))  # Relaunch the browser after this many listings, 0 = never
+        self.memory_limit_mb = max(0, memory_limit_mb or 0)  # Recycle once Python + browser RSS reaches this, 0 = off
+        self.refresh = bool(refresh)  # Only re-check saved listings for edits and closures instead of crawling
+        self.refresh_days = max(0, int(refresh_days))  # Re-check listings posted within this many days
+        self.refresh_limit = max(0, int(refresh_limit))  # Most listings one refresh pass re-checks, 0 = all that are due
+        self.change_log_file = change_log_file  # Updated/closed events found by refresh passes
+
+    @property
+    def appending(self):
+        """Whether existing template rows are kept"""
+        return self.incremental or self.resume or self.retry_failed or self.refresh
+
+
+def days_back_cutoff(days_back, now=None):
+    """Midnight starting the oldest day inside a days_back window.
+
+    Listings only carry a date, so the window is whole days: the same
+    ones the date filter keeps (posted after the day days_back ago, as the
+    crawl has always counted them) and the same ones the site search is
+    asked for, so no boundary-day page is loaded just to be thrown away.
+    """
+    boundary = (now or datetime.now()) - timedelta(days=days_back)
+    return boundary.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+
+def date_within(date_str, cutoff_date):
+    """Whether a YYYY-MM-DD creation date is on or after cutoff_date (unparsable dates count as inside)"""
+    try:
+        return datetime.strptime(date_str, "%Y-%m-%d") >= cutoff_date
+    except ValueError:
+        return True
+
+
+async def find_last_page(backend, cutoff_date=None):
+    """Last results page worth crawling, in O(log n) page loads.
+
+    Results are newest first, so "this page has a next link and its last
+    listing is inside the date window" holds for a prefix of the pager. An
+    exponential then binary search finds the first page where it stops:
+    the page holding the cutoff, or the end of the pager. Pages past the
+    end that the site clamps to the last page have no next link either.
+    """
+    async def continues(page_index):
+        await backend.goto_page(page_index)
+        targets = await backend.read_targets()
+        if not targets or not await backend.has_next_page():
+            return False
+        return cutoff_date is None or date_within(targets[-1].creation_date, cutoff_date)
+
+    low, high = 0, 1
+    while await continues(high):
+        low, high = high, high * 2
+    while high - low > 1:
+        middle = (low + high) // 2
+        if await continues(middle):
+            low = middle
+        else:
+            high = middle
+    return high
+
+
+def create_backend(config, log, metrics=None, browser_session=None, date_from=None):
+    """Build the fetch backend named in config; heavy imports happen only here"""
+    options = {
+        'worker_count': config.worker_count,
+        'log': log,
+        'requests_per_second': config.requests_per_second,
+        'wait_timeout': config.wait_timeout,
+        'metrics': metrics,
+        'max_retries': config.max_retries,
+        'retry_backoff': config.retry_backoff,
+        'date_from': date_from if config.server_date_filter else None
+    }
+    if config.backend == 'HTTP':
+        from http_backend import HttpBackend
+        return HttpBackend(config.list_url, **options)
+    from browser_backend import BrowserBackend
+    return BrowserBackend(
+        config.list_url, headless=config.headless, session=browser_session,
+        user_data_dir=config.user_data_dir, block_resources=config.block_resources, **options
+    )
+
+
+def create_engine(config, browser_session=None):
+    """Single-process engine, or a ShardCoordinator when the crawl is split across processes"""
+    if config.shard_count > 1 and not (config.retry_failed or config.refresh):
+        from shard_coordinator import ShardCoordinator
+        return ShardCoordinator(config)  # Every worker process launches its own browser
+    return AutomationEngine(config, browser_session)
+
+
+class EngineLoop:
+    """A long-lived event loop thread for running crawls.
+
+    Playwright objects belong to the loop that created them, so a browser
+    session kept warm between runs needs every run on the same loop rather
+    than a fresh asyncio.run per run.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def submit(self, coroutine):
+        """Schedule a coroutine on the loop; returns a concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class AutomationEngine:
+    """Run the crawl on an asyncio event loop and publish progress as events.
+
+    Events are dicts shaped like the GUI's queue messages ({'type': 'log',
+    'text': ...}, 'stats_update', 'current_job', 'date_cutoff', 'error',
+    'throughput', 'last_page', 'complete', and 'finished' once the run has fully shut down). Subscribers are called on the engine's thread, so they
+    should only hand events off (e.g. queue.Queue.put).
+    """
+
+    def __init__(self, config, browser_session=None):
+        self.config = config
+        self.browser_session = browser_session  # Warm browser kept by the caller between runs
+        self.subscribers = []
+        self.stop_requested = False
+        self.date_cutoff_reached = False
+        self.last_page = None  # No page after this one needs crawling (set by other shards)
+        self.total_saved = 0
+        self.total_merged = 0  # Rows not written because their contact was already in the template
+        self.high_water_mark = None  # Newest creation date saved by this run
+        self.current_page = 1
+        self.current_job_index = 0
+        self.total_jobs_on_page = 0
+        self.unindexed_jobs = []  # (listing ID, facility key, row) not yet checkpointed into the listing index
+        self.column_warnings = set()  # Results-list columns already reported as looking wrong this run
+        self.contacts = ContactIndex()
+        self.checkpoint = CrawlCheckpoint(config.checkpoint_file)
+        self.dead_letters = DeadLetterFile(config.dead_letter_file)
+        self.cutoff_date = None
+        self.backend = None
+        self.metrics = CrawlMetrics()
+        # Recycling on count is for the browser's tab history; an HTTP crawl only recycles on the memory limit
+        self.memory = MemoryGovernor(
+            config.recycle_every if config.backend == 'Browser' else 0, config.memory_limit_mb
+        )
+        self.current_job_data = {
+            'title': '',
+            'name': '',
+            'region': '',
+            'email': '',
+            'facility_type': '',
+            'creation_date': ''
+        }
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def emit(self, event_type, **kwargs):
+        event = {'type': event_type, **kwargs}
+        for callback in self.subscribers:
+            callback(event)
+
+    def log(self, text):
+        self.emit('log', text=text)
+
+    def request_stop(self):
+        """Ask the crawl to stop; safe to call from any thread"""
+        self.stop_requested = True
+
+    def limit_pages(self, last_page):
+        """Skip pages after last_page; safe to call from any thread"""
+        if not self.last_page or last_page < self.last_page:
+            self.last_page = last_page
+
+    def run_sync(self):
+        """Run the crawl to completion on a fresh event loop (for worker threads)"""
+        asyncio.run(self.run())
+
+    def is_date_within_range(self, job_date_str):
+        """Check if job creation date is within the configured range"""
+        if not self.config.date_filter_enabled:
+            return True  # Date filter disabled, process all jobs
+        # Compared with the cutoff computed once per run; unparsable dates are included
+        return date_within(job_date_str, self.cutoff_date)
+
+    def open_output(self):
+        """Open the template sink, keeping existing rows only for incremental runs"""
+        config = self.config
+        csv_filename = config.output_file
+        if not os.path.exists(csv_filename):
+            self.log(f"📄 Creating new template file: {csv_filename}")
+        elif config.retry_failed:
+            self.log(f"🔁 Retry pass: appending recovered listings to {csv_filename}")
+        elif config.refresh:
+            self.log(f"🔄 Refresh pass: {csv_filename} is left as it is, changes go to {config.change_log_file}")
+        elif config.resume:
+            self.log(f"⏯️ Resuming: appending to {csv_filename}")
+        elif config.incremental:
+            self.log(f"♻️ Incremental run: appending new listings to {csv_filename}")
+        else:
+            self.log(f"📄 Updating existing template file: {csv_filename}")
+        if config.export_formats:
+            self.log(f"📦 Also streaming rows to: {', '.join(export_path(csv_filename, fmt) for fmt in config.export_formats)}")
+        return open_sink(
+            csv_filename, config.output_format, config.export_formats, append=config.appending,
+            flush_rows=config.flush_rows, flush_interval=config.flush_interval,
+            transform=normalize_rows if config.normalize_rows else None
+        )
+
+    def checkpoint_output(self, sink, index):
+        """Make buffered rows durable, then mark them as saved in the listing index"""
+        if not sink.checkpoint():
+            self.log(f"⚠️ Could not update {sink.path} (open in another program?) - rows are kept in {sink.path}.partial")
+        for listing_id, facility, job_data in self.unindexed_jobs:
+            index.record(listing_id, job_data, facility)
+        self.unindexed_jobs = []
+
+    def save_checkpoint(self, sink, index):
+        """Make saved rows durable and record where the crawl is"""
+        with self.metrics.stage('checkpoint'):
+            self.checkpoint_output(sink, index)
+            self.checkpoint.save(
+                current_page=self.current_page,
+                current_job_index=self.current_job_index,
+                saved_rows=self.total_saved,
+                output_file=self.config.output_file,
+                list_url=self.config.list_url,
+                filters={
+                    site_profile.DEADLINE_FIELD: site_profile.HIRING_VALUE,
+                    'date_filter_enabled': self.config.date_filter_enabled,
+                    'days_back': self.config.days_back,
+                    'cutoff_date': self.cutoff_date.isoformat()
+                }
+            )
+
+    def load_resume_point(self):
+        """Restore counters and filters from the checkpoint; returns the page to start on"""
+        config = self.config
+        first_page = config.shard_index + 1
+        if not config.resume:
+            return first_page
+        state = self.checkpoint.load()
+        if not state:
+            self.log(f"⏯️ No checkpoint found - starting from page {first_page}")
+            return first_page
+        if state.get('output_file') != config.output_file:
+            self.log(f"⚠️ Checkpoint belongs to {state.get('output_file')} - starting from page {first_page}")
+            return first_page
+        filters = state.get('filters', {})
+        config.date_filter_enabled = filters.get('date_filter_enabled', config.date_filter_enabled)
+        config.days_back = filters.get('days_back', config.days_back)
+        if filters.get('cutoff_date'):
+            # Keep the original window even when resuming on a later day
+            self.cutoff_date = datetime.fromisoformat(filters['cutoff_date'])
+        self.total_saved = state.get('saved_rows', 0)
+        self.emit('stats_update', total_saved=self.total_saved)
+        self.log(f"⏯️ Resuming from page {state['current_page']} (job {state.get('current_job_index', 0)}, {self.total_saved} rows saved)")
+        return int(state['current_page'])
+
+    async def run(self):
+        try:
+            await self.crawl()
+        except Exception as e:
+            self.emit('error', text=f"Automation error: {str(e)}")
+            self.log(f"❌ Error: {str(e)}")
+        finally:
+            self.emit('finished')
+
+    async def crawl(self):
+        config = self.config
+        self.cutoff_date = days_back_cutoff(config.days_back)
+        if config.since_date:
+            # Same-day listings may have been posted after the last run, so the mark's day is included
+            self.cutoff_date = max(self.cutoff_date, datetime.strptime(config.since_date, "%Y-%m-%d"))
+        start_page = self.load_resume_point()
+        sink = self.open_output()
+
+        # Log fetch backend and browser mode setting
+        if config.backend == 'HTTP':
+            self.log("🔌 Fetch backend: HTTP (no browser)")
+        else:
+            mode_text = "Hidden (Headless)" if config.headless else "Visible"
+            self.log(f"🌐 Browser mode: {mode_text}")
+
+        # Log date filter settings
+        if config.date_filter_enabled and config.since_date:
+            self.log(f"📅 Smart cutoff enabled: Will stop at jobs older than {self.cutoff_date:%Y-%m-%d} (last run's newest listing)")
+        elif config.date_filter_enabled:
+            self.log(f"📅 Smart cutoff enabled: Will stop when jobs older than {config.days_back} days are found")
+        else:
+            self.log("📅 Smart cutoff disabled: Processing all jobs")
+        if config.provinces:
+            self.log(f"🗺️ Only crawling listings in: {', '.join(config.provinces)}")
+
+        index = ListingIndex(config.index_file)
+        self.load_contacts(index)
+        backend = self.backend = create_backend(
+            config, self.log, self.metrics, self.browser_session, self.search_date_from()
+        )
+        try:
+            if config.retry_failed:
+                await self.retry_dead_letters(backend, index, sink)
+                return
+            if config.refresh:
+                await self.refresh_listings(backend, index)
+                return
+            await self.crawl_pages(backend, index, sink, start_page)
+        finally:
+            await backend.close()
+            sink.close()
+            for listing_id, facility, job_data in self.unindexed_jobs:
+                index.record(listing_id, job_data, facility)
+            index.close()
+            if self.total_merged:
+                self.log(f"👥 {self.total_merged} listings shared a contact with an earlier row and were not written")
+            self.export_metrics()
+
+        if self.stop_requested and not self.date_cutoff_reached:
+            self.log(f"💾 Progress saved at page {self.current_page} - use Resume to continue")
+        else:
+            self.checkpoint.clear()
+        if not self.stop_requested and not self.date_cutoff_reached:
+            self.emit('complete')
+            self.log(f"📄 Results saved to original template: {config.output_file}")
+
+    def load_contacts(self, index):
+        """Seed the contact index from the template rows being appended to (and, to skip, the captured facilities)"""
+        config = self.config
+        if config.contact_policy == 'keep' or not config.appending or config.refresh:
+            return  # A fresh template has no contacts yet, and a refresh pass writes no rows
+        if config.output_format == 'csv' and os.path.exists(config.output_file):
+            self.contacts.load_rows(read_csv_rows(config.output_file))
+        if config.contact_policy == 'skip':
+            self.contacts.load_facilities(index.captured_facilities(self.search_date_from()))
+        self.log(f"👥 {len(self.contacts.contacts)} contacts and {len(self.contacts.facilities)} facilities already captured")
+
+    def skip_captured_facilities(self, targets):
+        """Drop listings from facilities that already have a contact, including repeats on this page"""
+        odd = [target.facility_name for target in targets if NOT_A_NAME_PATTERN.match(target.facility_name or '')]
+        if len(odd) * 2 > len(targets):
+            self.warn_column('facility_name', f"{len(odd)} of {len(targets)} facility cells on page "
+                                              f"{self.current_page} are empty or not names (e.g. {odd[0]!r}), "
+                                              f"so facilities can't be matched")
+        kept = []
+        page_facilities = set()
+        for target in targets:
+            facility = facility_key(target.facility_name, target.area)
+            if self.contacts.has_facility(facility) or facility in page_facilities:
+                continue
+            if facility:
+                page_facilities.add(facility)
+            kept.append(target)
+        skipped = len(targets) - len(kept)
+        if skipped:
+            self.metrics.increment('facilities_skipped', skipped)
+            self.log(f"👥 Skipping {skipped} listings from facilities already captured")
+        return kept
+
+    def warn_column(self, column, message):
+        """Log once per run that a results-list column doesn't hold what site_profile expects"""
+        self.metrics.increment(f'{column}_column_warnings')
+        if column not in self.column_warnings:
+            self.column_warnings.add(column)
+            self.log(f"⚠️ {message} - check site_profile.{column.upper()}_SELECTOR against the live site")
+
+    def filter_provinces(self, targets):
+        """Drop listings outside the configured provinces, going by the area column of the results list"""
+        provinces = [province_of(target.area) for target in targets]
+        if not any(provinces):
+            self.warn_column('area', f"No area cell on page {self.current_page} names a province "
+                                     f"(e.g. {targets[0].area!r}), so every listing is skipped")
+        kept = [target for target, province in zip(targets, provinces) if province in self.config.provinces]
+        skipped = len(targets) - len(kept)
+        if skipped:
+            self.metrics.increment('province_skipped', skipped)
+            self.log(f"🗺️ Skipping {skipped} listings outside {', '.join(self.config.provinces)}")
+        return kept
+
+    def search_date_from(self):
+        """Date window start for the site's own search, None when the date filter is off"""
+        if not self.config.date_filter_enabled:
+            return None
+        return self.cutoff_date.strftime("%Y-%m-%d")
+
+    async def probe_last_page(self, backend):
+        """Find the last page in range and limit the crawl to it"""
+        cutoff_date = self.cutoff_date if self.config.date_filter_enabled else None
+        with self.metrics.stage('probe'):
+            last_page = await find_last_page(backend, cutoff_date)
+        self.limit_pages(last_page)
+        self.log(f"🔎 Listings in range end on page {last_page}")
+        self.emit('stats_update', total_pages=last_page)
+
+    async def retry_dead_letters(self, backend, index, sink):
+        """Targeted pass: refetch only the listings in the dead-letter file"""
+        entries = self.dead_letters.targets()
+        if not entries:
+            self.log("🔁 No failed listings to retry")
+            self.emit('complete')
+            return
+        self.log(f"🔁 Retrying {len(entries)} failed listings")
+        await backend.open()
+        targets = [target for target, _ in entries]
+        self.total_jobs_on_page = len(targets)
+        self.emit('stats_update', current_job_index=0, total_jobs_on_page=self.total_jobs_on_page)
+        recovered = []
+        async for target, detail, error in backend.fetch_details(targets):
+            if self.stop_requested:
+                backend.cancel_pending()
+                break
+            self.current_job_index += 1
+            self.emit('stats_update', current_job_index=self.current_job_index)
+            if error is not None:
+                self.log(f"❌ Still failing: {target.title}: {str(error)}")
+                continue
+            recovered.append(target.listing_id)
+            if detail is not None:
+                self.save_job(sink, target, detail)
+        self.checkpoint_output(sink, index)
+        self.dead_letters.remove(recovered)
+        self.log(f"🔁 Recovered {len(recovered)} of {len(targets)} listings")
+        if not self.stop_requested:
+            self.emit('complete')
+
+    async def refresh_listings(self, backend, index):
+        """Refresh pass: re-open saved listings that are due and log edits and closures instead of saving rows"""
+        config = self.config
+        since_date = (datetime.now() - timedelta(days=config.refresh_days)).strftime("%Y-%m-%d")
+        due = refresh_queue(index.refresh_candidates(since_date), datetime.now(), config.refresh_limit)
+        if not due:
+            self.log(f"🔄 No saved listings posted since {since_date} are due for a re-check")
+            self.emit('complete')
+            return
+        self.log(f"🔄 Re-checking {len(due)} saved listings posted since {since_date}, newest first")
+        await backend.open()
+        saved = {candidate['listing_id']: candidate for candidate in due}
+        change_log = ChangeLog(config.change_log_file)
+        self.total_jobs_on_page = len(due)
+        self.emit('stats_update', current_job_index=0, total_jobs_on_page=self.total_jobs_on_page)
+        outcomes = {'updated': 0, 'closed': 0, 'unchanged': 0, 'failed': 0}
+        async for target, detail, error in backend.fetch_details([refresh_target(candidate) for candidate in due]):
+            if self.stop_requested:
+                backend.cancel_pending()
+                break
+            self.current_job_index += 1
+            self.emit('stats_update', current_job_index=self.current_job_index)
+            candidate = saved[target.listing_id]
+            if error is not None:
+                outcomes['failed'] += 1
+                self.log(f"❌ Could not re-check {target.title}: {str(error)}")
+                continue
+            if detail is None:
+                outcomes['closed'] += 1
+                index.record_check(target.listing_id, 'closed')
+                change_log.add('closed', candidate)
+                self.log(f"🚫 No longer listed: {target.title}")
+                continue
+            job_data = {'title': candidate['title'], 'creation_date': candidate['creation_date'], **detail}
+            if content_hash(job_data) == candidate['content_hash']:
+                outcomes['unchanged'] += 1
+                index.record_check(target.listing_id)
+                continue
+            outcomes['updated'] += 1
+            changes = changed_fields(candidate, job_data)
+            index.record(target.listing_id, job_data)
+            index.record_check(target.listing_id, changed=True)
+            change_log.add('updated', candidate, changes)
+            described = ', '.join(f"{field}: {before or '-'} → {after or '-'}" for field, (before, after) in changes.items())
+            self.log(f"✏️ Changed: {target.title} ({described or 'formatting only'})")
+        for outcome, count in outcomes.items():
+            self.metrics.increment(f'refresh_{outcome}', count)
+        self.log(
+            f"🔄 Re-checked {sum(outcomes.values())} listings: {outcomes['updated']} changed, "
+            f"{outcomes['closed']} closed, {outcomes['unchanged']} unchanged, {outcomes['failed']} failed"
+        )
+        if not self.stop_requested:
+            self.emit('complete')
+
+    async def retry_page(self, backend, page_index, action):
+        """Run a results-page step, re-navigating to page_index and retrying with backoff when it fails"""
+        for attempt in range(self.config.max_retries + 1):
+            try:
+                return await action()
+            except Exception as e:
+                if attempt == self.config.max_retries or self.stop_requested:
+                    raise
+                delay = backoff_delay(self.config.retry_backoff, attempt)
+                self.metrics.increment('page_retries')
+                self.log(f"🔁 Page {page_index} failed ({str(e) or type(e).__name__}) - reloading it in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                try:
+                    await backend.recover_results(page_index)
+                except Exception as recovery_error:
+                    self.log(f"⚠️ Could not reload page {page_index}: {str(recovery_error)}")
+
+    def export_metrics(self):
+        """Write the run's stage timings to the configured metrics files"""
+        config = self.config
+        try:
+            if config.metrics_file:
+                self.metrics.write_json(
+                    config.metrics_file, backend=config.backend, worker_count=config.worker_count,
+                    requests_per_second=config.requests_per_second, pages=self.current_page,
+                    total_saved=self.total_saved
+                )
+            if config.prometheus_file:
+                self.metrics.write_prometheus(config.prometheus_file)
+        except OSError as e:
+            self.log(f"⚠️ Could not write metrics: {str(e)}")
+
+    def emit_throughput(self):
+        remaining = self.total_jobs_on_page - self.current_job_index
+        self.emit(
+            'throughput',
+            listings_per_minute=self.metrics.throughput() * 60,
+            page_eta=self.metrics.eta(remaining) if remaining > 0 else 0
+        )
+
+    async def crawl_pages(self, backend, index, sink, start_page=1):
+        config = self.config
+        with self.metrics.stage('open'):
+            await backend.open()
+        if config.probe_pages:
+            await self.probe_last_page(backend)
+        if start_page > 1 or config.probe_pages:
+            # The probe leaves the backend on whatever page it looked at last
+            self.log(f"⏩ Jumping to page {start_page}...")
+            await self.retry_page(backend, start_page, lambda: backend.goto_page(start_page))
+            self.current_page = start_page
+            self.emit('stats_update', current_page=self.current_page)
+        if self.memory.sample() is None and config.memory_limit_mb:
+            self.log(f"⚠️ Memory use can't be measured here, so the {config.memory_limit_mb:.0f} MB limit "
+                     f"won't trigger a recycle (install psutil)")
+        self.report_memory()
+        while not self.stop_requested and not self.date_cutoff_reached:
+            if self.last_page and self.current_page > self.last_page:
+                self.log(f"🏁 Page {self.current_page} is past the last page to crawl ({self.last_page})")
+                break
+            self.log(f"📄 Processing page {self.current_page}")
+            self.metrics.increment('pages')
+            targets = await self.retry_page(backend, self.current_page, backend.read_targets)
+            self.total_jobs_on_page = len(targets)
+            self.current_job_index = 0
+            self.emit('stats_update', current_job_index=0, total_jobs_on_page=self.total_jobs_on_page)
+            if self.total_jobs_on_page == 0:
+                self.log("⚠️ No job listings found on this page")
+                self.emit('last_page', page=self.current_page - 1)
+                break
+
+            # Check dates before any navigation - listings are newest first
+            old_job = None
+            for position, target in enumerate(targets):
+                if not self.is_date_within_range(target.creation_date):
+                    old_job = target
+                    targets = targets[:position]
+                    break
+
+            if config.appending and targets:
+                known = index.known_ids([target.listing_id for target in targets])
+                index.touch(known)
+                if config.incremental and len(known) == len(targets) and old_job is None:
+                    self.log(f"♻️ All {len(targets)} listings on this page are already saved - stopping early")
+                    self.emit('last_page', page=self.current_page)
+                    break
+                if known:
+                    self.log(f"♻️ Skipping {len(known)} already saved listings")
+                    targets = [target for target in targets if target.listing_id not in known]
+
+            if config.provinces and targets:
+                targets = self.filter_provinces(targets)
+
+            if config.contact_policy == 'skip' and targets:
+                targets = self.skip_captured_facilities(targets)
+
+            self.memory.note_listings(len(targets))
+            self.log(f"🔄 Processing {len(targets)} jobs across {config.worker_count} workers")
+            async for target, detail, error in backend.fetch_details(targets):
+                if self.stop_requested:
+                    backend.cancel_pending()
+                    break
+                self.current_job_index += 1
+                self.emit('stats_update', current_job_index=self.current_job_index)
+                if error is not None:
+                    self.log(f"❌ Error processing job {target.title}: {str(error)} - kept for a retry pass")
+                    self.dead_letters.add(target, error, self.current_page)
+                    continue
+                self.log(f"📋 Job title: {target.title}")
+                if detail is None:
+                    continue
+                # A merged row leaves total_saved where it was, and the checkpoint with it
+                if self.save_job(sink, target, detail) and self.total_saved % config.checkpoint_every == 0:
+                    self.save_checkpoint(sink, index)
+
+            self.save_checkpoint(sink, index)
+
+            if old_job is not None and not self.stop_requested:
+                self.current_job_data['title'] = old_job.title
+                self.current_job_data['creation_date'] = old_job.creation_date
+                self.emit('current_job', data=dict(self.current_job_data))
+                self.log(f"🛑 Found old job: {old_job.title} (Created: {old_job.creation_date})")
+                self.log(f"📊 Final Results: {self.total_saved} jobs saved from recent listings")
+                self.date_cutoff_reached = True
+                self.emit('last_page', page=self.current_page)  # Later pages are older still
+                self.emit('date_cutoff')  # Trigger stop
+
+            # If we hit date cutoff, break out of page loop too
+            if self.stop_requested or self.date_cutoff_reached:
+                break
+
+            if not await self.advance_page(backend):
+                break
+            await self.govern_memory(backend)
+            self.current_job_index = 0
+            self.emit('stats_update', current_page=self.current_page)
+            self.save_checkpoint(sink, index)
+
+    def report_memory(self):
+        sample = self.memory.last_sample
+        if sample is None:
+            return
+        self.metrics.set_gauge('memory_mb', sample['total_mb'])
+        self.metrics.set_gauge('browser_memory_mb', sample['browser_mb'])
+        self.emit('stats_update', memory_mb=sample['total_mb'], recycles=self.memory.recycles)
+
+    async def govern_memory(self, backend):
+        """Report memory use, and recycle the backend on the page it just reached when the governor says so"""
+        reason = self.memory.recycle_reason()
+        self.report_memory()
+        if reason is None:
+            return
+        self.log(f"♻️ Recycling the {backend.name} backend ({reason}) - resuming on page {self.current_page}")
+        with self.metrics.stage('recycle'):
+            await backend.recycle(self.current_page)
+        gc.collect()  # Large page strings and parse trees from the old session go now, not at the next full pass
+        self.memory.recycled()
+        self.metrics.increment('backend_recycles')
+        self.memory.sample()
+        self.report_memory()
+
+    async def advance_page(self, backend):
+        """Move to the next page this crawl owns; False when there is none"""
+        if self.config.shard_count == 1:
+            self.log("➡️ Moving to next page...")
+            next_page = self.current_page + 1
+            try:
+                moved = await backend.next_page()
+            except Exception as e:
+                # Going straight to the page is the retry; a second next_page could skip one
+                self.log(f"⚠️ Moving to page {next_page} failed: {str(e) or type(e).__name__}")
+                await self.retry_page(backend, next_page, lambda: backend.recover_results(next_page))
+                moved = True
+            if not moved:
+                self.log("🏁 No more pages found. Automation complete.")
+                return False
+            self.current_page = next_page
+            return True
+        if not await backend.has_next_page():
+            self.emit('last_page', page=self.current_page)
+            self.log("🏁 No more pages found. Automation complete.")
+            return False
+        next_page = self.current_page + self.config.shard_count
+        if self.last_page and next_page > self.last_page:
+            self.log(f"🏁 Page {next_page} is past the last page to crawl ({self.last_page})")
+            return False
+        self.log(f"➡️ Moving to page {next_page}...")
+        await self.retry_page(backend, next_page, lambda: backend.goto_page(next_page))
+        self.current_page = next_page
+        return True
+
+    def save_job(self, sink, target, detail):
+        """Write a fetched listing to the sink; False when it was folded into an earlier row of the same contact"""
+        self.current_job_data = {
+            'title': target.title,
+            'creation_date': target.creation_date,
+            **detail
+        }
+        self.emit('current_job', data=dict(self.current_job_data))
+
+        if target.creation_date > (self.high_water_mark or ''):
+            self.high_water_mark = target.creation_date
+        facility = facility_key(target.facility_name, target.area)
+        self.unindexed_jobs.append((target.listing_id, facility, self.current_job_data))
+        if self.config.contact_policy != 'keep' and not self.contacts.add(self.current_job_data, facility):
+            self.total_merged += 1
+            self.metrics.increment('contacts_merged')
+            self.log(f"👥 Same contact as an earlier row, not written: {target.title}")
+            return False
+        with self.metrics.stage('write'):
+            sink.write_row(self.current_job_data)
+        self.total_saved += 1
+        self.metrics.increment('listings_saved')
+        self.emit('stats_update', total_saved=self.total_saved)
+        self.emit_throughput()
+        self.log(f"✅ Saved to template: {target.title} (Created: {target.creation_date})")
+        return True
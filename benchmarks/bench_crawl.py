@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Offline crawl benchmark.
+Serves generated list/detail pages from the local fixture server (with
+simulated latency), drives AutomationEngine end to end and reports
+listings/sec, per-listing latency percentiles, peak RSS and startup time.
+
+    python benchmarks/bench_crawl.py --backend HTTP --pages 10 --detail-latency-ms 150 --workers 6
+    python benchmarks/bench_crawl.py --backend both --json bench.json --min-throughput 5
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from automation_engine import AutomationEngine, CrawlConfig
+from fixture_server import FixtureSite, start_fixture_server
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class RssSampler:
+    """Peak resident memory of this process plus its children (the browser), sampled in the background"""
+
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self.peak = 0
+        self.running = False
+        self.thread = None
+
+    def current(self):
+        process = psutil.Process()
+        total = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    def start(self):
+        if psutil is None:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self.sample)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def sample(self):
+        while self.running:
+            self.peak = max(self.peak, self.current())
+            time.sleep(self.interval)
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join()
+        if self.peak:
+            return self.peak / (1024 * 1024)
+        if resource is not None:
+            # ru_maxrss is KB on Linux; children only count once they have exited
+            usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            usage += resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+            return usage / 1024
+        return None
+
+
+def measure_browser_launch(headless=True):
+    """Seconds to start Playwright and launch Chromium, or None when Playwright is missing"""
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        return None
+    started = time.perf_counter()
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless)
+        elapsed = time.perf_counter() - started
+        browser.close()
+    return elapsed
+
+
+def run_benchmark(backend, args, list_url, work_dir):
+    config = CrawlConfig(
+        list_url=list_url,
+        backend=backend,
+        worker_count=args.workers,
+        headless=True,
+        date_filter_enabled=False,
+        output_file=os.path.join(work_dir, f'bench_{backend}.csv'),
+        index_file=os.path.join(work_dir, f'bench_{backend}.db'),
+        checkpoint_file=os.path.join(work_dir, f'bench_{backend}.json'),
+        dead_letter_file=os.path.join(work_dir, f'bench_{backend}_dead_letters.jsonl'),
+        change_log_file=os.path.join(work_dir, f'bench_{backend}_changes.jsonl'),
+        requests_per_second=args.rate,
+        contact_policy='keep'  # The fixture reuses 40 contact emails; every listing should count as saved
+    )
+    engine = AutomationEngine(config)
+    first_page_at = []
+    errors = []
+
+    def on_event(event):
+        if event['type'] == 'log' and not first_page_at and event['text'].startswith('📄 Processing page'):
+            first_page_at.append(time.perf_counter())
+        elif event['type'] == 'error':
+            errors.append(event['text'])
+
+    engine.subscribe(on_event)
+    sampler = RssSampler()
+    sampler.start()
+    started = time.perf_counter()
+    engine.run_sync()
+    elapsed = time.perf_counter() - started
+    peak_rss = sampler.stop()
+
+    detail = engine.metrics.stages.get('detail')
+    crawl_time = elapsed - ((first_page_at[0] - started) if first_page_at else 0)
+    return {
+        'backend': backend,
+        'workers': args.workers,
+        'listings': engine.total_saved,
+        'errors': errors,
+        'elapsed_s': round(elapsed, 3),
+        'startup_s': round(first_page_at[0] - started, 3) if first_page_at else None,
+        'listings_per_s': round(engine.total_saved / crawl_time, 2) if crawl_time > 0 else 0.0,
+        'p50_listing_s': round(detail.percentile(50), 3) if detail else 0.0,
+        'p95_listing_s': round(detail.percentile(95), 3) if detail else 0.0,
+        'peak_rss_mb': round(peak_rss, 1) if peak_rss else None,
+        'browser_launch_s': round(measure_browser_launch(), 3) if backend == 'Browser' and args.launch else None,
+        'stages': engine.metrics.snapshot()['stages']
+    }
+
+
+def print_report(results):
+    columns = ['backend', 'workers', 'listings', 'listings_per_s', 'p50_listing_s', 'p95_listing_s',
+               'startup_s', 'peak_rss_mb', 'browser_launch_s']
+    widths = [max(len(column), *(len(str(result[column])) for result in results)) for column in columns]
+    print('  '.join(column.ljust(width) for column, width in zip(columns, widths)))
+    for result in results:
+        print('  '.join(str(result[column]).ljust(width) for column, width in zip(columns, widths)))
+        for error in result['errors']:
+            print(f"  ❌ {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the crawl engine against the local fixture server')
+    parser.add_argument('--backend', choices=['Browser', 'HTTP', 'both'], default='HTTP')
+    parser.add_argument('--workers', type=int, default=3)
+    parser.add_argument('--pages', type=int, default=5)
+    parser.add_argument('--rows', type=int, default=10)
+    parser.add_argument('--list-latency-ms', type=float, default=100)
+    parser.add_argument('--detail-latency-ms', type=float, default=100)
+    parser.add_argument('--jitter', type=float, default=0.2)
+    parser.add_argument('--rate', type=float, default=0, help='engine rate limit, 0 for unlimited (default: 0)')
+    parser.add_argument('--no-launch', dest='launch', action='store_false',
+                        help='skip the separate browser launch measurement')
+    parser.add_argument('--json', help='also write the results to this JSON file')
+    parser.add_argument('--min-throughput', type=float, default=None,
+                        help='exit with status 1 if any backend is slower than this many listings/sec')
+    args = parser.parse_args()
+
+    site = FixtureSite(
+        pages=args.pages, rows_per_page=args.rows,
+        list_latency=args.list_latency_ms / 1000, detail_latency=args.detail_latency_ms / 1000, jitter=args.jitter
+    )
+    server, list_url = start_fixture_server(site)
+    backends = ['HTTP', 'Browser'] if args.backend == 'both' else [args.backend]
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as work_dir:
+            for backend in backends:
+                results.append(run_benchmark(backend, args, list_url, work_dir))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print_report(results)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as json_file:
+            json.dump(results, json_file, ensure_ascii=False, indent=2)
+
+    failed = any(result['errors'] or result['listings'] < site.total for result in results)
+    if args.min_throughput is not None:
+        failed = failed or any(result['listings_per_s'] < args.min_throughput for result in results)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
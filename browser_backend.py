@@ -0,0 +1,239 @@
+import asyncio
+import site_profile
+from browser_session import BrowserSession
+from fetch_backend import GONE_STATUSES, FetchBackend
+from job_parser import DETAIL_MIN_ROWS, extract_detail, make_listing_row
+
+# Ready once the detail table is filled in, or once the page has finished loading without one: a taken-down
+# listing (no table, or a short "closed" notice table) then reaches extract_detail, which returns None
+DETAIL_READY_SCRIPT = """minRows => {
+    const table = document.querySelector('table');
+    if (table && table.querySelectorAll('tbody tr').length >= minRows) return true;
+    return document.readyState === 'complete';
+}"""
+# [tag, text, leading text node] for every cell of the first table's body rows
+DETAIL_CELLS_SCRIPT = """() => {
+    const table = document.querySelector('table');
+    if (!table) return null;
+    const rows = table.tBodies.length ? [...table.tBodies].flatMap(body => [...body.rows]) : [...table.rows];
+    return rows.map(row => [...row.cells].map(cell => {
+        const first = cell.firstChild;
+        const leading = first && first.nodeType === Node.TEXT_NODE ? first.textContent : '';
+        return [cell.tagName.toLowerCase(), cell.textContent, leading];
+    }));
+}"""
+LIST_READY_SCRIPT = "() => typeof fnGoBoardSl === 'function'"
+# One round trip for the whole results table: [title, onclick, creation date] per row
+RESULT_ROWS_SCRIPT = """(rows, [linkSelector, ...cellSelectors]) => rows.map(row => {
+    const link = row.querySelector(linkSelector);
+    if (!link) return null;
+    const text = selector => { const cell = row.querySelector(selector); return cell ? cell.innerText : ''; };
+    return [link.innerText, link.getAttribute('onclick'), ...cellSelectors.map(text)];
+}).filter(Boolean)"""
+SET_VALUE_SCRIPT = "(input, value) => { input.value = value; }"
+GOTO_PAGE_SCRIPT = """([field, pageIndex]) => {
+    const input = document.querySelector(`[name="${field}"]`);
+    input.value = pageIndex;
+    input.form.submit();
+}"""
+RESULTS_CHANGED_SCRIPT = """([rowSelector, linkSelector, previous]) => {
+    const row = document.querySelector(rowSelector);
+    const link = row && row.querySelector(linkSelector);
+    return !!link && link.getAttribute('onclick') !== previous;
+}"""
+
+
+class BrowserBackend(FetchBackend):
+    """Walk the listings in Chromium, fetching detail pages on a pool of tabs.
+
+    One tab stays on the search results; worker_count more tabs in the same
+    context are parked on the listings page and trigger fnGoBoardSl
+    directly, so detail fetches overlap on the event loop. Every step waits
+    on the element it needs (results rows, a filled detail table) instead
+    of a fixed sleep, and navigations go through the backend's rate limiter.
+    Detail fields are read from the live DOM in one evaluate call rather
+    than by serialising and re-parsing the whole page.
+
+    The browser comes from a BrowserSession: a warm one passed in by the
+    GUI is reused and its tabs handed back on close, otherwise a private
+    session is launched and shut down with the backend.
+    """
+
+    name = 'Browser'
+
+    def __init__(self, list_url, worker_count=3, headless=False, log=print, requests_per_second=0, wait_timeout=30,
+                 metrics=None, session=None, user_data_dir=None, block_resources=True, max_retries=2, retry_backoff=1.0,
+                 date_from=None):
+        super().__init__(list_url, worker_count, log, requests_per_second, wait_timeout, metrics, max_retries,
+                         retry_backoff, date_from)
+        self.date_filter_logged = False
+        self.headless = bool(headless)
+        self.session = session
+        self.owns_session = session is None
+        self.user_data_dir = user_data_dir  # Persistent profile (cookies, cache), None for a throwaway one
+        self.block_resources = bool(block_resources)
+        self.page = None
+        self.detail_pages = None
+        self.detail_tabs = []
+
+    async def open(self):
+        """Launch the browser (or reuse the warm session), run the 'Hiring' search and open the detail tabs"""
+        if self.session is None:
+            self.session = BrowserSession(self.headless, self.user_data_dir, self.block_resources, self.timeout_ms)
+        with self.metrics.stage('browser_launch'):
+            launched = await self.session.start()
+        if not launched:
+            self.log("🔥 Reusing the warm browser session")
+        self.page = await self.session.take_page()
+        if not await self.page.query_selector(f'#{site_profile.DEADLINE_FIELD}'):
+            self.log("🌐 Navigating to job listings page...")
+            await self.rate_limiter.acquire()
+            await self.page.goto(self.list_url, wait_until="domcontentloaded")
+        await self.run_search()
+
+        self.log(f"⚙️ Opening {self.worker_count} detail tabs...")
+        self.detail_pages = asyncio.Queue()
+        self.detail_tabs = await asyncio.gather(*(self.open_detail_page() for _ in range(self.worker_count)))
+        for page in self.detail_tabs:
+            self.detail_pages.put_nowait(page)
+
+    async def run_search(self):
+        """Change the "Deadline" filter to "Hiring" (구인중) and search"""
+        await self.page.select_option(f'#{site_profile.DEADLINE_FIELD}', value=site_profile.HIRING_VALUE)
+        date_input = await self.page.query_selector(f'[name="{site_profile.DATE_FROM_FIELD}"]') if self.date_from else None
+        if date_input:
+            # Set directly: the field may be read-only behind a date picker
+            await date_input.evaluate(SET_VALUE_SCRIPT, self.date_from)
+            if not self.date_filter_logged:
+                self.log(f"📅 Search limited to listings registered since {self.date_from}")
+                self.date_filter_logged = True
+        await self.rate_limiter.acquire()
+        async with self.page.expect_navigation(wait_until="domcontentloaded"):
+            await self.page.click(site_profile.SEARCH_BUTTON_SELECTOR)
+        await self.wait_for_results()
+
+    @property
+    def timeout_ms(self):
+        return int(self.wait_timeout * 1000)
+
+    async def open_detail_page(self):
+        page = await self.session.take_page()
+        if await page.evaluate(LIST_READY_SCRIPT):
+            return page  # Still parked on the listings page from the previous run
+        await self.rate_limiter.acquire()
+        await page.goto(self.list_url, wait_until="domcontentloaded")
+        await page.wait_for_function(LIST_READY_SCRIPT)
+        return page
+
+    async def wait_for_results(self):
+        """Wait until the results table has at least one listing link"""
+        await self.page.wait_for_selector(
+            f'{site_profile.RESULT_ROWS_SELECTOR} {site_profile.TITLE_LINK_SELECTOR}', state='attached'
+        )
+
+    async def first_result_marker(self):
+        """onclick of the first listing, used to notice when the results table is replaced"""
+        link = await self.page.query_selector(f'{site_profile.RESULT_ROWS_SELECTOR} {site_profile.TITLE_LINK_SELECTOR}')
+        return await link.get_attribute('onclick') if link else None
+
+    async def read_targets(self):
+        """Read every listing on the results page in a single evaluate call"""
+        with self.metrics.stage('list_read'):
+            cells = await self.page.eval_on_selector_all(
+                site_profile.RESULT_ROWS_SELECTOR, RESULT_ROWS_SCRIPT,
+                [site_profile.TITLE_LINK_SELECTOR, site_profile.CREATION_DATE_SELECTOR,
+                 site_profile.FACILITY_NAME_SELECTOR, site_profile.AREA_SELECTOR]
+            )
+        return [make_listing_row(*row_cells) for row_cells in cells]
+
+    async def fetch_one(self, target):
+        page = await self.detail_pages.get()
+        try:
+            await self.rate_limiter.acquire()
+            with self.metrics.stage('detail_navigate'):
+                async with page.expect_navigation(wait_until="domcontentloaded") as navigation:
+                    await page.evaluate(f"() => {{ {target.onclick} }}")
+                response = await navigation.value
+            if response is not None and response.status in GONE_STATUSES:
+                detail = None  # Same as the HTTP backend: the listing is closed, nothing to wait for
+            else:
+                with self.metrics.stage('detail_wait'):
+                    await page.wait_for_function(DETAIL_READY_SCRIPT, arg=DETAIL_MIN_ROWS)
+                with self.metrics.stage('detail_read'):
+                    rows = await page.evaluate(DETAIL_CELLS_SCRIPT)
+                with self.metrics.stage('detail_parse'):
+                    detail = extract_detail(rows, warn=self.warn_layout)
+            with self.metrics.stage('detail_back'):
+                await page.go_back(wait_until="domcontentloaded")
+                await page.wait_for_function(LIST_READY_SCRIPT)
+            return detail
+        except Exception:
+            await self.recover(page)
+            raise
+        finally:
+            self.detail_pages.put_nowait(page)
+
+    async def recover(self, page):
+        """Put a detail tab back on the listings page after a failed fetch"""
+        try:
+            await page.goto(self.list_url, wait_until="domcontentloaded")
+            await page.wait_for_function(LIST_READY_SCRIPT)
+        except Exception:
+            pass
+
+    async def next_page(self):
+        """Follow the pager to the next results page; False when there is none"""
+        next_page_link = await self.page.query_selector(site_profile.NEXT_PAGE_SELECTOR)
+        if not next_page_link:
+            return False
+        previous = await self.first_result_marker()
+        await self.rate_limiter.acquire()
+        with self.metrics.stage('next_page'):
+            await next_page_link.click()
+            await self.page.wait_for_function(
+                RESULTS_CHANGED_SCRIPT,
+                arg=[site_profile.RESULT_ROWS_SELECTOR, site_profile.TITLE_LINK_SELECTOR, previous]
+            )
+        return True
+
+    async def has_next_page(self):
+        return await self.page.query_selector(site_profile.NEXT_PAGE_SELECTOR) is not None
+
+    async def goto_page(self, page_index):
+        """Submit the search form with the pager's pageIndex set to page_index"""
+        await self.rate_limiter.acquire()
+        async with self.page.expect_navigation(wait_until="domcontentloaded"):
+            await self.page.evaluate(GOTO_PAGE_SCRIPT, [site_profile.PAGE_INDEX_FIELD, page_index])
+        # A page past the end has no rows, so wait for the page scripts rather than a listing
+        await self.page.wait_for_function(LIST_READY_SCRIPT)
+
+    async def recover_results(self, page_index):
+        """Reload the listings page, search again and jump back to page_index"""
+        await self.rate_limiter.acquire()
+        await self.page.goto(self.list_url, wait_until="domcontentloaded")
+        await self.run_search()
+        if page_index > 1:
+            await self.goto_page(page_index)
+
+    async def recycle(self, page_index):
+        """Relaunch Chromium, dropping every tab's history and the renderers' heap, then return to page_index.
+
+        A warm session passed in by the GUI is restarted in place, so the
+        caller keeps a working browser for its next run.
+        """
+        self.cancel_pending()
+        self.page = None
+        self.detail_tabs = []
+        await self.session.close()
+        await self.open()
+        if page_index > 1:
+            await self.goto_page(page_index)
+
+    async def close(self):
+        await super().close()
+        if self.session is None:
+            return
+        if self.owns_session:
+            await self.session.close()
+        else:
+            self.session.release_pages([self.page, *self.detail_tabs])
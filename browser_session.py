@@ -0,0 +1,96 @@
+from playwright.async_api import async_playwright
+
+# Not needed to read the listings; aborted when resource blocking is on
+BLOCKED_RESOURCE_TYPES = ('image', 'font', 'stylesheet', 'media')
+
+
+class BrowserSession:
+    """A Chromium context that can outlive a single crawl.
+
+    The GUI keeps one session between runs, so only the first Start pays
+    for launching Chromium and loading the listings page; later runs get
+    the previous tabs back, already parked on the site. With user_data_dir
+    the context is persistent (cookies and HTTP cache survive restarts),
+    and with block_resources images, fonts and stylesheets are never
+    downloaded. All methods must run on the same event loop.
+    """
+
+    def __init__(self, headless=False, user_data_dir=None, block_resources=True, timeout_ms=30000):
+        self.headless = bool(headless)
+        self.user_data_dir = user_data_dir
+        self.block_resources = bool(block_resources)
+        self.timeout_ms = timeout_ms
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.idle_pages = []
+        self.closed = False
+
+    @property
+    def started(self):
+        return self.context is not None and not self.closed
+
+    def matches(self, headless, user_data_dir, block_resources):
+        """Whether this session was launched with the given settings"""
+        return (self.headless, self.user_data_dir, self.block_resources) == (
+            bool(headless), user_data_dir, bool(block_resources)
+        )
+
+    async def start(self):
+        """Launch Chromium unless this session is already running"""
+        if self.started:
+            return False
+        if self.playwright:
+            await self.close()  # Left over from a context the user closed
+        self.closed = False
+        self.playwright = await async_playwright().start()
+        if self.user_data_dir:
+            self.context = await self.playwright.chromium.launch_persistent_context(
+                self.user_data_dir, headless=self.headless
+            )
+            # A persistent context opens with a blank tab; reuse it
+            self.idle_pages = list(self.context.pages)
+        else:
+            self.browser = await self.playwright.chromium.launch(headless=self.headless)
+            self.context = await self.browser.new_context()
+        self.context.on('close', self.on_context_closed)
+        self.context.set_default_timeout(self.timeout_ms)
+        if self.block_resources:
+            await self.context.route('**/*', self.route_request)
+        return True
+
+    def on_context_closed(self, _context=None):
+        # e.g. the user closed the visible browser window
+        self.closed = True
+        self.idle_pages = []
+
+    async def route_request(self, route):
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def take_page(self):
+        """An idle tab left by a previous run, or a new one"""
+        while self.idle_pages:
+            page = self.idle_pages.pop(0)
+            if not page.is_closed():
+                return page
+        return await self.context.new_page()
+
+    def release_pages(self, pages):
+        """Keep tabs for the next run"""
+        if self.closed:
+            return
+        self.idle_pages.extend(page for page in pages if page is not None and not page.is_closed())
+
+    async def close(self):
+        self.idle_pages = []
+        if self.context and not self.closed:
+            self.closed = True
+            await self.context.close()
+        if self.browser:
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+        self.context = self.browser = self.playwright = None
@@ -0,0 +1,77 @@
+from listing_index import contact_key, content_hash
+from output_sinks import open_sink, read_csv_rows
+from row_normalizer import normalize_rows
+
+# What to do with a listing whose contact is already in the template:
+# keep - write every listing (no de-duplication)
+# merge - fetch it, but write one row per contact
+# skip - also skip the detail fetch when its facility already has a captured contact
+CONTACT_POLICIES = ('keep', 'merge', 'skip')
+
+
+def row_key(job_data):
+    """De-duplication key of an output row: its contact, or the whole row when the contact is unknown"""
+    return contact_key(job_data) or content_hash(job_data)
+
+
+def merge_contact_rows(rows):
+    """One row per contact, in first-seen order; blanks in a kept row are filled from its duplicates.
+
+    Returns (merged rows, number of rows folded into an earlier one).
+    """
+    merged = {}
+    duplicates = 0
+    for row in rows:
+        key = row_key(row)
+        kept = merged.get(key)
+        if kept is None:
+            merged[key] = dict(row)
+            continue
+        duplicates += 1
+        for field, value in row.items():
+            if value and not kept.get(field):
+                kept[field] = value
+    return list(merged.values()), duplicates
+
+
+def dedupe_output(path, output_format='csv', exports=()):
+    """Rewrite a template CSV (and its exported copies) with one row per contact; returns (rows kept, rows merged away)"""
+    rows, duplicates = merge_contact_rows(read_csv_rows(path))
+    if duplicates:
+        with open_sink(path, output_format, exports, transform=normalize_rows) as sink:
+            for row in rows:
+                sink.write_row(row)
+    return len(rows), duplicates
+
+
+class ContactIndex:
+    """In-memory hash index of the contacts a crawl has captured.
+
+    Consulted for every listing, so lookups stay set operations; the
+    contacts table of the listing index is its persistent side and seeds
+    it for runs that append to the template.
+    """
+
+    def __init__(self):
+        self.contacts = set()  # row_key of every row in the output
+        self.facilities = set()  # facility_key of every facility with a captured contact
+
+    def load_rows(self, rows):
+        for row in rows:
+            self.contacts.add(row_key(row))
+
+    def load_facilities(self, facilities):
+        self.facilities.update(facility for facility in facilities if facility)
+
+    def has_facility(self, facility):
+        return bool(facility) and facility in self.facilities
+
+    def add(self, job_data, facility=''):
+        """Record a captured row; False when its contact was already there"""
+        if facility:
+            self.facilities.add(facility)
+        key = row_key(job_data)
+        if key in self.contacts:
+            return False
+        self.contacts.add(key)
+        return True
@@ -0,0 +1,43 @@
+import json
+import os
+from datetime import datetime
+
+
+class CrawlCheckpoint:
+    """Progress snapshot of a crawl, so an interrupted run can pick up where it stopped.
+
+    Holds the results page and job position, the search/date filters and
+    the number of rows saved. Written with a temp file + atomic rename so a
+    crash mid-write leaves the previous checkpoint intact.
+    """
+
+    def __init__(self, path='crawl_checkpoint.json'):
+        self.path = path
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        """Return the saved state dict, or None when there is no usable checkpoint"""
+        try:
+            with open(self.path, encoding='utf-8') as checkpoint_file:
+                state = json.load(checkpoint_file)
+        except (OSError, ValueError):
+            return None
+        return state if isinstance(state, dict) and state.get('current_page') else None
+
+    def save(self, **state):
+        state['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as checkpoint_file:
+            json.dump(state, checkpoint_file, ensure_ascii=False, indent=2)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(temp_path, self.path)
+
+    def clear(self):
+        """Forget the checkpoint once a crawl has finished"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,163 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# Upper bounds (seconds) of the stage histogram buckets, Prometheus style
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+MAX_SAMPLES = 10000  # Recent samples kept per stage for percentiles
+PROMETHEUS_PREFIX = 'job_crawl'
+
+
+class StageHistogram:
+    """Timing distribution of one crawl stage"""
+
+    def __init__(self, buckets=STAGE_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+
+    def observe(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.samples.append(seconds)
+        for position, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.bucket_counts[position] += 1
+                break
+
+    def percentile(self, pct):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        rank = (len(ordered) - 1) * pct / 100
+        low = int(rank)
+        high = min(low + 1, len(ordered) - 1)
+        return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'total_s': round(self.total, 4),
+            'mean_s': round(self.total / self.count, 4) if self.count else 0.0,
+            'min_s': round(self.min or 0.0, 4),
+            'max_s': round(self.max, 4),
+            'p50_s': round(self.percentile(50), 4),
+            'p95_s': round(self.percentile(95), 4),
+            'buckets': {str(bound): count for bound, count in zip(self.buckets, self.bucket_counts)}
+        }
+
+
+class CrawlMetrics:
+    """Per-stage timings and counters for one crawl.
+
+    Backends and the engine wrap each hot-path step in stage(name); the
+    HTTP backend observes from worker threads, so updates take a lock.
+    The snapshot can be written as JSON for trend tracking or as a
+    Prometheus text exposition file for a node_exporter textfile collector.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stages = {}
+        self.counters = {}
+        self.gauges = {}  # Latest value of a reading such as memory use
+        self.started_at = datetime.now()
+        self.started = time.perf_counter()
+
+    def observe(self, name, seconds):
+        with self.lock:
+            if name not in self.stages:
+                self.stages[name] = StageHistogram()
+            self.stages[name].observe(seconds)
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as one sample of the named stage"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def increment(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_gauge(self, name, value):
+        with self.lock:
+            self.gauges[name] = value
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def throughput(self, counter='listings_saved'):
+        """Per-second rate of a counter since the crawl started"""
+        elapsed = self.elapsed()
+        return self.counters.get(counter, 0) / elapsed if elapsed > 0 else 0.0
+
+    def eta(self, remaining, counter='listings_saved'):
+        """Seconds to process `remaining` more items at the current rate, or None before the first one"""
+        rate = self.throughput(counter)
+        return remaining / rate if rate > 0 else None
+
+    def snapshot(self, **run_info):
+        with self.lock:
+            stages = {name: histogram.summary() for name, histogram in self.stages.items()}
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'elapsed_s': round(self.elapsed(), 3),
+            'listings_per_s': round(self.throughput(), 3),
+            'counters': counters,
+            'gauges': gauges,
+            'stages': stages,
+            **run_info
+        }
+
+    def write_json(self, path, **run_info):
+        write_text(path, json.dumps(self.snapshot(**run_info), ensure_ascii=False, indent=2))
+
+    def write_prometheus(self, path):
+        lines = []
+        with self.lock:
+            for name, value in sorted(self.counters.items()):
+                metric = f'{PROMETHEUS_PREFIX}_{name}_total'
+                lines.append(f'# TYPE {metric} counter')
+                lines.append(f'{metric} {value}')
+            for name, value in sorted(self.gauges.items()):
+                metric = f'{PROMETHEUS_PREFIX}_{name}'
+                lines.append(f'# TYPE {metric} gauge')
+                lines.append(f'{metric} {value}')
+            metric = f'{PROMETHEUS_PREFIX}_stage_seconds'
+            lines.append(f'# TYPE {metric} histogram')
+            for name, histogram in sorted(self.stages.items()):
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.bucket_counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{stage="{name}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{metric}_sum{{stage="{name}"}} {histogram.total:.6f}')
+                lines.append(f'{metric}_count{{stage="{name}"}} {histogram.count}')
+        metric = f'{PROMETHEUS_PREFIX}_elapsed_seconds'
+        lines.append(f'# TYPE {metric} gauge')
+        lines.append(f'{metric} {self.elapsed():.3f}')
+        write_text(path, '\n'.join(lines) + '\n')
+
+
+def write_text(path, text):
+    """Replace path atomically so collectors never read a half-written file"""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as output:
+        output.write(text)
+    os.replace(temp_path, path)
@@ -0,0 +1,306 @@
+import copy
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime, timedelta
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+INTERVAL_PATTERN = re.compile(r'^(?:every\s+)?(\d+)\s*([mhd])$', re.IGNORECASE)
+INTERVAL_UNITS = {'m': 60, 'h': 3600, 'd': 86400}
+# (lowest, highest) of the five cron fields: minute hour day-of-month month day-of-week (0 = Sunday)
+CRON_FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+SUCCESSFUL_STATUSES = ('complete', 'cutoff')
+HISTORY_LIMIT = 50  # Runs shown in the history table
+# Windows API values for checking whether the pid in a lock file is still running
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+STILL_ACTIVE = 259
+ERROR_ACCESS_DENIED = 5
+
+
+class IntervalSchedule:
+    """Every n minutes/hours/days, counted from the previous run"""
+
+    def __init__(self, seconds, text):
+        self.seconds = seconds
+        self.text = text
+
+    def first_run(self, now):
+        return now  # Start right away, then every interval
+
+    def next_run(self, after):
+        return after + timedelta(seconds=self.seconds)
+
+
+class CronSchedule:
+    """Standard five-field cron expression: '*', 'a', 'a-b', '*/n', 'a-b/n' and comma lists"""
+
+    def __init__(self, text):
+        fields = text.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {text}")
+        self.text = text
+        self.minutes, self.hours, self.days, self.months, self.weekdays = (
+            parse_cron_field(field, low, high) for field, (low, high) in zip(fields, CRON_FIELDS)
+        )
+        # Like cron: with both day fields restricted, a day matching either one runs
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+
+    def first_run(self, now):
+        return self.next_run(now)
+
+    def day_matches(self, moment):
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.isoweekday() % 7) in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_run(self, after):
+        moment = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = moment + timedelta(days=366 * 4)  # Covers 29 February
+        while moment < limit:
+            if moment.month not in self.months or not self.day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += timedelta(minutes=1)
+            else:
+                return moment
+        raise ValueError(f"Cron expression never matches: {self.text}")
+
+
+def parse_cron_field(field, low, high):
+    values = set()
+    for part in field.split(','):
+        span, _, step = part.partition('/')
+        if span == '*':
+            first, last = low, high
+        elif '-' in span:
+            first, last = (int(value) for value in span.split('-', 1))
+        else:
+            first = last = int(span)
+        if step:
+            step = int(step)
+            if step < 1:
+                raise ValueError(f"Bad cron step: {part}")
+            if '-' not in span and span != '*':
+                last = high  # 'a/n' means from a to the end
+        else:
+            step = 1
+        if not low <= first <= last <= high:
+            raise ValueError(f"Cron field out of range {low}-{high}: {part}")
+        values.update(range(first, last + 1, step))
+    return values
+
+
+def parse_schedule(text):
+    """'every 30m' / '6h' / '1d', or a five-field cron expression like '0 */6 * * *'"""
+    text = (text or '').strip()
+    match = INTERVAL_PATTERN.match(text)
+    if match:
+        seconds = int(match.group(1)) * INTERVAL_UNITS[match.group(2).lower()]
+        if seconds <= 0:
+            raise ValueError(f"Interval must be positive: {text}")
+        return IntervalSchedule(seconds, text)
+    try:
+        return CronSchedule(text)
+    except ValueError as e:
+        raise ValueError(f"Not an interval ('every 6h') or cron expression ('0 */6 * * *'): {text}") from e
+
+
+def scheduled_config(config, history):
+    """Copy of config for an unattended run: incremental, and nothing older than the last run's newest listing"""
+    config = copy.copy(config)
+    config.incremental = True
+    config.resume = False
+    config.date_filter_enabled = True
+    config.since_date = history.high_water_mark()
+    return config
+
+
+def windows_process_alive(pid):
+    """OpenProcess/GetExitCodeProcess check; os.kill(pid, 0) would send Ctrl+C on Windows"""
+    import ctypes
+    from ctypes import wintypes
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    kernel32.GetExitCodeProcess.argtypes = (wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD))
+    kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        # Access denied: the process exists but belongs to someone else; anything else means it is gone
+        return ctypes.get_last_error() == ERROR_ACCESS_DENIED
+    try:
+        exit_code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+            return True
+        return exit_code.value == STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def process_alive(pid):
+    if psutil is not None:
+        return psutil.pid_exists(pid)
+    if os.name == 'nt':
+        return windows_process_alive(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class RunLock:
+    """Lock file that keeps two crawls (GUI, CLI or scheduler) from writing the same outputs at once.
+
+    Created with O_EXCL so only one process can take it; a lock left by a
+    process that no longer exists is taken over.
+    """
+
+    def __init__(self, path='crawl.lock'):
+        self.path = path
+        self.held = False
+
+    def holder(self):
+        """{'pid', 'started_at', 'trigger'} of the current holder, or None"""
+        try:
+            with open(self.path, encoding='utf-8') as lock_file:
+                return json.load(lock_file)
+        except (OSError, ValueError):
+            return None
+
+    def acquire(self, trigger='manual'):
+        if self.held:
+            return True
+        for _ in range(2):
+            try:
+                descriptor = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                holder = self.holder()
+                if holder and process_alive(holder.get('pid', 0)):
+                    return False
+                try:
+                    os.remove(self.path)  # Left by a crashed run
+                except FileNotFoundError:
+                    pass
+                continue
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as lock_file:
+                json.dump({
+                    'pid': os.getpid(),
+                    'started_at': datetime.now().isoformat(timespec='seconds'),
+                    'trigger': trigger
+                }, lock_file)
+            self.held = True
+            return True
+        return False
+
+    def release(self):
+        if not self.held:
+            return
+        self.held = False
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class RunHistory:
+    """One row per crawl in the listing index database: when, how it ended, and its high-water mark"""
+
+    def __init__(self, path='listing_index.db'):
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY,
+                trigger TEXT,
+                started_at TEXT,
+                finished_at TEXT,
+                status TEXT,
+                saved INTEGER,
+                pages INTEGER,
+                high_water_mark TEXT,
+                error TEXT
+            )
+        """)
+        self.connection.commit()
+
+    def start(self, trigger):
+        cursor = self.connection.execute(
+            "INSERT INTO runs (trigger, started_at, status, saved, pages) VALUES (?, ?, 'running', 0, 0)",
+            (trigger, datetime.now().isoformat(timespec='seconds'))
+        )
+        self.connection.commit()
+        return cursor.lastrowid
+
+    def finish(self, run_id, status, saved=0, pages=0, high_water_mark=None, error=''):
+        self.connection.execute("""
+            UPDATE runs SET finished_at = ?, status = ?, saved = ?, pages = ?, high_water_mark = ?, error = ?
+            WHERE id = ?
+        """, (datetime.now().isoformat(timespec='seconds'), status, saved, pages, high_water_mark, error, run_id))
+        self.connection.commit()
+
+    def skipped(self, trigger, reason):
+        """Record a scheduled run that did not start"""
+        now = datetime.now().isoformat(timespec='seconds')
+        self.connection.execute(
+            "INSERT INTO runs (trigger, started_at, finished_at, status, saved, pages, error) "
+            "VALUES (?, ?, ?, 'skipped', 0, 0, ?)",
+            (trigger, now, now, reason)
+        )
+        self.connection.commit()
+
+    def high_water_mark(self):
+        """Newest creation date saved by a run that finished its window.
+
+        Stopped or failed runs don't count: they saved the newest listings
+        but may have missed older ones that the next run still has to fetch.
+        """
+        placeholders = ','.join('?' * len(SUCCESSFUL_STATUSES))
+        row = self.connection.execute(
+            f"SELECT MAX(high_water_mark) FROM runs WHERE status IN ({placeholders})", SUCCESSFUL_STATUSES
+        ).fetchone()
+        return row[0] if row else None
+
+    def recent(self, limit=HISTORY_LIMIT):
+        """Latest runs first, as dicts"""
+        cursor = self.connection.execute(
+            "SELECT id, trigger, started_at, finished_at, status, saved, pages, high_water_mark, error "
+            "FROM runs ORDER BY id DESC LIMIT ?", (limit,)
+        )
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def close(self):
+        self.connection.close()
+
+
+class RunOutcome:
+    """Engine subscriber that remembers how a run ended, for the history table"""
+
+    def __init__(self):
+        self.status = 'stopped'
+        self.error = ''
+
+    def __call__(self, event):
+        msg_type = event['type']
+        if self.status == 'error':
+            return  # The first error decides
+        if msg_type == 'complete':
+            self.status = 'complete'
+        elif msg_type == 'date_cutoff':
+            self.status = 'cutoff'
+        elif msg_type == 'error':
+            self.status = 'error'
+            self.error = event['text']
@@ -0,0 +1,80 @@
+import json
+import os
+from datetime import datetime
+from job_parser import ListingRow
+
+
+class DeadLetterFile:
+    """Listings that still failed after every retry, for a later targeted pass.
+
+    One JSON object per line with the listing ID, what is needed to open it
+    again (onclick, results page) and the last error. Appends are cheap;
+    removing entries after a successful retry rewrites the file with a
+    temp file + atomic rename like CrawlCheckpoint.
+    """
+
+    def __init__(self, path='dead_letters.jsonl'):
+        self.path = path
+
+    def add(self, target, error, page_index):
+        entry = {
+            'listing_id': target.listing_id,
+            'title': target.title,
+            'creation_date': target.creation_date,
+            'onclick': target.onclick,
+            'facility_name': target.facility_name,
+            'area': target.area,
+            'page': page_index,
+            'error': str(error),
+            'failed_at': datetime.now().isoformat(timespec='seconds')
+        }
+        with open(self.path, 'a', encoding='utf-8') as dead_letter_file:
+            dead_letter_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def load(self):
+        """Entries by listing ID (the latest failure wins); empty when there is no file"""
+        entries = {}
+        try:
+            with open(self.path, encoding='utf-8') as dead_letter_file:
+                for line in dead_letter_file:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # Torn last line after a crash
+                    if entry.get('listing_id'):
+                        entries[entry['listing_id']] = entry
+        except OSError:
+            pass
+        return entries
+
+    def count(self):
+        return len(self.load())
+
+    def targets(self):
+        """(ListingRow, results page) for every entry"""
+        return [
+            (ListingRow(entry['title'], listing_id, entry['creation_date'], entry['onclick'],
+                        entry.get('facility_name', ''), entry.get('area', '')), entry.get('page', 1))
+            for listing_id, entry in self.load().items()
+        ]
+
+    def remove(self, listing_ids):
+        """Drop entries that have been fetched since"""
+        listing_ids = set(listing_ids)
+        if not listing_ids:
+            return
+        remaining = [entry for listing_id, entry in self.load().items() if listing_id not in listing_ids]
+        if not remaining:
+            self.clear()
+            return
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as dead_letter_file:
+            for entry in remaining:
+                dead_letter_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        os.replace(temp_path, self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
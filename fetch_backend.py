@@ -0,0 +1,147 @@
+import asyncio
+import random
+import time
+from crawl_metrics import CrawlMetrics
+from job_parser import DetailLayoutError
+
+GONE_STATUSES = (404, 410)  # Detail responses of a listing that was taken down: closed, not a failure to retry
+
+
+def backoff_delay(base, attempt):
+    """Exponential backoff with jitter: about base, 2*base, 4*base, ... seconds"""
+    return base * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+
+class RateLimiter:
+    """Politeness limit shared by every request a backend makes, in requests per second"""
+
+    def __init__(self, requests_per_second=0):
+        self.interval = 1.0 / requests_per_second if requests_per_second and requests_per_second > 0 else 0
+        self.next_slot = 0.0
+        self.lock = None
+
+    async def acquire(self):
+        """Wait until the next request is allowed; returns immediately when unlimited"""
+        if not self.interval:
+            return
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            now = time.monotonic()
+            if self.next_slot > now:
+                await asyncio.sleep(self.next_slot - now)
+                now = self.next_slot
+            self.next_slot = now + self.interval
+
+
+class FetchBackend:
+    """Common shape of the fetch backends used by AutomationEngine.
+
+    A backend lands on the first results page in open(), reads the listing
+    rows of the current page, fetches their detail pages concurrently and
+    follows the pager. Subclasses implement fetch_one for a single target;
+    fetch_details runs up to worker_count of them at once on the event loop,
+    retrying each failed fetch up to max_retries times with backoff.
+    """
+
+    name = ''
+
+    def __init__(self, list_url, worker_count=3, log=print, requests_per_second=0, wait_timeout=30, metrics=None,
+                 max_retries=2, retry_backoff=1.0, date_from=None):
+        self.list_url = list_url
+        self.date_from = date_from  # YYYY-MM-DD lower bound for the site's own search, None for none
+        self.worker_count = max(1, int(worker_count))
+        self.log = log
+        self.rate_limiter = RateLimiter(requests_per_second)
+        self.wait_timeout = wait_timeout  # Seconds to wait for a page or response
+        self.pending = []
+        self.metrics = metrics or CrawlMetrics()
+        self.max_retries = max(0, int(max_retries))  # Extra attempts per listing after the first
+        self.retry_backoff = retry_backoff  # Seconds before the first retry, doubled for each further one
+        self.layout_warnings = set()  # Detail label mismatches already logged this run
+
+    def warn_layout(self, message):
+        """A detail label that no longer matches site_profile.DETAIL_FIELDS: logged once, the value is read by position"""
+        self.metrics.increment('detail_label_mismatches')
+        if message not in self.layout_warnings:
+            self.layout_warnings.add(message)
+            self.log(f"⚠️ {message} - reading the field by position, check site_profile.DETAIL_FIELDS")
+
+    async def open(self):
+        raise NotImplementedError
+
+    async def read_targets(self):
+        raise NotImplementedError
+
+    async def fetch_one(self, target):
+        raise NotImplementedError
+
+    async def next_page(self):
+        raise NotImplementedError
+
+    async def has_next_page(self):
+        """Whether the current results page links to a following one"""
+        raise NotImplementedError
+
+    async def goto_page(self, page_index):
+        """Jump straight to a results page (used when resuming and by sharded crawls)"""
+        raise NotImplementedError
+
+    async def recover_results(self, page_index):
+        """Put the results view back on page_index after a failed step"""
+        await self.goto_page(page_index)
+
+    async def recycle(self, page_index):
+        """Start over with fresh connections and land back on results page page_index (between pages only)"""
+        await self.close()
+        await self.open()
+        if page_index > 1:
+            await self.goto_page(page_index)
+
+    async def close(self):
+        self.cancel_pending()
+
+    async def fetch_details(self, targets):
+        """Yield (target, detail, error) for every target, in the order of targets.
+
+        All fetches run concurrently from the start; a result that finishes
+        early waits for the ones before it, so rows reach the output in page
+        order and two runs over the same listings write the same file.
+        """
+        self.pending = [asyncio.ensure_future(self.fetch_guarded(target)) for target in targets]
+        for future in self.pending:
+            try:
+                yield await future
+            except asyncio.CancelledError:
+                continue
+
+    async def fetch_guarded(self, target):
+        started = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = target, await self.fetch_one(target), None
+                break
+            except asyncio.CancelledError:
+                raise
+            except DetailLayoutError as e:
+                result = target, None, e  # The page loaded fine; another attempt reads the same layout
+                break
+            except Exception as e:
+                result = target, None, e
+                if attempt == self.max_retries:
+                    break
+                delay = backoff_delay(self.retry_backoff, attempt)
+                self.metrics.increment('fetch_retries')
+                self.log(f"🔁 Retrying {target.title} in {delay:.1f}s ({str(e) or type(e).__name__})")
+                await asyncio.sleep(delay)
+        if result[2] is not None:
+            self.metrics.increment('fetch_errors')
+        # Whole fetch including retries and waiting for a worker; cancelled fetches are not counted
+        self.metrics.observe('detail', time.perf_counter() - started)
+        return result
+
+    def cancel_pending(self):
+        """Drop fetches that have not finished yet"""
+        for future in self.pending:
+            future.cancel()
+        self.pending = []
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the childcare.go.kr job offer board.
+Serves the captured list/detail page layouts in fixtures/ with generated
+listings, so both fetch backends can be exercised without the live site:
+
+    python fixture_server.py --port 8765 --pages 5
+    JOB_AUTOMATION_LIST_URL=http://127.0.0.1:8765/ccef/job/JobOfferSlPL.jsp?flag=SlPL python run_ctk_gui.py
+"""
+
+import argparse
+import html
+import math
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from urllib.parse import parse_qs, urlsplit
+import site_profile
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+LIST_PATH = '/ccef/job/' + urlsplit(site_profile.DEFAULT_LIST_URL).path.rsplit('/', 1)[-1]
+DETAIL_PATH = '/ccef/job/' + site_profile.DETAIL_PATH
+
+REGIONS = [
+    '서울특별시 강남구 역삼동',
+    '경상남도 창원시 의창구 북면',
+    '충청북도 청주시 상당구 용암1동',
+    '부산광역시 해운대구 우동',
+    '경기도 수원시 영통구 매탄동',
+]
+FACILITY_TYPES = ['국공립', '민간', '가정', '직장']
+
+
+def load_template(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as template_file:
+        return Template(template_file.read())
+
+
+class FixtureSite:
+    """Generated listings laid out like the live board: newest first, rows_per_page per page"""
+
+    def __init__(self, pages=5, rows_per_page=10, listings_per_day=10, today=None,
+                 list_latency=0.0, detail_latency=0.0, jitter=0.0, detail_failure_rate=0.0, date_search=True):
+        self.pages = pages
+        self.rows_per_page = rows_per_page
+        self.listings_per_day = max(1, listings_per_day)
+        self.today = today or datetime.now()
+        self.total = pages * rows_per_page
+        # Simulated server time in seconds, +/- jitter (fraction of the latency)
+        self.list_latency = list_latency
+        self.detail_latency = detail_latency
+        self.jitter = jitter
+        self.detail_failure_rate = detail_failure_rate  # Share of detail requests answered with a 503
+        self.date_search = date_search  # Whether the search form offers a registration date filter
+        self.closed = set()  # Listing seqs taken down: 마감 in the list, 404 for the detail page
+        self.edits = {}  # Listing seq -> fields changed after posting
+        self.list_template = load_template('job_list.html')
+        self.detail_template = load_template('job_detail.html')
+
+    def delay(self, latency):
+        if latency > 0:
+            time.sleep(max(0.0, latency * (1 + random.uniform(-self.jitter, self.jitter))))
+
+    def listing(self, position):
+        """Listing at 0-based position in the newest-first order"""
+        seq = str(100000 + self.total - position)
+        created = self.today - timedelta(days=position // self.listings_per_day)
+        return {
+            'seq': seq,
+            'title': f'보육교사 채용공고 {seq}',
+            'facility_name': f'해오름어린이집 {position % 40}',
+            'facility_type': FACILITY_TYPES[position % len(FACILITY_TYPES)],
+            'region': REGIONS[position % len(REGIONS)],
+            'name': '원장',
+            'phone': f'055-{position % 1000:03d}-{position % 10000:04d}',
+            'email': f'center{position % 40}@example.com',
+            'creation_date': created.strftime('%Y-%m-%d'),
+            **self.edits.get(seq, {})
+        }
+
+    def edit_listing(self, seq, **fields):
+        """Change a posted listing, e.g. edit_listing('100042', email='new@example.com')"""
+        self.edits.setdefault(seq, {}).update(fields)
+
+    def close_listing(self, seq):
+        self.closed.add(seq)
+
+    def position_of(self, seq):
+        try:
+            position = 100000 + self.total - int(seq)
+        except ValueError:
+            return None
+        return position if 0 <= position < self.total else None
+
+    def visible_count(self, date_from=''):
+        """Listings matching the registration date filter (all of them without one)"""
+        if not self.date_search or not date_from:
+            return self.total
+        try:
+            days = (self.today.date() - datetime.strptime(date_from, '%Y-%m-%d').date()).days
+        except ValueError:
+            return self.total
+        return max(0, min(self.total, (days + 1) * self.listings_per_day))
+
+    def render_list(self, page_index, hiring_only=True, date_from=''):
+        visible = self.visible_count(date_from)
+        pages = max(1, math.ceil(visible / self.rows_per_page))
+        page_index = min(max(1, page_index), pages)
+        first = (page_index - 1) * self.rows_per_page
+        rows = []
+        for position in range(first, min(first + self.rows_per_page, visible)):
+            item = self.listing(position)
+            rows.append(
+                '        <tr>'
+                f'<td>{self.total - position}</td>'
+                f'<td>{html.escape(item["region"].split()[0])}</td>'
+                f'<td class="subject"><a href="#" onclick="fnGoBoardSl(\'{item["seq"]}\'); return false;">{html.escape(item["title"])}</a></td>'
+                f'<td>{html.escape(item["facility_name"])}</td>'
+                f'<td>{item["facility_type"]}</td>'
+                '<td>보육교사</td>'
+                f'<td>{"마감" if item["seq"] in self.closed else "구인중"}</td>'
+                f'<td>{item["creation_date"]}</td>'
+                '</tr>'
+            )
+        pager = f'<strong>{page_index}</strong>'
+        if page_index < pages:
+            pager += ' <a href="#page_next" class="next" onclick="page_next(); return false;">다음</a>'
+        date_filter = ''
+        if self.date_search:
+            date_filter = (f'    <input type="text" name="{site_profile.DATE_FROM_FIELD}" '
+                           f'value="{html.escape(date_from)}" placeholder="YYYY-MM-DD">')
+        return self.list_template.substitute(
+            rows='\n'.join(rows), pager=pager, page_index=page_index, date_filter=date_filter,
+            next_page=page_index + 1, hiring_selected=' selected' if hiring_only else ''
+        )
+
+    def render_detail(self, seq):
+        position = self.position_of(seq)
+        if position is None or seq in self.closed:
+            return None
+        item = {key: html.escape(value) for key, value in self.listing(position).items()}
+        return self.detail_template.substitute(item)
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    site = None
+
+    def do_GET(self):
+        self.respond(parse_qs(urlsplit(self.path).query))
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        form = parse_qs(self.rfile.read(length).decode('utf-8'))
+        query = parse_qs(urlsplit(self.path).query)
+        self.respond({**query, **form})
+
+    def respond(self, params):
+        path = urlsplit(self.path).path
+        field = lambda name, default='': params.get(name, [default])[0]
+        body = None
+        if path == LIST_PATH:
+            try:
+                page_index = int(field(site_profile.PAGE_INDEX_FIELD, '1') or 1)
+            except ValueError:
+                page_index = 1
+            self.site.delay(self.site.list_latency)
+            body = self.site.render_list(
+                page_index, field(site_profile.DEADLINE_FIELD, site_profile.HIRING_VALUE) == site_profile.HIRING_VALUE,
+                field(site_profile.DATE_FROM_FIELD)
+            )
+        elif path == DETAIL_PATH:
+            self.site.delay(self.site.detail_latency)
+            if random.random() < self.site.detail_failure_rate:
+                self.send_error(503)
+                return
+            body = self.site.render_detail(field(site_profile.DETAIL_ID_FIELD))
+        if body is None:
+            self.send_error(404)
+            return
+        payload = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_fixture_server(site, host='127.0.0.1', port=0):
+    """Bind a server for site and return (server, list_url)"""
+    handler = type('BoundFixtureRequestHandler', (FixtureRequestHandler,), {'site': site})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    list_url = f'http://{host}:{server.server_address[1]}{LIST_PATH}?{site_profile.FLAG_FIELD}={site_profile.LIST_FLAG}'
+    return server, list_url
+
+
+def start_fixture_server(site, host='127.0.0.1', port=0):
+    """Serve site on a background thread and return (server, list_url)"""
+    server, list_url = make_fixture_server(site, host, port)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server, list_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve fixture job listing pages locally')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--pages', type=int, default=5, help='number of result pages')
+    parser.add_argument('--rows', type=int, default=10, help='listings per result page')
+    parser.add_argument('--per-day', type=int, default=10, help='listings created per day')
+    parser.add_argument('--list-latency-ms', type=float, default=0, help='simulated latency of results pages')
+    parser.add_argument('--detail-latency-ms', type=float, default=0, help='simulated latency of detail pages')
+    parser.add_argument('--jitter', type=float, default=0, help='latency jitter as a fraction (e.g. 0.2)')
+    parser.add_argument('--no-date-search', dest='date_search', action='store_false',
+                        help='leave the registration date filter out of the search form')
+    parser.add_argument('--detail-failure-rate', type=float, default=0,
+                        help='share of detail requests that fail with 503, to exercise retries')
+    args = parser.parse_args()
+
+    site = FixtureSite(
+        pages=args.pages, rows_per_page=args.rows, listings_per_day=args.per_day,
+        list_latency=args.list_latency_ms / 1000, detail_latency=args.detail_latency_ms / 1000, jitter=args.jitter,
+        detail_failure_rate=args.detail_failure_rate, date_search=args.date_search
+    )
+    server, list_url = make_fixture_server(site, args.host, args.port)
+    print(f"🧪 Fixture server running: {list_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
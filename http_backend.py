@@ -0,0 +1,124 @@
+import asyncio
+from urllib.parse import urljoin
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+import site_profile
+from fetch_backend import GONE_STATUSES, FetchBackend
+from job_parser import parse_job_detail, parse_results_page
+
+
+class HttpBackend(FetchBackend):
+    """Replay the fnSearch / page_next / fnGoBoardSl form posts over a pooled keep-alive session.
+
+    No browser is started: the search form is read from the listings page
+    once, and every later navigation is the same form posted with a
+    different pageIndex or listing ID. The responses go through the same
+    BeautifulSoup extraction as the browser backend. Blocking requests
+    calls run in worker threads so detail fetches overlap on the event loop.
+    """
+
+    name = 'HTTP'
+
+    def __init__(self, list_url, worker_count=3, log=print, requests_per_second=0, wait_timeout=30, metrics=None,
+                 max_retries=2, retry_backoff=1.0, date_from=None):
+        super().__init__(list_url, worker_count, log, requests_per_second, wait_timeout, metrics, max_retries,
+                         retry_backoff, date_from)
+        self.session = None
+        self.slots = None
+        self.form_action = list_url
+        self.form_fields = {}
+        self.page_index = 1
+        self.current_rows = []
+        self.has_next = False
+
+    async def open(self):
+        """Load the listings page, read its search form and post the 'Hiring' search"""
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.worker_count + 1)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.slots = asyncio.Semaphore(self.worker_count)
+
+        self.log("🌐 Loading job listings page over HTTP...")
+        await self.rate_limiter.acquire()
+        response = await asyncio.to_thread(self.session.get, self.list_url, timeout=self.wait_timeout)
+        response.raise_for_status()
+        self.read_search_form(response.content)
+
+        # Same as selecting 구인중 in #endYn and clicking fnSearch
+        self.form_fields[site_profile.DEADLINE_FIELD] = site_profile.HIRING_VALUE
+        if self.date_from and site_profile.DATE_FROM_FIELD in self.form_fields:
+            self.form_fields[site_profile.DATE_FROM_FIELD] = self.date_from
+            self.log(f"📅 Search limited to listings registered since {self.date_from}")
+        await self.load_page(1)
+
+    def read_search_form(self, html_content):
+        """Capture the search form's action and default field values"""
+        soup = BeautifulSoup(html_content, 'html.parser')
+        deadline = soup.find('select', attrs={'name': site_profile.DEADLINE_FIELD})
+        form = deadline.find_parent('form') if deadline else soup.find('form')
+        fields = {}
+        if form:
+            self.form_action = urljoin(self.list_url, form.get('action') or self.list_url)
+            for field in form.find_all('input'):
+                if field.get('name') and field.get('type') not in ('button', 'submit', 'image'):
+                    fields[field['name']] = field.get('value', '')
+            for field in form.find_all('select'):
+                if field.get('name'):
+                    option = field.find('option', selected=True) or field.find('option')
+                    fields[field['name']] = option.get('value', '') if option else ''
+        fields[site_profile.FLAG_FIELD] = site_profile.LIST_FLAG
+        self.form_fields = fields
+        soup.decompose()
+
+    async def load_page(self, page_index):
+        data = dict(self.form_fields)
+        data[site_profile.PAGE_INDEX_FIELD] = str(page_index)
+        await self.rate_limiter.acquire()
+        with self.metrics.stage('list_request'):
+            response = await asyncio.to_thread(self.session.post, self.form_action, data=data, timeout=self.wait_timeout)
+        response.raise_for_status()
+        with self.metrics.stage('list_parse'):
+            self.current_rows, self.has_next = parse_results_page(response.content)
+        response.close()
+        self.page_index = page_index
+
+    async def read_targets(self):
+        return self.current_rows
+
+    async def fetch_one(self, target):
+        async with self.slots:
+            await self.rate_limiter.acquire()
+            return await asyncio.to_thread(self.fetch_detail, target)
+
+    def fetch_detail(self, target):
+        data = dict(self.form_fields)
+        data[site_profile.FLAG_FIELD] = site_profile.DETAIL_FLAG
+        data[site_profile.PAGE_INDEX_FIELD] = str(self.page_index)
+        data[site_profile.DETAIL_ID_FIELD] = target.listing_id
+        with self.metrics.stage('detail_request'):
+            response = self.session.post(urljoin(self.list_url, site_profile.DETAIL_PATH), data=data, timeout=self.wait_timeout)
+        if response.status_code in GONE_STATUSES:
+            return None  # Taken down: same as a detail page without its table, not a failure to retry
+        response.raise_for_status()
+        with self.metrics.stage('detail_parse'):
+            return parse_job_detail(response.content, warn=self.warn_layout)
+
+    async def next_page(self):
+        """Post the search form for the following page; False when the pager has no next link"""
+        if not self.has_next:
+            return False
+        await self.load_page(self.page_index + 1)
+        return True
+
+    async def has_next_page(self):
+        return self.has_next
+
+    async def goto_page(self, page_index):
+        await self.load_page(page_index)
+
+    async def close(self):
+        await super().close()
+        if self.session:
+            self.session.close()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Headless command-line entry point for scheduled/server runs.
+Runs the same crawl as the GUI without importing any GUI modules; the
+engine (and through it playwright/bs4) is only imported once the
+arguments have been validated, so --help and bad input return immediately.
+
+    python job_automation_cli.py --days-back 3 --backend HTTP --workers 6
+    python job_automation_cli.py --backend HTTP --schedule "0 */6 * * *"
+    python job_automation_cli.py --backend HTTP --refresh --refresh-days 7
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from contact_index import CONTACT_POLICIES, dedupe_output  # Standard library only
+from crawl_scheduler import RunHistory, RunLock, RunOutcome, parse_schedule, scheduled_config
+from output_sinks import EXPORT_FORMATS, SINK_TYPES
+from row_normalizer import canonical_province
+
+DEFAULT_OUTPUT = '주소록_샘플.csv'
+DEFAULT_INDEX = 'listing_index.db'
+DEFAULT_CHECKPOINT = 'crawl_checkpoint.json'
+DEFAULT_DEAD_LETTERS = 'dead_letters.jsonl'
+DEFAULT_LOCK = 'crawl.lock'
+DEFAULT_CHANGE_LOG = 'listing_changes.jsonl'
+EXIT_BUSY = 75  # EX_TEMPFAIL: another crawl holds the lock
+MAX_WORKERS = 32
+MAX_SHARDS = 16
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Crawl childcare.go.kr job listings into the template CSV')
+    parser.add_argument('--days-back', type=int, default=7,
+                        help='stop at listings older than this many days (default: 7)')
+    parser.add_argument('--no-date-filter', action='store_true',
+                        help='process every listing regardless of creation date')
+    parser.add_argument('--no-server-date-filter', dest='server_date_filter', action='store_false',
+                        help="don't pass the date window to the site's own search, only cut off client-side")
+    parser.add_argument('--probe-pages', action='store_true',
+                        help='binary-search for the last page in range before crawling (always on with --shards)')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT,
+                        help=f'template CSV to write (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--index', default=DEFAULT_INDEX,
+                        help=f'listing index database (default: {DEFAULT_INDEX})')
+    parser.add_argument('--backend', choices=['Browser', 'HTTP'], default='Browser',
+                        help='fetch backend (default: Browser)')
+    parser.add_argument('--workers', '--concurrency', dest='workers', type=int, default=3,
+                        help='concurrent detail-page fetches (default: 3)')
+    parser.add_argument('--shards', type=int, default=1,
+                        help='worker processes splitting the results pages, each with its own browser (default: 1)')
+    parser.add_argument('--headed', action='store_true',
+                        help='show the browser window (headless by default)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='append to the output and skip listings already in the index')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue from the last checkpoint of an interrupted crawl')
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT,
+                        help=f'checkpoint file (default: {DEFAULT_CHECKPOINT})')
+    parser.add_argument('--user-data-dir', default=None,
+                        help='persistent browser profile directory, keeps cookies and cache between runs')
+    parser.add_argument('--no-block-resources', dest='block_resources', action='store_false',
+                        help='let the browser load images, fonts and stylesheets')
+    parser.add_argument('--max-retries', type=int, default=2,
+                        help='extra attempts for a failed listing or results page (default: 2)')
+    parser.add_argument('--retry-backoff', type=float, default=1.0,
+                        help='seconds before the first retry, doubled for each further one (default: 1)')
+    parser.add_argument('--dead-letters', default=DEFAULT_DEAD_LETTERS,
+                        help=f'file of listings that failed every attempt (default: {DEFAULT_DEAD_LETTERS})')
+    parser.add_argument('--retry-failed', action='store_true',
+                        help='only refetch the listings in the dead-letter file and append them to the output')
+    parser.add_argument('--refresh', action='store_true',
+                        help='only re-check saved listings for edits and closures, logging them instead of adding rows')
+    parser.add_argument('--refresh-days', type=int, default=14,
+                        help='re-check listings posted within this many days (default: 14)')
+    parser.add_argument('--refresh-limit', type=int, default=0,
+                        help='most listings one refresh re-checks, newest first; 0 for every one that is due')
+    parser.add_argument('--change-log', default=DEFAULT_CHANGE_LOG,
+                        help=f'where refreshes log changed and closed listings (default: {DEFAULT_CHANGE_LOG})')
+    parser.add_argument('--rate', type=float, default=4.0,
+                        help='maximum requests per second to the site, 0 for unlimited (default: 4)')
+    parser.add_argument('--wait-timeout', type=float, default=30,
+                        help='seconds to wait for a page element or response (default: 30)')
+    parser.add_argument('--flush-rows', type=int, default=25,
+                        help='rows buffered before writing to the output (default: 25)')
+    parser.add_argument('--flush-interval', type=float, default=5.0,
+                        help='seconds before buffered rows are written anyway (default: 5)')
+    parser.add_argument('--export', dest='exports', action='append', choices=EXPORT_FORMATS, default=[],
+                        help='also stream saved rows to <output>.jsonl/.sqlite/.parquet while crawling (repeatable)')
+    parser.add_argument('--province', dest='provinces', action='append', default=[],
+                        help='only crawl listings in this province, e.g. 서울 or 경상남도 (repeatable)')
+    parser.add_argument('--no-normalize', dest='normalize', action='store_false',
+                        help="write emails and addresses as listed, without the Province/City/District/Email Valid "
+                             "columns filled in")
+    parser.add_argument('--recycle-every', type=int, default=500,
+                        help='relaunch the browser after this many listings to bound its memory, 0 to never '
+                             '(default: 500)')
+    parser.add_argument('--memory-limit-mb', type=float, default=0,
+                        help='also recycle once the crawl and its browser use this much memory, 0 for no limit')
+    parser.add_argument('--metrics-json', default=None,
+                        help='write per-stage timings of the run to this JSON file')
+    parser.add_argument('--metrics-prom', default=None,
+                        help='write the same metrics in Prometheus text format (e.g. for a textfile collector)')
+    parser.add_argument('--contacts', choices=CONTACT_POLICIES, default='merge',
+                        help='keep every listing, merge rows of the same contact, or also skip detail fetches '
+                             'for facilities already captured (default: merge)')
+    parser.add_argument('--dedupe-output', action='store_true',
+                        help='only merge rows of the same contact in the output file, then exit')
+    parser.add_argument('--schedule', default=None,
+                        help='keep running and crawl new listings on a schedule: an interval ("every 6h", "30m") '
+                             'or a cron expression ("0 */6 * * *")')
+    parser.add_argument('--lock-file', default=DEFAULT_LOCK,
+                        help=f'lock file that keeps two crawls from running at once (default: {DEFAULT_LOCK})')
+    parser.add_argument('--list-url', default=None,
+                        help='listings page URL (e.g. a local fixture server)')
+    return parser
+
+
+def validate_args(parser, args):
+    """Reject bad settings before any heavy module is imported"""
+    if args.days_back < 0:
+        parser.error('--days-back must be 0 or more')
+    if args.rate < 0 or args.wait_timeout <= 0:
+        parser.error('--rate must be 0 or more and --wait-timeout positive')
+    if args.max_retries < 0 or args.retry_backoff < 0:
+        parser.error('--max-retries and --retry-backoff must be 0 or more')
+    if args.flush_rows < 1 or args.flush_interval < 0:
+        parser.error('--flush-rows must be at least 1 and --flush-interval 0 or more')
+    if args.refresh and (args.resume or args.retry_failed):
+        parser.error('--refresh cannot be combined with --resume or --retry-failed')
+    if args.refresh_days < 0 or args.refresh_limit < 0:
+        parser.error('--refresh-days and --refresh-limit must be 0 or more')
+    if args.recycle_every < 0 or args.memory_limit_mb < 0:
+        parser.error('--recycle-every and --memory-limit-mb must be 0 or more')
+    if not 1 <= args.workers <= MAX_WORKERS:
+        parser.error(f'--workers must be between 1 and {MAX_WORKERS}')
+    if not 1 <= args.shards <= MAX_SHARDS:
+        parser.error(f'--shards must be between 1 and {MAX_SHARDS}')
+    if args.schedule:
+        try:
+            args.schedule = parse_schedule(args.schedule)
+        except ValueError as e:
+            parser.error(f'--schedule: {e}')
+        if args.resume or args.retry_failed:
+            parser.error('--schedule runs incremental crawls; it cannot be combined with --resume or --retry-failed')
+    provinces = [canonical_province(name) for name in args.provinces]
+    if '' in provinces:
+        parser.error(f"--province: unknown province {args.provinces[provinces.index('')]}")
+    args.provinces = list(dict.fromkeys(provinces))
+    for fmt in args.exports:
+        if fmt not in SINK_TYPES:
+            parser.error(f'--export {fmt} needs pyarrow (pip install pyarrow)')
+    for path in (args.output, args.index, args.checkpoint, args.dead_letters, args.metrics_json, args.metrics_prom,
+                 args.lock_file, args.change_log):
+        if not path:
+            continue
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            parser.error(f'directory does not exist: {directory}')
+
+
+def print_event(event):
+    msg_type = event.get('type')
+    if msg_type == 'log':
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        print(f"[{timestamp}] {event['text']}", flush=True)
+    elif msg_type == 'error':
+        print(event['text'], file=sys.stderr, flush=True)
+
+
+def run_crawl(config, lock, history, trigger):
+    """One crawl under the lock, recorded in the run history; returns the exit code"""
+    from automation_engine import create_engine
+
+    engine = create_engine(config)  # Before the lock, so a failure here can't leave it held
+    if not lock.acquire(trigger):
+        holder = lock.holder() or {}
+        reason = f"another crawl is running (pid {holder.get('pid')}, since {holder.get('started_at')})"
+        print(f"⏳ Not starting: {reason}", file=sys.stderr, flush=True)
+        history.skipped(trigger, reason)
+        return EXIT_BUSY
+    try:
+        run_id = history.start(trigger)
+    except Exception:
+        lock.release()
+        raise
+    outcome = RunOutcome()
+    engine.subscribe(print_event)
+    engine.subscribe(outcome)
+    try:
+        engine.run_sync()
+    except KeyboardInterrupt:
+        print(f"⏹️ Interrupted - {engine.total_saved} jobs saved", file=sys.stderr)
+        raise
+    finally:
+        history.finish(run_id, outcome.status, engine.total_saved, engine.current_page,
+                       engine.high_water_mark, outcome.error)
+        lock.release()
+    print(f"📊 {engine.total_saved} jobs saved to {config.output_file}", flush=True)
+    return 1 if outcome.status == 'error' else 0
+
+
+def run_schedule(schedule, config, lock, history):
+    """Crawl at every time the schedule gives until interrupted; missed times are skipped, not queued"""
+    next_run = schedule.first_run(datetime.now())
+    while True:
+        print(f"⏰ Next run at {next_run:%Y-%m-%d %H:%M}", flush=True)
+        time.sleep(max(0.0, (next_run - datetime.now()).total_seconds()))
+        run_crawl(scheduled_config(config, history), lock, history, 'scheduled')
+        next_run = schedule.next_run(next_run)
+        if next_run < datetime.now():
+            next_run = schedule.next_run(datetime.now())
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    validate_args(parser, args)
+
+    if args.dedupe_output:
+        if not os.path.exists(args.output):
+            print(f"❌ {args.output} does not exist", file=sys.stderr)
+            return 1
+        kept, merged = dedupe_output(args.output, exports=args.exports)
+        print(f"👥 {args.output}: {kept} contacts kept, {merged} duplicate rows merged")
+        return 0
+
+    from automation_engine import CrawlConfig
+    import site_profile
+
+    config = CrawlConfig(
+        list_url=args.list_url or site_profile.LIST_URL,
+        backend=args.backend,
+        worker_count=args.workers,
+        headless=not args.headed,
+        date_filter_enabled=not args.no_date_filter,
+        days_back=args.days_back,
+        incremental=args.incremental,
+        resume=args.resume,
+        output_file=args.output,
+        index_file=args.index,
+        flush_rows=args.flush_rows,
+        flush_interval=args.flush_interval,
+        requests_per_second=args.rate,
+        wait_timeout=args.wait_timeout,
+        checkpoint_file=args.checkpoint,
+        metrics_file=args.metrics_json,
+        prometheus_file=args.metrics_prom,
+        shard_count=args.shards,
+        user_data_dir=args.user_data_dir,
+        block_resources=args.block_resources,
+        max_retries=args.max_retries,
+        retry_backoff=args.retry_backoff,
+        dead_letter_file=args.dead_letters,
+        retry_failed=args.retry_failed,
+        server_date_filter=args.server_date_filter,
+        probe_pages=args.probe_pages,
+        contact_policy=args.contacts,
+        export_formats=args.exports,
+        normalize_rows=args.normalize,
+        provinces=args.provinces,
+        recycle_every=args.recycle_every,
+        memory_limit_mb=args.memory_limit_mb,
+        refresh=args.refresh,
+        refresh_days=args.refresh_days,
+        refresh_limit=args.refresh_limit,
+        change_log_file=args.change_log
+    )
+    lock = RunLock(args.lock_file)
+    history = RunHistory(args.index)
+    try:
+        if args.schedule:
+            run_schedule(args.schedule, config, lock, history)
+        return run_crawl(config, lock, history, 'cli')
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        history.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
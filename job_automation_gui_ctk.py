@@ -1,19 +1,45 @@
 import customtkinter as ctk
 import tkinter as tk
-from tkinter import messagebox
-import threading
-import time
-import csv
-from datetime import datetime, timedelta
-from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
+from tkinter import messagebox, ttk
+import os
+import glob
+from datetime import datetime
 import queue
+# The crawl engine (asyncio, the HTML parsers, Playwright) is imported on the first Start, after the window is up
+from crawl_scheduler import RunHistory, RunLock, RunOutcome, parse_schedule, scheduled_config
+from output_sinks import EXPORT_FORMATS, SINK_TYPES
+from results_browser import ResultsBrowser
+from row_normalizer import ADMINISTRATIVE_DIVISIONS
+
+LOG_COLORS = {
+    'error': "red",
+    'saved': "green",
+    'cutoff': "yellow",
+    'processing': "blue",
+    'info': "white"
+}
+MAX_LOG_LINES = 2000  # Lines kept in the on-screen log; the log file keeps everything
+MAX_MESSAGES_PER_TICK = 1000  # Queue messages handled per GUI refresh
+CRAWL_TAB = "🚀 Crawl"
+RESULTS_TAB = "📊 Results"
+SCHEDULE_CHECK_MS = 15000  # How often the scheduler checks whether a run is due
+HISTORY_COLUMNS = (
+    ('started_at', "Started", 150), ('trigger', "Trigger", 80), ('status', "Status", 80), ('saved', "Saved", 60),
+    ('pages', "Pages", 60), ('high_water_mark', "Newest Listing", 110), ('error', "Note", 320)
+)
+ALL_PROVINCES = "All provinces"
+CONTACT_POLICY_LABELS = {
+    'Keep every listing': 'keep',
+    'One row per contact': 'merge',
+    'Skip known facilities': 'skip'
+}
 
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("blue")
 
 class JobAutomationGUI:
-    def __init__(self):
+    def __init__(self, startup_timer=None):
+        self.startup_timer = startup_timer  # Marks startup phases for --debug-startup, None otherwise
         self.root = ctk.CTk()
         self.root.title("Job Listing Automation Tool - Advanced")
         self.root.geometry("1100x850")  # Increased height for new controls
@@ -25,13 +51,45 @@ class JobAutomationGUI:
         self.total_saved = 0
         self.total_skipped = 0  # New: track skipped jobs
         self.current_page = 1
+        self.total_pages = None  # Known when the crawl probes for its last page
         self.current_job_index = 0
         self.total_jobs_on_page = 0
         self.is_running = False
         self.stop_requested = False
         self.date_cutoff_reached = False  # New: track if we hit date cutoff
         self.headless_mode = False  # New: browser headless mode setting
+        self.worker_count = 3  # Concurrent detail-page workers
+        self.shard_count = 1  # Worker processes splitting the results pages
+        self.shard_progress = []  # One dict per worker process while sharded
+        self.fetch_backend = "Browser"  # Browser (Playwright) or HTTP (form posts, no browser)
         self.template_file = '주소록_샘플.csv'  # New: template file to update
+        self.index_file = 'listing_index.db'  # Listings already saved, for incremental runs
+        self.checkpoint_file = 'crawl_checkpoint.json'  # Progress of an interrupted run, for Resume
+        self.dead_letter_file = 'dead_letters.jsonl'  # Listings that failed every retry, for Retry Failed
+        self.change_log_file = 'listing_changes.jsonl'  # Edited/closed listings found by Check for Changes
+        self.metrics_file = 'crawl_metrics.json'  # Stage timings of the last run
+        self.listings_per_minute = 0.0
+        self.page_eta = None  # Seconds left on the current page, None until the rate is known
+        self.memory_mb = None  # Python + browser RSS of the running crawl, None until measured
+        self.recycles = 0  # Browser relaunches by the memory governor this run
+        self.incremental_mode = False  # Skip known listings and keep the existing template rows
+        self.contact_policy = 'merge'  # keep / merge / skip, see CONTACT_POLICY_LABELS
+        self.export_formats = []  # Streamed copies of the template: jsonl / sqlite / parquet
+        self.province = ''  # Only crawl listings in this province, '' for all
+        self.requests_per_second = 4.0  # Politeness limit for page loads, 0 = unlimited
+        self.keep_browser_warm = True  # Reuse one browser between runs instead of relaunching
+        self.block_resources = True  # Skip images, fonts and stylesheets
+        self.persistent_profile = False  # Keep cookies and cache in browser_profile_dir across app restarts
+        self.browser_profile_dir = 'browser_profile'
+        self.engine_loop = None  # Created on the first run, then shared by every run
+        self.lock_file = 'crawl.lock'  # Held while any crawl (GUI or CLI) runs
+        self.run_lock = RunLock(self.lock_file)
+        self.run_history = None  # Opened on the first run or history view
+        self.run_id = None  # History row of the running crawl
+        self.run_outcome = None
+        self.schedule = None  # Parsed schedule while "Run on schedule" is on
+        self.next_scheduled_run = None
+        self.browser_session = None
         self.current_job_data = {
             'title': '',
             'name': '',
@@ -41,28 +99,72 @@ class JobAutomationGUI:
             'creation_date': ''  # New: track creation date
         }
         self.message_queue = queue.Queue()
+        self.log_file_path = 'automation.log'  # Full activity log, the on-screen log is capped
+        self.log_file = None
+        self.log_text = None  # Built after the first paint; earlier log lines wait in the queue
+        self.stats_dirty = True
+        self.job_display_dirty = True
+
+        # Crawl controls and the results browser on separate tabs
+        self.tabs = ctk.CTkTabview(self.root, command=self.on_tab_changed)
+        self.tabs.grid(row=0, column=0, sticky="nsew", padx=0, pady=0)
+        crawl_tab = self.tabs.add(CRAWL_TAB)
+        crawl_tab.grid_columnconfigure(0, weight=1)
+        crawl_tab.grid_rowconfigure(0, weight=1)
+        self.tabs.add(RESULTS_TAB)
 
         # Main scrollable frame
-        self.scrollable_frame = ctk.CTkScrollableFrame(self.root, orientation="vertical")
+        self.scrollable_frame = ctk.CTkScrollableFrame(crawl_tab, orientation="vertical")
         self.scrollable_frame.grid(row=0, column=0, sticky="nsew", padx=0, pady=0)
         self.scrollable_frame.grid_columnconfigure(0, weight=1)
 
+        self.results_browser = None  # Built the first time the Results tab is opened
+
         self.setup_gui()
-        self.update_gui()
+        self.refresh_resume_button()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.mark_startup('window built')
+        # after_idle queues behind Tk's own layout and redraw of the window; the after(0) inside
+        # lets the events from mapping it through, so the window is on screen before the rest is built
+        self.root.after_idle(lambda: self.root.after(0, self.finish_startup))
 
     def setup_gui(self):
+        """Build what shows above the fold; the rest waits for finish_startup"""
         # Header
         self.create_header_section(self.scrollable_frame)
         # Controls
         self.create_control_section(self.scrollable_frame)
         # Date filter controls
         self.create_date_filter_section(self.scrollable_frame)
+
+    def finish_startup(self):
+        """Build the sections below the fold once the window is on screen, then start polling the queue"""
+        self.mark_startup('first paint')
         # Stats
         self.create_statistics_section(self.scrollable_frame)
         # Current job
         self.create_current_job_section(self.scrollable_frame)
         # Log
         self.create_log_section(self.scrollable_frame)
+        self.mark_startup('interactive')
+        self.update_gui()
+        if self.startup_timer:
+            self.report_startup()
+
+    def mark_startup(self, phase):
+        if self.startup_timer:
+            self.startup_timer.mark(phase)
+
+    def report_startup(self):
+        """Print the --debug-startup report and note the headline numbers in the activity log"""
+        timer = self.startup_timer
+        timer.stop_tracking()
+        print("\n".join(timer.report()))
+        self.log_message(
+            f"⏱️ Window painted in {timer.elapsed('first paint'):.2f}s, interactive in "
+            f"{timer.elapsed('interactive'):.2f}s (imports {timer.elapsed('imports') or 0:.2f}s) - "
+            f"details on the console"
+        )
 
     def create_header_section(self, parent):
         header_frame = ctk.CTkFrame(parent, fg_color="transparent")
@@ -115,6 +217,27 @@ class JobAutomationGUI:
             fg_color="red", hover_color="darkred", state="disabled"
         )
         self.stop_button.pack(side="left", padx=(0, 15))
+
+        self.resume_button = ctk.CTkButton(
+            buttons_frame, text="⏯️ Resume", command=lambda: self.start_automation(resume=True),
+            font=ctk.CTkFont(size=16, weight="bold"), height=45,
+            fg_color="#1f6aa5", hover_color="#144870", state="disabled"
+        )
+        self.resume_button.pack(side="left", padx=(0, 15))
+
+        self.retry_button = ctk.CTkButton(
+            buttons_frame, text="🔁 Retry Failed", command=lambda: self.start_automation(retry_failed=True),
+            font=ctk.CTkFont(size=16, weight="bold"), height=45,
+            fg_color="#b36b00", hover_color="#7a4900", state="disabled"
+        )
+        self.retry_button.pack(side="left", padx=(0, 15))
+
+        self.refresh_button = ctk.CTkButton(
+            buttons_frame, text="🔎 Check for Changes", command=lambda: self.start_automation(refresh=True),
+            font=ctk.CTkFont(size=16, weight="bold"), height=45,
+            fg_color="#5b4b8a", hover_color="#3e3360", state="disabled"
+        )
+        self.refresh_button.pack(side="left", padx=(0, 15))
         
         self.status_label = ctk.CTkLabel(
             buttons_frame, text="⏸️ Ready", font=ctk.CTkFont(size=16, weight="bold"), text_color="gray"
@@ -146,6 +269,217 @@ class JobAutomationGUI:
         )
         browser_info.pack(side="left")
 
+        # Concurrent detail-page workers
+        workers_frame = ctk.CTkFrame(control_frame, fg_color="transparent")
+        workers_frame.pack(pady=(15, 0))
+
+        workers_label = ctk.CTkLabel(
+            workers_frame, text="⚙️ Detail Workers:",
+            font=ctk.CTkFont(size=14, weight="bold")
+        )
+        workers_label.pack(side="left", padx=(0, 15))
+
+        self.worker_count_menu = ctk.CTkOptionMenu(
+            workers_frame, values=["1", "2", "3", "4", "6", "8"], width=80
+        )
+        self.worker_count_menu.pack(side="left", padx=(0, 20))
+        self.worker_count_menu.set(str(self.worker_count))
+
+        workers_info = ctk.CTkLabel(
+            workers_frame,
+            text="💡 Detail pages are fetched in parallel",
+            font=ctk.CTkFont(size=11), text_color="gray"
+        )
+        workers_info.pack(side="left", padx=(0, 20))
+
+        backend_label = ctk.CTkLabel(
+            workers_frame, text="🔌 Fetch Backend:",
+            font=ctk.CTkFont(size=14, weight="bold")
+        )
+        backend_label.pack(side="left", padx=(0, 15))
+
+        self.backend_menu = ctk.CTkOptionMenu(
+            workers_frame, values=["Browser", "HTTP"], width=100
+        )
+        self.backend_menu.pack(side="left", padx=(0, 20))
+        self.backend_menu.set(self.fetch_backend)
+
+        shards_label = ctk.CTkLabel(
+            workers_frame, text="🧩 Processes:",
+            font=ctk.CTkFont(size=14, weight="bold")
+        )
+        shards_label.pack(side="left", padx=(0, 15))
+
+        self.shard_count_menu = ctk.CTkOptionMenu(
+            workers_frame, values=["1", "2", "4", "8"], width=80
+        )
+        self.shard_count_menu.pack(side="left")
+        self.shard_count_menu.set(str(self.shard_count))
+
+        # Incremental crawl
+        incremental_frame = ctk.CTkFrame(control_frame, fg_color="transparent")
+        incremental_frame.pack(pady=(15, 0))
+
+        self.incremental_switch = ctk.CTkSwitch(
+            incremental_frame, text="♻️ Incremental (skip already saved listings)",
+            font=ctk.CTkFont(size=14)
+        )
+        self.incremental_switch.pack(side="left", padx=(0, 20))
+
+        incremental_info = ctk.CTkLabel(
+            incremental_frame,
+            text="💡 Appends to the template and stops at the first page that is fully known",
+            font=ctk.CTkFont(size=11), text_color="gray"
+        )
+        incremental_info.pack(side="left", padx=(0, 20))
+
+        rate_label = ctk.CTkLabel(
+            incremental_frame, text="🐢 Rate Limit (req/s):",
+            font=ctk.CTkFont(size=14, weight="bold")
+        )
+        rate_label.pack(side="left", padx=(0, 15))
+
+        self.rate_limit_menu = ctk.CTkOptionMenu(
+            incremental_frame, values=["1", "2", "4", "8", "Unlimited"], width=110
+        )
+        self.rate_limit_menu.pack(side="left")
+        self.rate_limit_menu.set("4")
+
+        # Browser reuse between runs
+        warm_frame = ctk.CTkFrame(control_frame, fg_color="transparent")
+        warm_frame.pack(pady=(15, 0))
+
+        self.keep_warm_switch = ctk.CTkSwitch(
+            warm_frame, text="🔥 Keep browser open between runs", font=ctk.CTkFont(size=14)
+        )
+        self.keep_warm_switch.pack(side="left", padx=(0, 20))
+        if self.keep_browser_warm:
+            self.keep_warm_switch.select()
+
+        self.block_resources_switch = ctk.CTkSwitch(
+            warm_frame, text="🚫 Skip images/fonts/CSS", font=ctk.CTkFont(size=14)
+        )
+        self.block_resources_switch.pack(side="left", padx=(0, 20))
+        if self.block_resources:
+            self.block_resources_switch.select()
+
+        self.persistent_profile_switch = ctk.CTkSwitch(
+            warm_frame, text="💾 Persistent profile (cookies & cache)", font=ctk.CTkFont(size=14)
+        )
+        self.persistent_profile_switch.pack(side="left")
+        if self.persistent_profile:
+            self.persistent_profile_switch.select()
+
+        # Duplicate contacts
+        contacts_frame = ctk.CTkFrame(control_frame, fg_color="transparent")
+        contacts_frame.pack(pady=(15, 0))
+
+        contacts_label = ctk.CTkLabel(
+            contacts_frame, text="👥 Same Contact:",
+            font=ctk.CTkFont(size=14, weight="bold")
+        )
+        contacts_label.pack(side="left", padx=(0, 15))
+
+        self.contact_policy_menu = ctk.CTkOptionMenu(
+            contacts_frame, values=list(CONTACT_POLICY_LABELS), width=200
+        )
+        self.contact_policy_menu.pack(side="left", padx=(0, 20))
+        self.contact_policy_menu.set(
+            next(label for label, policy in CONTACT_POLICY_LABELS.items() if policy == self.contact_policy)
+        )
+
+        self.dedupe_button = ctk.CTkButton(
+            contacts_frame, text="🧹 Merge Duplicates in Template", command=self.dedupe_template, width=220
+        )
+        self.dedupe_button.pack(side="left")
+
+        # Region scope
+        province_frame = ctk.CTkFrame(control_frame, fg_color="transparent")
+        province_frame.pack(pady=(15, 0))
+
+        province_label = ctk.CTkLabel(
+            province_frame, text="🗺️ Province:",
+            font=ctk.CTkFont(size=14, weight="bold")
+        )
+        province_label.pack(side="left", padx=(0, 15))
+
+        self.province_menu = ctk.CTkOptionMenu(
+            province_frame, values=[ALL_PROVINCES] + list(ADMINISTRATIVE_DIVISIONS), width=180
+        )
+        self.province_menu.pack(side="left", padx=(0, 20))
+        self.province_menu.set(self.province or ALL_PROVINCES)
+
+        province_info = ctk.CTkLabel(
+            province_frame,
+            text="💡 Listings elsewhere are skipped before their detail pages are opened",
+            font=ctk.CTkFont(size=11), text_color="gray"
+        )
+        province_info.pack(side="left")
+
+        # Extra outputs streamed next to the template
+        exports_frame = ctk.CTkFrame(control_frame, fg_color="transparent")
+        exports_frame.pack(pady=(15, 0))
+
+        exports_label = ctk.CTkLabel(
+            exports_frame, text="📦 Also Write:",
+            font=ctk.CTkFont(size=14, weight="bold")
+        )
+        exports_label.pack(side="left", padx=(0, 15))
+
+        self.export_checkboxes = {}
+        for fmt in EXPORT_FORMATS:
+            checkbox = ctk.CTkCheckBox(exports_frame, text=fmt.upper(), font=ctk.CTkFont(size=14))
+            checkbox.pack(side="left", padx=(0, 15))
+            if fmt not in SINK_TYPES:
+                checkbox.configure(state="disabled", text=f"{fmt.upper()} (needs pyarrow)")
+            elif fmt in self.export_formats:
+                checkbox.select()
+            self.export_checkboxes[fmt] = checkbox
+
+        exports_info = ctk.CTkLabel(
+            exports_frame,
+            text="💡 Updated while crawling, so other tools can read results mid-run",
+            font=ctk.CTkFont(size=11), text_color="gray"
+        )
+        exports_info.pack(side="left")
+
+        # Unattended runs
+        schedule_frame = ctk.CTkFrame(control_frame, fg_color="transparent")
+        schedule_frame.pack(pady=(15, 0))
+
+        schedule_label = ctk.CTkLabel(
+            schedule_frame, text="⏰ Schedule:",
+            font=ctk.CTkFont(size=14, weight="bold")
+        )
+        schedule_label.pack(side="left", padx=(0, 15))
+
+        self.schedule_entry = ctk.CTkEntry(schedule_frame, width=150, placeholder_text="every 6h")
+        self.schedule_entry.pack(side="left", padx=(0, 15))
+        self.schedule_entry.insert(0, "every 6h")
+
+        self.schedule_switch = ctk.CTkSwitch(
+            schedule_frame, text="Run on schedule", command=self.toggle_schedule, font=ctk.CTkFont(size=14)
+        )
+        self.schedule_switch.pack(side="left", padx=(0, 15))
+
+        self.next_run_label = ctk.CTkLabel(
+            schedule_frame, text="💡 Interval (30m, every 6h) or cron (0 */6 * * *); only new listings are fetched",
+            font=ctk.CTkFont(size=11), text_color="gray"
+        )
+        self.next_run_label.pack(side="left", padx=(0, 15))
+
+        history_button = ctk.CTkButton(
+            schedule_frame, text="📜 Run History", command=self.show_run_history, width=130
+        )
+        history_button.pack(side="left")
+
+    def on_tab_changed(self):
+        if self.tabs.get() == RESULTS_TAB:
+            if self.results_browser is None:
+                self.results_browser = ResultsBrowser(self.tabs.tab(RESULTS_TAB), self.template_file)
+                self.results_browser.pack(fill="both", expand=True, padx=10, pady=10)
+            self.results_browser.refresh()  # Only reads what was appended since the last look
+
     def toggle_headless_mode(self):
         """Toggle headless mode setting"""
         self.headless_mode = bool(self.headless_switch.get())  # Add bool() here
@@ -221,6 +555,8 @@ class JobAutomationGUI:
         self.create_stat_card(cards_frame, "Current Page", "1", "📄", 1)
         self.create_stat_card(cards_frame, "Progress", "0/0", "⚡", 2)
         self.create_stat_card(cards_frame, "Status", "Ready", "🎯", 3)  # Changed from Skipped to Status
+        self.create_stat_card(cards_frame, "Throughput", "-", "⏱️", 4)
+        self.create_stat_card(cards_frame, "Memory", "-", "🧠", 5)
         progress_frame = ctk.CTkFrame(stats_frame, fg_color="transparent")
         progress_frame.pack(fill="x", pady=(20, 0))
         progress_label = ctk.CTkLabel(
@@ -230,6 +566,11 @@ class JobAutomationGUI:
         self.progress_bar = ctk.CTkProgressBar(progress_frame)
         self.progress_bar.pack(fill="x", pady=(0, 5))
         self.progress_bar.set(0)
+        # Per-worker progress, only filled in for sharded runs
+        self.shard_progress_label = ctk.CTkLabel(
+            progress_frame, text="", font=ctk.CTkFont(size=12), text_color="gray", justify="left"
+        )
+        self.shard_progress_label.pack(anchor="w")
 
     def create_stat_card(self, parent, title, initial_value, icon, column):
         card_frame = ctk.CTkFrame(parent, corner_radius=15)
@@ -255,6 +596,10 @@ class JobAutomationGUI:
             self.current_page_card = value_label
         elif title == "Progress":
             self.progress_card = value_label
+        elif title == "Throughput":
+            self.throughput_card = value_label
+        elif title == "Memory":
+            self.memory_card = value_label
 
     def create_current_job_section(self, parent):
         job_frame = ctk.CTkFrame(parent, fg_color="transparent")
@@ -302,31 +647,59 @@ class JobAutomationGUI:
             log_container, font=ctk.CTkFont(size=12, family="Consolas"), wrap="word"
         )
         self.log_text.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
+        # One tag per level, configured once; lines are tagged as they are inserted
+        for level, color in LOG_COLORS.items():
+            self.log_text.tag_config(level, foreground=color)
 
-    def log_message(self, message):
-        timestamp = datetime.now().strftime("%H:%M:%S")
+    def log_level(self, message):
         if "Error" in message:
-            color = "red"
+            return 'error'
         elif "Saved" in message:
-            color = "green"
+            return 'saved'
         elif "Date cutoff reached" in message or "Stopped due to date" in message:
-            color = "yellow"
+            return 'cutoff'
         elif "Processing" in message:
-            color = "blue"
-        else:
-            color = "white"
-        log_entry = f"[{timestamp}] {message}\n"
-        self.log_text.insert("end", log_entry)
+            return 'processing'
+        return 'info'
+
+    def log_message(self, message):
+        if self.log_text is None:
+            self.send_message('log', text=message)
+            return
+        self.write_log_lines([message])
+
+    def write_log_lines(self, messages):
+        """Append a batch of log lines: tagged inserts, one scroll, one trim, one file write"""
+        if not messages:
+            return
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        entries = [f"[{timestamp}] {message}\n" for message in messages]
+        for message, entry in zip(messages, entries):
+            self.log_text.insert("end", entry, self.log_level(message))
         self.log_text.see("end")
-        last_line_start = self.log_text.index("end-2c linestart")
-        last_line_end = self.log_text.index("end-1c")
-        self.log_text.tag_add("colored", last_line_start, last_line_end)
-        self.log_text.tag_config("colored", foreground=color)
+
+        # Keep the textbox a fixed-size ring buffer
+        line_count = int(self.log_text.index("end-1c").split('.')[0])
+        if line_count > MAX_LOG_LINES:
+            self.log_text.delete("1.0", f"{line_count - MAX_LOG_LINES + 1}.0")
+
+        try:
+            if self.log_file is None:
+                self.log_file = open(self.log_file_path, 'a', encoding='utf-8')
+            self.log_file.writelines(entries)
+            self.log_file.flush()
+        except OSError:
+            pass
 
     def update_statistics(self):
         self.total_saved_card.configure(text=str(self.total_saved))
-        self.current_page_card.configure(text=str(self.current_page))
+        if self.total_pages:
+            self.current_page_card.configure(text=f"{self.current_page}/{self.total_pages}")
+        else:
+            self.current_page_card.configure(text=str(self.current_page))
         self.progress_card.configure(text=f"{self.current_job_index}/{self.total_jobs_on_page}")
+        self.throughput_card.configure(text=self.format_throughput())
+        self.memory_card.configure(text=self.format_memory())
         
         # Update status card based on current state
         if self.date_cutoff_reached:
@@ -341,6 +714,28 @@ class JobAutomationGUI:
             self.progress_bar.set(progress_percent)
         else:
             self.progress_bar.set(0)
+        self.shard_progress_label.configure(text="   ".join(
+            f"W{shard['shard'] + 1}: page {shard['page']} · {shard['saved']} saved · {shard['state']}"
+            + (f" · {shard['memory_mb']:.0f} MB" if shard.get('memory_mb') else "")
+            for shard in self.shard_progress
+        ))
+
+    def format_throughput(self):
+        """Listings per minute and time left on the current page, e.g. '42/min · 0:15'"""
+        if not self.listings_per_minute:
+            return "-"
+        if self.page_eta is None:
+            return f"{self.listings_per_minute:.0f}/min"
+        minutes, seconds = divmod(int(self.page_eta), 60)
+        return f"{self.listings_per_minute:.0f}/min · {minutes}:{seconds:02d}"
+
+    def format_memory(self):
+        """Memory of the crawl and how often the browser was recycled, e.g. '850 MB · ♻️ 2'"""
+        if not self.memory_mb:
+            return "-"
+        if not self.recycles:
+            return f"{self.memory_mb:.0f} MB"
+        return f"{self.memory_mb:.0f} MB · ♻️ {self.recycles}"
 
     def update_current_job_display(self):
         self.job_title_label.configure(text=self.current_job_data['title'] or "-")
@@ -351,27 +746,53 @@ class JobAutomationGUI:
         self.creation_date_label.configure(text=self.current_job_data['creation_date'] or "-")  # New
 
     def update_gui(self):
+        """Drain the queue in one pass: batch log lines and coalesce stats/current job updates"""
+        pending_logs = []
         try:
-            while True:
+            for _ in range(MAX_MESSAGES_PER_TICK):
                 message = self.message_queue.get_nowait()
-                self.handle_message(message)
+                msg_type = message.get('type')
+                if msg_type == 'log':
+                    pending_logs.append(message['text'])
+                elif msg_type in ('stats_update', 'current_job', 'throughput', 'shard_progress'):
+                    self.handle_message(message)
+                else:
+                    # Keep control messages in order with the log lines before them
+                    self.write_log_lines(pending_logs)
+                    pending_logs = []
+                    self.handle_message(message)
         except queue.Empty:
             pass
-        self.update_statistics()
-        self.update_current_job_display()
+        self.write_log_lines(pending_logs)
+        if self.stats_dirty:
+            self.update_statistics()
+            self.stats_dirty = False
+        if self.job_display_dirty:
+            self.update_current_job_display()
+            self.job_display_dirty = False
         self.root.after(100, self.update_gui)
 
     def handle_message(self, message):
         msg_type = message.get('type')
+        self.stats_dirty = True
         if msg_type == 'log':
             self.log_message(message['text'])
         elif msg_type == 'stats_update':
             self.total_saved = message.get('total_saved', self.total_saved)
             self.current_page = message.get('current_page', self.current_page)
+            self.total_pages = message.get('total_pages', self.total_pages)
             self.current_job_index = message.get('current_job_index', self.current_job_index)
             self.total_jobs_on_page = message.get('total_jobs_on_page', self.total_jobs_on_page)
+            self.memory_mb = message.get('memory_mb', self.memory_mb)
+            self.recycles = message.get('recycles', self.recycles)
+        elif msg_type == 'shard_progress':
+            self.shard_progress = message['shards']
+        elif msg_type == 'throughput':
+            self.listings_per_minute = message['listings_per_minute']
+            self.page_eta = message['page_eta']
         elif msg_type == 'current_job':
             self.current_job_data = message.get('data', self.current_job_data)
+            self.job_display_dirty = True
         elif msg_type == 'date_cutoff':
             self.date_cutoff_reached = True
             self.log_message("🛑 Date cutoff reached! Stopping automation to save resources.")
@@ -383,28 +804,268 @@ class JobAutomationGUI:
             self.log_message("✅ Automation completed!")
             self.status_label.configure(text="✅ Complete")
             self.stop_automation()
+        elif msg_type == 'finished':
+            self.finish_run()
+            self.refresh_resume_button()
+            if self.tabs.get() == RESULTS_TAB:
+                self.results_browser.refresh()
+
+    def refresh_resume_button(self):
+        """Offer Resume only while an interrupted run has left a checkpoint"""
+        checkpoints = [self.checkpoint_file] + glob.glob(self.checkpoint_file + '.shard*')
+        can_resume = not self.is_running and any(os.path.exists(path) for path in checkpoints)
+        self.resume_button.configure(state="normal" if can_resume else "disabled")
+        can_retry = not self.is_running and os.path.exists(self.dead_letter_file)
+        self.retry_button.configure(state="normal" if can_retry else "disabled")
+        can_refresh = not self.is_running and os.path.exists(self.index_file)
+        self.refresh_button.configure(state="normal" if can_refresh else "disabled")
 
-    def start_automation(self):
+    def start_automation(self, resume=False, retry_failed=False, trigger='manual', refresh=False):
         if not self.is_running:
+            if self.run_id is not None:
+                self.log_message("⏳ The previous run is still shutting down - try again in a moment")
+                return
+            self.worker_count = int(self.worker_count_menu.get())
+            self.fetch_backend = self.backend_menu.get()
+            self.shard_count = int(self.shard_count_menu.get())
+            self.incremental_mode = bool(self.incremental_switch.get())
+            self.contact_policy = CONTACT_POLICY_LABELS[self.contact_policy_menu.get()]
+            self.export_formats = [fmt for fmt, checkbox in self.export_checkboxes.items() if checkbox.get()]
+            province = self.province_menu.get()
+            self.province = '' if province == ALL_PROVINCES else province
+            rate = self.rate_limit_menu.get()
+            self.requests_per_second = 0 if rate == "Unlimited" else float(rate)
+            self.keep_browser_warm = bool(self.keep_warm_switch.get())
+            self.block_resources = bool(self.block_resources_switch.get())
+            self.persistent_profile = bool(self.persistent_profile_switch.get())
+            # Read every widget here on the Tk thread; the engine only sees the config.
+            # Everything that can fail is built before the lock is taken, so a bad setting can't leave it held.
+            try:
+                from automation_engine import EngineLoop, create_engine
+                if self.engine_loop is None:
+                    self.engine_loop = EngineLoop()
+                config = self.build_crawl_config(resume, retry_failed, refresh)
+                history = self.open_run_history()
+                if trigger == 'scheduled':
+                    config = scheduled_config(config, history)
+                engine = create_engine(config, self.prepare_browser_session(config))
+            except Exception as e:
+                self.log_message(f"❌ Error starting the crawl: {str(e)}")
+                if trigger == 'manual':
+                    messagebox.showerror("Error", f"Could not start the crawl: {str(e)}")
+                return
+            if not self.run_lock.acquire(trigger):
+                holder = self.run_lock.holder() or {}
+                reason = f"another crawl is running (pid {holder.get('pid')}, since {holder.get('started_at')})"
+                self.log_message(f"⏳ Not starting: {reason}")
+                history.skipped(trigger, reason)
+                return
+            try:
+                self.run_id = history.start(trigger)
+            except Exception as e:
+                self.run_lock.release()
+                self.log_message(f"❌ Error starting the crawl: {str(e)}")
+                return
             self.is_running = True
+            self.stats_dirty = True
             self.stop_requested = False
             self.date_cutoff_reached = False  # Reset date cutoff flag
             self.start_button.configure(state="disabled")
+            self.resume_button.configure(state="disabled")
+            self.retry_button.configure(state="disabled")
+            self.refresh_button.configure(state="disabled")
             self.stop_button.configure(state="normal")
-            self.status_label.configure(text="🔄 Running")
+            self.status_label.configure(
+                text="⏯️ Resuming" if resume else "🔁 Retrying" if retry_failed else "🔎 Checking" if refresh
+                else "⏰ Scheduled Run" if trigger == 'scheduled' else "🔄 Running"
+            )
             self.total_saved = 0
             self.current_page = 1
+            self.total_pages = None
             self.current_job_index = 0
             self.total_jobs_on_page = 0
-            self.automation_thread = threading.Thread(target=self.run_automation)
-            self.automation_thread.daemon = True
-            self.automation_thread.start()
-            self.log_message("🚀 Automation started!")
+            self.listings_per_minute = 0.0
+            self.page_eta = None
+            self.memory_mb = None
+            self.recycles = 0
+            self.shard_progress = []
+            self.run_outcome = RunOutcome()
+            self.engine = engine
+            self.engine.subscribe(self.run_outcome)
+            self.engine.subscribe(self.message_queue.put)
+            self.engine_loop.submit(self.engine.run())
+            self.log_message("⏯️ Automation resumed!" if resume else "🚀 Automation started!")
+
+    def open_run_history(self):
+        if self.run_history is None:
+            self.run_history = RunHistory(self.index_file)
+        return self.run_history
+
+    def finish_run(self):
+        """Record the run that just shut down and let the next one start"""
+        if self.run_id is None:
+            return
+        engine = self.engine
+        try:
+            self.open_run_history().finish(
+                self.run_id, self.run_outcome.status, engine.total_saved, engine.current_page,
+                engine.high_water_mark, self.run_outcome.error
+            )
+        finally:
+            self.run_id = None
+            self.run_lock.release()
+            self.close_log_file()
+
+    def close_log_file(self):
+        """Close the activity log file between runs; the next log line reopens it"""
+        if self.log_file is not None:
+            self.log_file.close()
+            self.log_file = None
+
+    def toggle_schedule(self):
+        if not self.schedule_switch.get():
+            self.schedule = self.next_scheduled_run = None
+            self.next_run_label.configure(text="⏸️ Schedule off")
+            self.log_message("⏰ Scheduled runs turned off")
+            return
+        try:
+            self.schedule = parse_schedule(self.schedule_entry.get())
+        except ValueError as e:
+            self.schedule_switch.deselect()
+            messagebox.showerror("Schedule", str(e))
+            return
+        self.next_scheduled_run = self.schedule.first_run(datetime.now())
+        self.log_message(f"⏰ Running on schedule '{self.schedule.text}' - incremental, new listings only")
+        self.check_schedule()
+
+    def check_schedule(self):
+        """Start the scheduled run when it is due; polls while the schedule is on"""
+        if self.schedule is None:
+            return
+        now = datetime.now()
+        if now >= self.next_scheduled_run:
+            if self.is_running or self.run_id is not None:
+                self.log_message("⏰ Scheduled run skipped - a crawl is already running")
+                self.open_run_history().skipped('scheduled', "a crawl was already running in this window")
+            else:
+                self.start_automation(trigger='scheduled')
+            self.next_scheduled_run = self.schedule.next_run(self.next_scheduled_run)
+            if self.next_scheduled_run < now:
+                self.next_scheduled_run = self.schedule.next_run(now)
+        self.next_run_label.configure(text=f"⏰ Next run: {self.next_scheduled_run:%Y-%m-%d %H:%M}")
+        self.root.after(SCHEDULE_CHECK_MS, self.check_schedule)
+
+    def show_run_history(self):
+        """Recent runs in a small table window"""
+        window = ctk.CTkToplevel(self.root)
+        window.title("Run History")
+        window.geometry("980x420")
+        tree = ttk.Treeview(window, columns=[name for name, _, _ in HISTORY_COLUMNS], show="headings")
+        for name, heading, width in HISTORY_COLUMNS:
+            tree.heading(name, text=heading)
+            tree.column(name, width=width, anchor="w")
+        tree.pack(fill="both", expand=True, padx=10, pady=10)
+
+        def refresh():
+            tree.delete(*tree.get_children())
+            for run in self.open_run_history().recent():
+                tree.insert("", "end", values=[run[name] if run[name] is not None else "" for name, _, _ in HISTORY_COLUMNS])
+
+        ctk.CTkButton(window, text="🔄 Refresh", command=refresh, width=100).pack(pady=(0, 10))
+        refresh()
+
+    def build_crawl_config(self, resume=False, retry_failed=False, refresh=False):
+        """Snapshot the control and date filter settings for the engine"""
+        try:
+            days_back = int(self.days_back_entry.get())
+        except ValueError:
+            days_back = 7  # Default to 7 days if invalid input
+            self.log_message("📅 Invalid day count, using default 7 days")
+        from automation_engine import CrawlConfig
+        return CrawlConfig(
+            backend=self.fetch_backend,
+            worker_count=self.worker_count,
+            headless=self.headless_mode,
+            date_filter_enabled=bool(self.enable_date_filter.get()),
+            days_back=days_back,
+            incremental=self.incremental_mode,
+            requests_per_second=self.requests_per_second,
+            output_file=self.template_file,
+            index_file=self.index_file,
+            resume=resume,
+            checkpoint_file=self.checkpoint_file,
+            metrics_file=self.metrics_file,
+            shard_count=self.shard_count,
+            user_data_dir=self.browser_profile_dir if self.persistent_profile else None,
+            block_resources=self.block_resources,
+            dead_letter_file=self.dead_letter_file,
+            retry_failed=retry_failed,
+            refresh=refresh,
+            change_log_file=self.change_log_file,
+            contact_policy=self.contact_policy,
+            export_formats=self.export_formats,
+            provinces=[self.province] if self.province else ()
+        )
+
+    def prepare_browser_session(self, config):
+        """The warm browser for this run, or None; a session launched with other settings is closed first"""
+        wanted = self.keep_browser_warm and config.backend == 'Browser' and config.shard_count == 1
+        session = self.browser_session
+        if session and not (wanted and session.matches(config.headless, config.user_data_dir, config.block_resources)):
+            self.close_browser_session()
+        if wanted and self.browser_session is None:
+            from browser_session import BrowserSession
+            self.browser_session = BrowserSession(
+                config.headless, config.user_data_dir, config.block_resources, int(config.wait_timeout * 1000)
+            )
+        return self.browser_session if wanted else None
+
+    def close_browser_session(self):
+        """Shut the warm browser down (waits briefly, a persistent profile stays locked until then)"""
+        if self.browser_session is None:
+            return
+        session, self.browser_session = self.browser_session, None
+        try:
+            self.engine_loop.submit(session.close()).result(timeout=10)
+        except Exception:
+            pass
+
+    def on_close(self):
+        if self.is_running:
+            self.stop_automation()
+        self.schedule = None
+        if self.run_id is not None:
+            # The crawl is abandoned with the window; record it now rather than leave it 'running'
+            self.finish_run()
+        if self.engine_loop is not None:
+            self.close_browser_session()
+            self.engine_loop.stop()
+        self.close_log_file()
+        self.root.destroy()
+
+    def dedupe_template(self):
+        """Fold rows of the same contact in the template into one"""
+        if self.is_running:
+            self.log_message("⚠️ Wait for the crawl to finish before merging duplicates")
+            return
+        if not os.path.exists(self.template_file):
+            self.log_message(f"⚠️ {self.template_file} does not exist yet")
+            return
+        from contact_index import dedupe_output
+        try:
+            exports = [fmt for fmt, checkbox in self.export_checkboxes.items() if checkbox.get()]
+            kept, merged = dedupe_output(self.template_file, exports=exports)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not rewrite {self.template_file}: {str(e)}")
+            return
+        self.log_message(f"👥 {self.template_file}: {kept} contacts kept, {merged} duplicate rows merged")
 
     def stop_automation(self):
         if self.is_running:
             self.stop_requested = True
+            self.engine.request_stop()
             self.is_running = False
+            self.stats_dirty = True
             self.start_button.configure(state="normal")
             self.stop_button.configure(state="disabled")
             if not self.date_cutoff_reached:
@@ -415,204 +1076,8 @@ class JobAutomationGUI:
         message = {'type': msg_type, **kwargs}
         self.message_queue.put(message)
 
-    def is_date_within_range(self, job_date_str):
-        """Check if job creation date is within the specified range"""
-        if not self.enable_date_filter.get():
-            return True  # Date filter disabled, process all jobs
-        
-        try:
-            days_back = int(self.days_back_entry.get())
-        except ValueError:
-            days_back = 7  # Default to 7 days if invalid input
-        
-        try:
-            # Parse job date (format: YYYY-MM-DD)
-            job_date = datetime.strptime(job_date_str, "%Y-%m-%d")
-            # Calculate cutoff date
-            cutoff_date = datetime.now() - timedelta(days=days_back)
-            
-            return job_date >= cutoff_date
-        except ValueError:
-            # If date parsing fails, include the job (safer approach)
-            return True
-
-    def run_automation(self):
-        try:
-            # Use the original template file directly instead of creating new files
-            csv_filename = self.template_file
-            
-            # Check if template file exists, if not create it
-            import os
-            if not os.path.exists(csv_filename):
-                self.send_message('log', text=f"📄 Creating new template file: {csv_filename}")
-                with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerow(['Job Title', 'Name', 'Region', 'Email', 'Facility Type', 'Creation Date'])
-            else:
-                self.send_message('log', text=f"📄 Updating existing template file: {csv_filename}")
-                # Clear existing content and write header
-                with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerow(['Job Title', 'Name', 'Region', 'Email', 'Facility Type', 'Creation Date'])
-            
-            # Log browser mode setting
-            mode_text = "Hidden (Headless)" if self.headless_mode else "Visible"
-            self.send_message('log', text=f"🌐 Browser mode: {mode_text}")
-            
-            # Log date filter settings
-            if self.enable_date_filter.get():
-                try:
-                    days_back = int(self.days_back_entry.get())
-                    self.send_message('log', text=f"📅 Smart cutoff enabled: Will stop when jobs older than {days_back} days are found")
-                except ValueError:
-                    self.send_message('log', text="📅 Smart cutoff enabled: Using default 7 days (invalid input)")
-            else:
-                self.send_message('log', text="📅 Smart cutoff disabled: Processing all jobs")
-            
-            with sync_playwright() as p:
-                # Use headless mode setting from the GUI
-                browser = p.chromium.launch(headless=bool(self.headless_mode))  # Add bool() here
-                page = browser.new_page()
-                self.send_message('log', text="🌐 Navigating to job listings page...")
-                page.goto('https://central.childcare.go.kr/ccef/job/JobOfferSlPL.jsp?flag=SlPL')
-                page.wait_for_load_state("networkidle")
-                # Wait a moment for the filter to apply
-                
-                # Change the "Deadline" filter to "Hiring" (구인중)
-                print("Changing deadline filter to 'Hiring'...")
-                page.select_option('#endYn', value='N')
-                print("Filter changed successfully")
-
-                time.sleep(1)
-                
-                # Click the search button
-                print("Clicking search button...")
-                page.click('a[href="#fnSearch"][onclick*="fnSearch"]')
-                print("Search button clicked")
-                
-                while not self.stop_requested and not self.date_cutoff_reached:
-                    self.send_message('log', text=f"📄 Processing page {self.current_page}")
-                    title_links = page.query_selector_all('table tbody tr td:nth-child(3) a[onclick*="fnGoBoardSl"]')
-                    self.total_jobs_on_page = len(title_links)
-                    if self.total_jobs_on_page == 0:
-                        self.send_message('log', text="⚠️ No job listings found on this page")
-                        break
-                    
-                    for i in range(self.total_jobs_on_page):
-                        if self.stop_requested or self.date_cutoff_reached:
-                            break
-                        self.current_job_index = i + 1
-                        self.send_message('stats_update', current_job_index=self.current_job_index)
-                        
-                        try:
-                            self.send_message('log', text=f"🔄 Processing job {i + 1}/{self.total_jobs_on_page}")
-                            
-                            # Get all table rows for this page
-                            job_rows = page.query_selector_all('table tbody tr')
-                            if i >= len(job_rows):
-                                break
-                            
-                            # Extract creation date from the 8th column (td:nth-child(8))
-                            current_row = job_rows[i]
-                            creation_date_cell = current_row.query_selector('td:nth-child(8)')
-                            if creation_date_cell:
-                                creation_date = creation_date_cell.inner_text().strip()
-                                self.current_job_data['creation_date'] = creation_date
-                                
-                                # Check if job is within date range - if not, STOP automation
-                                if not self.is_date_within_range(creation_date):
-                                    title_cell = current_row.query_selector('td:nth-child(3) a')
-                                    job_title = title_cell.inner_text().strip() if title_cell else "Unknown"
-                                    self.current_job_data['title'] = job_title
-                                    self.send_message('current_job', data=self.current_job_data)
-                                    self.send_message('log', text=f"🛑 Found old job: {job_title} (Created: {creation_date})")
-                                    self.send_message('log', text=f"📊 Final Results: {self.total_saved} jobs saved from recent listings")
-                                    self.send_message('date_cutoff')  # Trigger stop
-                                    break
-                            
-                            # Get title links again (fresh query for current state)
-                            title_links = page.query_selector_all('table tbody tr td:nth-child(3) a[onclick*="fnGoBoardSl"]')
-                            if i >= len(title_links):
-                                break
-                            
-                            current_link = title_links[i]
-                            job_title = current_link.inner_text().strip()
-                            self.current_job_data['title'] = job_title
-                            self.send_message('current_job', data=self.current_job_data)
-                            self.send_message('log', text=f"📋 Job title: {job_title}")
-                            
-                            current_link.click()
-                            page.wait_for_load_state("networkidle")
-                            time.sleep(2)
-                            
-                            table_element = page.query_selector('table')
-                            if table_element:
-                                html_content = page.content()
-                                soup = BeautifulSoup(html_content, 'html.parser')
-                                table = soup.find('table')
-                                if table and table.find('tbody'):
-                                    rows = table.find('tbody').find_all('tr')
-                                    if len(rows) >= 7:
-                                        facility_type = rows[2].find('td').contents[0].strip()
-                                        region = rows[4].find('td').text.strip()
-                                        name = rows[5].find_all('td')[0].text.strip()
-                                        email = rows[6].find_all('td')[1].text.strip()
-                                        
-                                        self.current_job_data.update({
-                                            'name': name,
-                                            'region': region,
-                                            'email': email,
-                                            'facility_type': facility_type
-                                        })
-                                        self.send_message('current_job', data=self.current_job_data)
-                                        
-                                        # Append to the original template file
-                                        with open(csv_filename, 'a', newline='', encoding='utf-8') as csvfile:
-                                            writer = csv.writer(csvfile)
-                                            writer.writerow([job_title, name, region, email, facility_type, self.current_job_data['creation_date']])
-                                        
-                                        self.total_saved += 1
-                                        self.send_message('stats_update', total_saved=self.total_saved)
-                                        self.send_message('log', text=f"✅ Saved to template: {job_title} (Created: {self.current_job_data['creation_date']})")
-                            
-                            page.go_back()
-                            page.wait_for_load_state("networkidle")
-                            time.sleep(1)
-                        except Exception as e:
-                            self.send_message('log', text=f"❌ Error processing job {i + 1}: {str(e)}")
-                            try:
-                                page.go_back()
-                                page.wait_for_load_state("networkidle")
-                            except:
-                                pass
-                            continue
-                    
-                    # If we hit date cutoff, break out of page loop too
-                    if self.stop_requested or self.date_cutoff_reached:
-                        break
-                    
-                    next_page_link = page.query_selector('a[href="#page_next"][class="next"]')
-                    if not next_page_link:
-                        self.send_message('log', text="🏁 No more pages found. Automation complete.")
-                        break
-                    
-                    self.send_message('log', text="➡️ Moving to next page...")
-                    next_page_link.click()
-                    page.wait_for_load_state("networkidle")
-                    time.sleep(2)
-                    self.current_page += 1
-                    self.send_message('stats_update', current_page=self.current_page)
-                
-                browser.close()
-                if not self.stop_requested and not self.date_cutoff_reached:
-                    self.send_message('complete')
-                    self.send_message('log', text=f"📄 Results saved to original template: {csv_filename}")
-        except Exception as e:
-            self.send_message('error', text=f"Automation error: {str(e)}")
-            self.send_message('log', text=f"❌ Error: {str(e)}")
-
-def main():
-    app = JobAutomationGUI()
+def main(startup_timer=None):
+    app = JobAutomationGUI(startup_timer)
     app.root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,228 @@
+import re
+from collections import namedtuple
+from html.parser import HTMLParser
+from importlib.util import find_spec
+import site_profile
+
+
+def installed(module_name):
+    """Whether module_name can be imported, without importing it.
+
+    bs4, lxml and selectolax are only imported by the functions that parse
+    with them: the GUI and the browser backend load this module for
+    ListingRow and the detail field layout, and shouldn't pay for three
+    HTML libraries before the window shows.
+    """
+    try:
+        return find_spec(module_name) is not None
+    except ImportError:
+        return False  # Parent package missing
+
+# fnGoBoardSl('12345') -> '12345'
+LISTING_ID_PATTERN = re.compile(r"fnGoBoardSl\(\s*['\"]?([^'\",)]+)")
+
+# One results-table row: everything the crawl needs before deciding to open the listing
+# facility_name and area come from the results list cells; empty when a row has none
+ListingRow = namedtuple(
+    'ListingRow', ['title', 'listing_id', 'creation_date', 'onclick', 'facility_name', 'area'], defaults=('', '')
+)
+
+# Rows the detail table needs for every field in site_profile.DETAIL_FIELDS
+DETAIL_MIN_ROWS = max(row for _, row, _, _, _ in site_profile.DETAIL_FIELDS) + 1
+TABLE_FRAGMENT_PATTERN = re.compile(r'<table\b.*?</table\s*>', re.IGNORECASE | re.DOTALL)
+CHARSET_PATTERN = re.compile(rb'charset=["\']?([\w-]+)', re.IGNORECASE)
+
+
+class DetailLayoutError(ValueError):
+    """The detail table no longer matches site_profile.DETAIL_FIELDS"""
+
+
+def extract_listing_id(onclick):
+    """Return the listing ID passed to fnGoBoardSl in an onclick handler"""
+    if not onclick:
+        return ''
+    match = LISTING_ID_PATTERN.search(onclick)
+    return match.group(1).strip() if match else ''
+
+
+def decode_html(html_content):
+    """Decode response bytes using the page's meta charset (the site is not always UTF-8)"""
+    if isinstance(html_content, str):
+        return html_content
+    match = CHARSET_PATTERN.search(html_content[:2048])
+    try:
+        return html_content.decode(match.group(1).decode('ascii') if match else 'utf-8', errors='replace')
+    except LookupError:
+        return html_content.decode('utf-8', errors='replace')
+
+
+class TableRowsParser(HTMLParser):
+    """Stdlib fallback: collect (tag, text, leading text) per cell of one table fragment"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows = []  # (section, cells)
+        self.section = 'tbody'
+        self.cells = None
+        self.cell_tag = None
+        self.text_parts = []
+        self.leading_parts = []
+        self.cell_has_child = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('thead', 'tbody', 'tfoot'):
+            self.section = tag
+        elif tag == 'tr':
+            self.end_row()
+            self.cells = []
+        elif tag in ('th', 'td'):
+            self.end_cell()
+            if self.cells is None:
+                self.cells = []
+            self.cell_tag = tag
+            self.text_parts = []
+            self.leading_parts = []
+            self.cell_has_child = False
+        elif self.cell_tag:
+            self.cell_has_child = True
+
+    def handle_endtag(self, tag):
+        if tag in ('th', 'td'):
+            self.end_cell()
+        elif tag in ('tr', 'thead', 'tbody', 'tfoot', 'table'):
+            self.end_row()
+
+    def handle_data(self, data):
+        if self.cell_tag:
+            self.text_parts.append(data)
+            if not self.cell_has_child:
+                self.leading_parts.append(data)
+
+    def end_cell(self):
+        if self.cell_tag:
+            self.cells.append((self.cell_tag, ''.join(self.text_parts), ''.join(self.leading_parts)))
+            self.cell_tag = None
+
+    def end_row(self):
+        self.end_cell()
+        if self.cells is not None:
+            self.rows.append((self.section, self.cells))
+            self.cells = None
+
+
+def read_rows_html_parser(fragment):
+    parser = TableRowsParser()
+    parser.feed(fragment)
+    parser.close()
+    parser.end_row()
+    body_rows = [cells for section, cells in parser.rows if section == 'tbody']
+    return body_rows or [cells for _, cells in parser.rows]
+
+
+def read_rows_lxml(fragment):
+    import lxml.html as lxml_html
+    table = lxml_html.fragment_fromstring(fragment)
+    bodies = table.findall('tbody')
+    rows = [row for body in bodies for row in body.findall('tr')] if bodies else table.findall('tr')
+    return [
+        [(cell.tag, cell.text_content(), cell.text or '') for cell in row if cell.tag in ('th', 'td')]
+        for row in rows
+    ]
+
+
+def read_rows_selectolax(fragment):
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+    table = SelectolaxParser(fragment).css_first('table')
+    rows = []
+    for row in table.css('tbody > tr'):
+        cells = []
+        for cell in row.iter():
+            if cell.tag in ('th', 'td'):
+                first = cell.child
+                leading = first.text(deep=False) if first is not None and first.tag == '-text' else ''
+                cells.append((cell.tag, cell.text(deep=True), leading))
+        rows.append(cells)
+    return rows
+
+
+# Table readers by speed; parse_job_detail uses the first one that is installed
+TABLE_READERS = {
+    name: reader for name, reader, available in (
+        ('selectolax', read_rows_selectolax, installed('selectolax.lexbor')),
+        ('lxml', read_rows_lxml, installed('lxml.html')),
+        ('html.parser', read_rows_html_parser, True),
+    ) if available
+}
+DEFAULT_TABLE_READER = next(iter(TABLE_READERS))
+
+
+def extract_detail(rows, fields=site_profile.DETAIL_FIELDS, warn=None):
+    """Map table rows of (tag, text, leading text) cells onto the detail fields.
+
+    Returns None when the table has too few rows (page not loaded or no
+    listing). A row whose header label doesn't match the schema is still
+    read by position and reported to warn, since the labels were taken from
+    a hand-written fixture; only a missing cell raises DetailLayoutError.
+    """
+    if not rows or len(rows) < DETAIL_MIN_ROWS:
+        return None
+    detail = {}
+    for field, row, position, label, leading_only in fields:
+        cells = rows[row]
+        headers = [text.strip() for tag, text, _ in cells if tag == 'th']
+        if label and headers and not any(label in header for header in headers) and warn:
+            warn(f"Detail row {row} is labelled {' / '.join(headers)!r}, expected {label!r} for {field}")
+        values = [(text, leading) for tag, text, leading in cells if tag == 'td']
+        if position >= len(values):
+            raise DetailLayoutError(f"Detail row {row} has no cell {position} for {field}")
+        text, leading = values[position]
+        detail[field] = (leading.strip() or text.strip()) if leading_only else text.strip()
+    return detail
+
+
+def parse_job_detail(html_content, reader=None, warn=None):
+    """Extract the contact fields from a job detail page, or None if the table is missing.
+
+    Only the first <table> fragment is parsed, with the fastest installed
+    reader (selectolax, lxml, then the stdlib html.parser).
+    """
+    match = TABLE_FRAGMENT_PATTERN.search(decode_html(html_content))
+    if not match:
+        return None
+    return extract_detail(TABLE_READERS[reader or DEFAULT_TABLE_READER](match.group(0)), warn=warn)
+
+
+def make_listing_row(title, onclick, creation_date, facility_name='', area=''):
+    onclick = onclick or ''
+    return ListingRow(
+        (title or '').strip(), extract_listing_id(onclick), (creation_date or '').strip(), onclick,
+        (facility_name or '').strip(), (area or '').strip()
+    )
+
+
+def cell_text(row, selector):
+    cell = row.select_one(selector)
+    return cell.get_text() if cell else ''
+
+
+def parse_results_page(html_content):
+    """Parse a results page once into (ListingRow list, whether a next page exists).
+
+    The tree is decomposed before returning: its parent/child links are
+    reference cycles, so it would otherwise stay in memory until the
+    garbage collector's next full pass.
+    """
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html_content, 'html.parser')
+    rows = []
+    for row in soup.select(site_profile.RESULT_ROWS_SELECTOR):
+        link = row.select_one(site_profile.TITLE_LINK_SELECTOR)
+        if not link:
+            continue
+        rows.append(make_listing_row(
+            link.get_text(), link.get('onclick'), cell_text(row, site_profile.CREATION_DATE_SELECTOR),
+            cell_text(row, site_profile.FACILITY_NAME_SELECTOR), cell_text(row, site_profile.AREA_SELECTOR)
+        ))
+    has_next = soup.select_one(site_profile.NEXT_PAGE_SELECTOR) is not None
+    soup.decompose()
+    return rows, has_next
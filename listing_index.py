@@ -0,0 +1,181 @@
+import hashlib
+import sqlite3
+from datetime import datetime
+from row_normalizer import canonical_province, normalize_email
+
+CONTENT_FIELDS = ('title', 'name', 'region', 'email', 'facility_type', 'creation_date')
+# status: 'open' until a refresh finds the listing gone; changes: refreshes that found it edited
+LISTING_REFRESH_COLUMNS = (('status', "TEXT DEFAULT 'open'"), ('last_checked', 'TEXT'), ('changes', 'INTEGER DEFAULT 0'))
+
+
+def content_hash(job_data):
+    """Stable hash of the saved fields, used to tell whether a listing changed"""
+    joined = '\x1f'.join(str(job_data.get(field, '')).strip() for field in CONTENT_FIELDS)
+    return hashlib.sha1(joined.encode('utf-8')).hexdigest()
+
+
+def squash(text):
+    """Lowercase with all whitespace removed, for comparing names typed slightly differently"""
+    return ''.join(str(text or '').split()).lower()
+
+
+def facility_key(facility_name, area):
+    """Facility name + province from the results list, '' when the name is missing"""
+    facility_name = squash(facility_name)
+    if not facility_name:
+        return ''
+    provinces = str(area or '').split()
+    province = provinces[0] if provinces else ''
+    return f"{facility_name}|{canonical_province(province) or province}"  # '경남' and '경상남도' are one facility
+
+
+def contact_key(job_data):
+    """Who a saved row reaches: the normalized email, else contact name + address; None when neither is known"""
+    email = normalize_email(job_data.get('email'))
+    if email:
+        return email
+    name, region = squash(job_data.get('name')), squash(job_data.get('region'))
+    if name and region:
+        return f"{name}|{region}"
+    return None
+
+
+class ListingIndex:
+    """On-disk index of listings already saved, keyed by the fnGoBoardSl listing ID"""
+
+    def __init__(self, path='listing_index.db'):
+        self.path = path
+        # Sharded crawls write from several processes; wait for the lock instead of failing
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS listings (
+                listing_id TEXT PRIMARY KEY,
+                title TEXT,
+                name TEXT,
+                region TEXT,
+                email TEXT,
+                facility_type TEXT,
+                creation_date TEXT,
+                content_hash TEXT,
+                first_seen TEXT,
+                last_seen TEXT,
+                status TEXT DEFAULT 'open',
+                last_checked TEXT,
+                changes INTEGER DEFAULT 0
+            )
+        """)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS contacts (
+                contact_key TEXT PRIMARY KEY,
+                email TEXT,
+                name TEXT,
+                region TEXT,
+                facility_key TEXT,
+                last_listing_date TEXT,
+                first_seen TEXT,
+                last_seen TEXT
+            )
+        """)
+        self.connection.execute("CREATE INDEX IF NOT EXISTS contacts_facility ON contacts (facility_key)")
+        # Refresh bookkeeping, added to indexes created before it. Shard workers open the index at the
+        # same time, so the check and the ALTERs run under one write lock
+        self.connection.execute("BEGIN IMMEDIATE")
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(listings)")}
+        for column, definition in LISTING_REFRESH_COLUMNS:
+            if column not in columns:
+                self.connection.execute(f"ALTER TABLE listings ADD COLUMN {column} {definition}")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS listings_creation_date ON listings (creation_date)")
+        self.connection.commit()
+
+    def known_ids(self, listing_ids):
+        """Return the subset of listing_ids that are already in the index"""
+        listing_ids = [listing_id for listing_id in listing_ids if listing_id]
+        if not listing_ids:
+            return set()
+        placeholders = ','.join('?' * len(listing_ids))
+        cursor = self.connection.execute(
+            f"SELECT listing_id FROM listings WHERE listing_id IN ({placeholders})", listing_ids
+        )
+        return {row[0] for row in cursor}
+
+    def touch(self, listing_ids):
+        """Mark known listings as seen again without refetching them"""
+        now = datetime.now().isoformat(timespec='seconds')
+        self.connection.executemany(
+            "UPDATE listings SET last_seen = ? WHERE listing_id = ?",
+            [(now, listing_id) for listing_id in listing_ids if listing_id]
+        )
+        self.connection.commit()
+
+    def captured_facilities(self, since_date=None):
+        """Facility keys with a contact from a listing created on or after since_date (YYYY-MM-DD, None for all)"""
+        cursor = self.connection.execute(
+            "SELECT DISTINCT facility_key FROM contacts WHERE facility_key != '' AND last_listing_date >= ?",
+            (since_date or '',)
+        )
+        return {row[0] for row in cursor}
+
+    def record_contact(self, key, facility, job_data, now=None):
+        """Insert or refresh the contact of a saved row; the facility key may be '' when unknown"""
+        if not key:
+            return
+        now = now or datetime.now().isoformat(timespec='seconds')
+        self.connection.execute("""
+            INSERT INTO contacts (contact_key, email, name, region, facility_key, last_listing_date,
+                                  first_seen, last_seen)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(contact_key) DO UPDATE SET
+                email = excluded.email, name = excluded.name, region = excluded.region,
+                facility_key = CASE WHEN excluded.facility_key != '' THEN excluded.facility_key ELSE facility_key END,
+                last_listing_date = MAX(last_listing_date, excluded.last_listing_date),
+                last_seen = excluded.last_seen
+        """, (
+            key, job_data.get('email', ''), job_data.get('name', ''), job_data.get('region', ''), facility,
+            job_data.get('creation_date', ''), now, now
+        ))
+
+    def record(self, listing_id, job_data, facility=''):
+        """Insert or refresh a saved listing and its contact; returns its content hash"""
+        digest = content_hash(job_data)
+        now = datetime.now().isoformat(timespec='seconds')
+        self.record_contact(contact_key(job_data), facility, job_data, now)
+        if not listing_id:
+            self.connection.commit()
+            return digest
+        self.connection.execute("""
+            INSERT INTO listings (listing_id, title, name, region, email, facility_type,
+                                  creation_date, content_hash, first_seen, last_seen)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(listing_id) DO UPDATE SET
+                title = excluded.title, name = excluded.name, region = excluded.region,
+                email = excluded.email, facility_type = excluded.facility_type,
+                creation_date = excluded.creation_date, content_hash = excluded.content_hash,
+                last_seen = excluded.last_seen
+        """, (
+            listing_id, job_data.get('title', ''), job_data.get('name', ''), job_data.get('region', ''),
+            job_data.get('email', ''), job_data.get('facility_type', ''), job_data.get('creation_date', ''),
+            digest, now, now
+        ))
+        self.connection.commit()
+        return digest
+
+    def refresh_candidates(self, since_date):
+        """Open listings created on or after since_date, with their saved fields and when they were last checked"""
+        cursor = self.connection.execute("""
+            SELECT listing_id, title, name, region, email, facility_type, creation_date, content_hash,
+                   COALESCE(last_checked, last_seen) AS last_checked
+            FROM listings WHERE creation_date >= ? AND COALESCE(status, 'open') != 'closed'
+        """, (since_date,))
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+    def record_check(self, listing_id, status='open', changed=False):
+        """Note a refresh of a listing: its status, and whether its content had changed"""
+        self.connection.execute(
+            "UPDATE listings SET last_checked = ?, status = ?, changes = COALESCE(changes, 0) + ? WHERE listing_id = ?",
+            (datetime.now().isoformat(timespec='seconds'), status, int(changed), listing_id)
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,87 @@
+import heapq
+import json
+from datetime import datetime, timedelta
+import site_profile
+from job_parser import ListingRow
+
+MIN_RECHECK = timedelta(hours=6)  # Shortest wait between two checks of a listing posted today
+MAX_RECHECK = timedelta(days=7)
+RECHECK_AGE_FACTOR = 0.5  # Wait half a listing's age between checks: new postings change (and close) soonest
+TRACKED_FIELDS = ('name', 'region', 'email', 'facility_type')  # Detail fields compared for the change log
+
+
+def posted_at(creation_date):
+    try:
+        return datetime.strptime(creation_date or '', "%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def recheck_interval(creation_date, now):
+    """How long a listing posted on creation_date can go between checks"""
+    posted = posted_at(creation_date)
+    if posted is None:
+        return MAX_RECHECK
+    return min(MAX_RECHECK, max(MIN_RECHECK, (now - posted) * RECHECK_AGE_FACTOR))
+
+
+def refresh_queue(candidates, now, limit=0):
+    """Candidates due for a check, most recently posted first, at most limit of them (0 = all).
+
+    A candidate is due once recheck_interval has passed since it was last
+    checked (or saved). The heap is keyed by posting date, then by how
+    long ago the last check was, so a limited run spends its budget on the
+    newest listings and the longest-unchecked among equals.
+    """
+    heap = []
+    for candidate in candidates:
+        checked = datetime.fromisoformat(candidate['last_checked']) if candidate['last_checked'] else datetime.min
+        if checked + recheck_interval(candidate['creation_date'], now) > now:
+            continue
+        posted = posted_at(candidate['creation_date'])
+        heapq.heappush(heap, (
+            -(posted.toordinal() if posted else 0), candidate['last_checked'] or '', candidate['listing_id'], candidate
+        ))
+    count = len(heap) if not limit else min(limit, len(heap))
+    return [heapq.heappop(heap)[-1] for _ in range(count)]
+
+
+def refresh_target(candidate):
+    """ListingRow that re-opens a saved listing"""
+    return ListingRow(
+        candidate['title'], candidate['listing_id'], candidate['creation_date'],
+        site_profile.DETAIL_ONCLICK.format(listing_id=candidate['listing_id'])
+    )
+
+
+def changed_fields(saved, job_data):
+    """{field: [saved value, current value]} for the tracked fields that differ"""
+    changes = {}
+    for field in TRACKED_FIELDS:
+        before, after = str(saved.get(field) or '').strip(), str(job_data.get(field) or '').strip()
+        if before != after:
+            changes[field] = [before, after]
+    return changes
+
+
+class ChangeLog:
+    """What a refresh pass found, one JSON object per line: 'updated' (with the changed fields) or 'closed'.
+
+    Appended to like the dead-letter file; the template itself is left
+    alone, so a changed listing never becomes a second row.
+    """
+
+    def __init__(self, path='listing_changes.jsonl'):
+        self.path = path
+
+    def add(self, event, listing, changes=None):
+        entry = {
+            'event': event,
+            'listing_id': listing['listing_id'],
+            'title': listing['title'],
+            'creation_date': listing['creation_date'],
+            'changes': changes or {},
+            'checked_at': datetime.now().isoformat(timespec='seconds')
+        }
+        with open(self.path, 'a', encoding='utf-8') as change_file:
+            change_file.write(json.dumps(entry, ensure_ascii=False) + '\n')
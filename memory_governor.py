@@ -0,0 +1,194 @@
+import os
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+MB = 1024 * 1024
+# Listings fetched before the memory limit can trigger another recycle, so a limit below what a fresh
+# browser already uses doesn't relaunch it on every page
+MIN_LISTINGS_BETWEEN_RECYCLES = 50
+# Windows API values for reading the crawl's processes without psutil
+TH32CS_SNAPPROCESS = 0x2
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+
+def process_tree(parents, root):
+    """root and every process below it, from a {pid: parent pid} map"""
+    children = {}
+    for pid, parent in parents.items():
+        children.setdefault(parent, []).append(pid)
+    tree, pending = [], [root]
+    while pending:
+        pid = pending.pop()
+        tree.append(pid)
+        pending.extend(child for child in children.get(pid, ()) if child != pid)
+    return tree
+
+
+def proc_rss():
+    """(own, children) RSS in bytes read from /proc on Linux, or None without /proc"""
+    page_size = os.sysconf('SC_PAGE_SIZE')
+    parents, rss = {}, {}
+    try:
+        entries = [entry for entry in os.listdir('/proc') if entry.isdigit()]
+    except OSError:
+        return None
+    for entry in entries:
+        try:
+            with open(f'/proc/{entry}/stat') as stat:
+                # "pid (comm) state ppid ... rss": comm may hold spaces and parentheses
+                fields = stat.read().rsplit(')', 1)[1].split()
+        except (OSError, IndexError):
+            continue  # Exited between the listing and the read
+        parents[int(entry)] = int(fields[1])
+        rss[int(entry)] = int(fields[21]) * page_size
+    own = os.getpid()
+    if own not in rss:
+        return None
+    return rss[own], sum(rss.get(pid, 0) for pid in process_tree(parents, own) if pid != own)
+
+
+def windows_rss():
+    """(own, children) working set in bytes from a Toolhelp snapshot and GetProcessMemoryInfo"""
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessEntry(ctypes.Structure):
+        _fields_ = [
+            ('dwSize', wintypes.DWORD), ('cntUsage', wintypes.DWORD), ('th32ProcessID', wintypes.DWORD),
+            ('th32DefaultHeapID', ctypes.c_size_t), ('th32ModuleID', wintypes.DWORD),
+            ('cntThreads', wintypes.DWORD), ('th32ParentProcessID', wintypes.DWORD),
+            ('pcPriClassBase', wintypes.LONG), ('dwFlags', wintypes.DWORD), ('szExeFile', wintypes.WCHAR * 260)
+        ]
+
+    class MemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+            ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+            ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)
+        ]
+
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+    kernel32.CreateToolhelp32Snapshot.argtypes = (wintypes.DWORD, wintypes.DWORD)
+    kernel32.Process32FirstW.argtypes = (wintypes.HANDLE, ctypes.POINTER(ProcessEntry))
+    kernel32.Process32NextW.argtypes = (wintypes.HANDLE, ctypes.POINTER(ProcessEntry))
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    kernel32.K32GetProcessMemoryInfo.argtypes = (wintypes.HANDLE, ctypes.POINTER(MemoryCounters), wintypes.DWORD)
+    kernel32.GetProcessTimes.argtypes = (wintypes.HANDLE,) + (ctypes.POINTER(wintypes.FILETIME),) * 4
+    kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+
+    snapshot = kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if not snapshot or snapshot == ctypes.c_void_p(-1).value:
+        return None
+    parents = {}
+    try:
+        entry = ProcessEntry()
+        entry.dwSize = ctypes.sizeof(ProcessEntry)
+        found = kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+        while found:
+            parents[entry.th32ProcessID] = entry.th32ParentProcessID
+            found = kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+    finally:
+        kernel32.CloseHandle(snapshot)
+
+    def started_and_working_set(pid):
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return None  # Exited, or not ours to read
+        try:
+            times = [wintypes.FILETIME() for _ in range(4)]
+            counters = MemoryCounters()
+            counters.cb = ctypes.sizeof(MemoryCounters)
+            if not (kernel32.GetProcessTimes(handle, *(ctypes.byref(filetime) for filetime in times))
+                    and kernel32.K32GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb)):
+                return None
+            return (times[0].dwHighDateTime << 32) | times[0].dwLowDateTime, counters.WorkingSetSize
+        finally:
+            kernel32.CloseHandle(handle)
+
+    own_pid = os.getpid()
+    own = started_and_working_set(own_pid)
+    if own is None:
+        return None
+    children = 0
+    for pid in process_tree(parents, own_pid):
+        info = started_and_working_set(pid) if pid != own_pid else None
+        # Windows reuses pids: a process older than this one only names a dead parent that had our pid
+        if info and info[0] >= own[0]:
+            children += info[1]
+    return own[1], children
+
+
+def memory_usage():
+    """{'process_mb', 'browser_mb', 'total_mb'} for this process and its children (Chromium, the Playwright driver).
+
+    Uses psutil when it is installed, otherwise /proc on Linux or the
+    Windows process APIs through ctypes. None when none of them works.
+    """
+    if psutil is not None:
+        process = psutil.Process()
+        own = process.memory_info().rss
+        children = 0
+        for child in process.children(recursive=True):
+            try:
+                children += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                pass  # Renderers come and go between the listing and the read
+    else:
+        try:
+            usage = windows_rss() if os.name == 'nt' else proc_rss()
+        except (OSError, ValueError, AttributeError):
+            usage = None  # No /proc, or an API missing from this Windows
+        if usage is None:
+            return None
+        own, children = usage
+    return {
+        'process_mb': round(own / MB, 1),
+        'browser_mb': round(children / MB, 1),
+        'total_mb': round((own + children) / MB, 1)
+    }
+
+
+class MemoryGovernor:
+    """Decide when a long crawl should swap its browser for a fresh one.
+
+    Chromium keeps the history of every click/go_back cycle on a tab and
+    its memory only grows over a multi-hour run; recycling the context
+    every recycle_every listings, or once the crawl (Python plus browser
+    processes) is above memory_limit_mb, brings it back to a cold start.
+    The engine asks between pages, when no fetch is in flight.
+    """
+
+    def __init__(self, recycle_every=0, memory_limit_mb=0):
+        self.recycle_every = max(0, int(recycle_every))  # Listings between recycles, 0 = never on count
+        self.memory_limit_mb = max(0, memory_limit_mb or 0)  # Total RSS that triggers a recycle, 0 = no limit
+        self.listings_since_recycle = 0
+        self.recycles = 0
+        self.last_sample = None
+
+    def note_listings(self, count=1):
+        self.listings_since_recycle += count
+
+    def sample(self):
+        self.last_sample = memory_usage()
+        return self.last_sample
+
+    def recycle_reason(self):
+        """Why the backend should be recycled now, or None; takes a fresh memory sample"""
+        sample = self.sample()
+        if self.recycle_every and self.listings_since_recycle >= self.recycle_every:
+            return f"{self.listings_since_recycle} listings since the last recycle"
+        if (self.memory_limit_mb and sample and sample['total_mb'] >= self.memory_limit_mb
+                and self.listings_since_recycle >= MIN_LISTINGS_BETWEEN_RECYCLES):
+            return f"using {sample['total_mb']:.0f} MB, limit {self.memory_limit_mb:.0f} MB"
+        return None
+
+    def recycled(self):
+        self.listings_since_recycle = 0
+        self.recycles += 1
@@ -0,0 +1,336 @@
+import csv
+import json
+import os
+import shutil
+import sqlite3
+import time
+from datetime import datetime
+from importlib.util import find_spec
+
+# pyarrow takes longer to import than everything else here; ParquetSink imports it when it opens
+PYARROW_INSTALLED = find_spec('pyarrow') is not None
+
+# The last four columns are filled in by row_normalizer; templates written before them are upgraded on append
+OUTPUT_FIELDS = ['title', 'name', 'region', 'email', 'facility_type', 'creation_date',
+                 'province', 'city', 'district', 'email_valid']
+CSV_HEADER = ['Job Title', 'Name', 'Region', 'Email', 'Facility Type', 'Creation Date',
+              'Province', 'City', 'District', 'Email Valid']
+
+
+def fsync_file(handle):
+    handle.flush()
+    os.fsync(handle.fileno())
+
+
+class RowSink:
+    """Buffered writer for saved job rows.
+
+    Rows are kept in memory and written in batches once flush_rows rows are
+    pending or flush_interval seconds have passed. Subclasses only implement
+    open_output / write_rows / finish, so other formats can reuse the
+    batching and checkpoint logic. An optional transform gets each whole
+    batch before it is written (see row_normalizer.normalize_rows).
+    """
+
+    extension = ''
+
+    def __init__(self, path, append=False, flush_rows=25, flush_interval=5.0, transform=None):
+        self.path = path
+        self.append = append
+        self.flush_rows = max(1, int(flush_rows))
+        self.flush_interval = flush_interval
+        self.transform = transform
+        self.buffer = []
+        self.rows_written = 0
+        self.last_flush = time.monotonic()
+        self.open_output()
+
+    def write_row(self, row):
+        self.buffer.append(row)
+        if len(self.buffer) >= self.flush_rows or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.write_rows(self.transform(self.buffer) if self.transform else self.buffer)
+            self.rows_written += len(self.buffer)
+            self.buffer = []
+        self.last_flush = time.monotonic()
+
+    def checkpoint(self):
+        """Flush, fsync and publish what has been written so far; False if publishing failed"""
+        self.flush()
+        return True
+
+    def close(self):
+        self.flush()
+        self.finish()
+
+    def upgrade(self, rows):
+        """Rows already in an output from before the current columns, with the transform applied to them too"""
+        return self.transform(rows) if self.transform else rows
+
+    def open_output(self):
+        raise NotImplementedError
+
+    def write_rows(self, rows):
+        raise NotImplementedError
+
+    def finish(self):
+        raise NotImplementedError
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class CsvSink(RowSink):
+    """Template CSV writer that never leaves a truncated file behind.
+
+    Rows go to '<path>.partial' through a single open handle. Checkpoints
+    fsync it and publish a copy over the template with an atomic rename;
+    close renames the partial file itself into place. If the process dies,
+    the template still holds the last checkpoint.
+    """
+
+    extension = '.csv'
+
+    def open_output(self):
+        self.partial_path = self.path + '.partial'
+        if self.append and os.path.exists(self.path) and read_csv_header(self.path) == CSV_HEADER:
+            shutil.copyfile(self.path, self.partial_path)
+            self.handle = open(self.partial_path, 'a', newline='', encoding='utf-8')
+        elif self.append and os.path.exists(self.path):
+            # Written before the current columns: copy the old rows over under the new header
+            self.handle = open(self.partial_path, 'w', newline='', encoding='utf-8')
+            writer = csv.writer(self.handle)
+            writer.writerow(CSV_HEADER)
+            rows = list(read_csv_rows(self.path))
+            writer.writerows([row[field] for field in OUTPUT_FIELDS] for row in self.upgrade(rows))
+        else:
+            self.handle = open(self.partial_path, 'w', newline='', encoding='utf-8')
+            csv.writer(self.handle).writerow(CSV_HEADER)
+        self.writer = csv.writer(self.handle)
+
+    def write_rows(self, rows):
+        self.writer.writerows([[row.get(field, '') for field in OUTPUT_FIELDS] for row in rows])
+        self.handle.flush()
+
+    def checkpoint(self):
+        self.flush()
+        fsync_file(self.handle)
+        swap_path = self.path + '.swap'
+        try:
+            shutil.copyfile(self.partial_path, swap_path)
+            with open(swap_path, 'rb+') as swap_file:
+                os.fsync(swap_file.fileno())
+            os.replace(swap_path, self.path)
+            return True
+        except OSError:
+            # e.g. the template is open in Excel on Windows; the partial file still has every row
+            return False
+
+    def finish(self):
+        fsync_file(self.handle)
+        self.handle.close()
+        os.replace(self.partial_path, self.path)
+
+
+class JsonlSink(RowSink):
+    """One JSON object per saved row, appended in place so consumers can tail the file mid-run"""
+
+    extension = '.jsonl'
+
+    def open_output(self):
+        self.handle = open(self.path, 'a' if self.append else 'w', encoding='utf-8')
+
+    def write_rows(self, rows):
+        saved_at = datetime.now().isoformat(timespec='seconds')
+        self.handle.writelines(
+            json.dumps({**{field: row.get(field, '') for field in OUTPUT_FIELDS}, 'saved_at': saved_at},
+                       ensure_ascii=False) + '\n'
+            for row in rows
+        )
+        self.handle.flush()
+
+    def checkpoint(self):
+        self.flush()
+        fsync_file(self.handle)
+        return True
+
+    def finish(self):
+        fsync_file(self.handle)
+        self.handle.close()
+
+
+class SqliteSink(RowSink):
+    """Saved rows in an indexed 'jobs' table, committed with every batch.
+
+    The database is in WAL mode, so other processes can query it while the
+    crawl is still writing.
+    """
+
+    extension = '.sqlite'
+
+    def open_output(self):
+        self.connection = sqlite3.connect(self.path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        columns = ', '.join(f"{field} TEXT" for field in OUTPUT_FIELDS)
+        self.connection.execute(
+            f"CREATE TABLE IF NOT EXISTS jobs (id INTEGER PRIMARY KEY, {columns}, saved_at TEXT)"
+        )
+        existing = {row[1] for row in self.connection.execute("PRAGMA table_info(jobs)")}
+        added = [field for field in OUTPUT_FIELDS if field not in existing]
+        for field in added:
+            self.connection.execute(f"ALTER TABLE jobs ADD COLUMN {field} TEXT DEFAULT ''")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS jobs_email ON jobs (email)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS jobs_creation_date ON jobs (creation_date)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS jobs_province ON jobs (province)")
+        if not self.append:
+            self.connection.execute("DELETE FROM jobs")
+        elif added and self.transform:
+            self.fill_added_columns()
+        self.connection.commit()
+
+    def fill_added_columns(self):
+        """Run the rows saved before the added columns through the transform, to fill them in"""
+        cursor = self.connection.execute(f"SELECT id, {', '.join(OUTPUT_FIELDS)} FROM jobs")
+        ids, rows = [], []
+        for values in cursor.fetchall():
+            ids.append(values[0])
+            rows.append(dict(zip(OUTPUT_FIELDS, values[1:])))
+        self.connection.executemany(
+            f"UPDATE jobs SET {', '.join(f'{field} = ?' for field in OUTPUT_FIELDS)} WHERE id = ?",
+            [[row.get(field, '') for field in OUTPUT_FIELDS] + [row_id] for row, row_id in zip(self.upgrade(rows), ids)]
+        )
+
+    def write_rows(self, rows):
+        saved_at = datetime.now().isoformat(timespec='seconds')
+        self.connection.executemany(
+            f"INSERT INTO jobs ({', '.join(OUTPUT_FIELDS)}, saved_at) "
+            f"VALUES ({', '.join('?' * (len(OUTPUT_FIELDS) + 1))})",
+            [[row.get(field, '') for field in OUTPUT_FIELDS] + [saved_at] for row in rows]
+        )
+        self.connection.commit()
+
+    def finish(self):
+        self.connection.close()
+
+
+class ParquetSink(RowSink):
+    """Columnar copy of the saved rows, one row group per batch (needs pyarrow).
+
+    A Parquet file is only readable once its footer is written, so rows go
+    to '<path>.partial' and the file appears when the run finishes.
+    """
+
+    extension = '.parquet'
+
+    def open_output(self):
+        import pyarrow
+        import pyarrow.parquet as parquet
+        self.partial_path = self.path + '.partial'
+        self.schema = pyarrow.schema([(field, pyarrow.string()) for field in OUTPUT_FIELDS + ['saved_at']])
+        self.writer = parquet.ParquetWriter(self.partial_path, self.schema)
+        if self.append and os.path.exists(self.path):
+            existing = parquet.read_table(self.path)
+            if existing.schema.names == self.schema.names:
+                self.writer.write_table(existing.cast(self.schema))
+            else:
+                saved_at = existing.column('saved_at').to_pylist() if 'saved_at' in existing.schema.names else None
+                rows = self.upgrade([
+                    {field: value or '' for field, value in row.items()} for row in existing.to_pylist()
+                ])
+                columns = {field: [row.get(field, '') for row in rows] for field in OUTPUT_FIELDS}
+                columns['saved_at'] = saved_at or [''] * len(rows)
+                self.writer.write_table(pyarrow.table(columns, schema=self.schema))
+
+    def write_rows(self, rows):
+        import pyarrow
+        saved_at = datetime.now().isoformat(timespec='seconds')
+        columns = {field: [row.get(field, '') for row in rows] for field in OUTPUT_FIELDS}
+        columns['saved_at'] = [saved_at] * len(rows)
+        self.writer.write_table(pyarrow.table(columns, schema=self.schema))
+
+    def finish(self):
+        self.writer.close()
+        os.replace(self.partial_path, self.path)
+
+
+class MultiSink(RowSink):
+    """Fan every batch out to several sinks, e.g. the template CSV plus JSONL and SQLite copies.
+
+    The first sink is the primary output; the others are written from the
+    same batches, so all of them hold the same rows at every checkpoint.
+    """
+
+    def __init__(self, sinks, flush_rows=25, flush_interval=5.0, transform=None):
+        self.sinks = sinks
+        super().__init__(sinks[0].path, sinks[0].append, flush_rows, flush_interval, transform)
+
+    def open_output(self):
+        pass  # Every sink opened its own output
+
+    def write_rows(self, rows):
+        for sink in self.sinks:
+            sink.write_rows(rows)
+
+    def checkpoint(self):
+        self.flush()
+        return all([sink.checkpoint() for sink in self.sinks])
+
+    def finish(self):
+        for sink in self.sinks:
+            sink.finish()
+
+
+def read_csv_header(path):
+    with open(path, newline='', encoding='utf-8') as csv_file:
+        return next(csv.reader(csv_file), None)
+
+
+def read_csv_rows(path):
+    """Yield the rows of a template CSV as OUTPUT_FIELDS dicts; columns an older template lacks are ''"""
+    with open(path, newline='', encoding='utf-8') as csv_file:
+        reader = csv.reader(csv_file)
+        next(reader, None)  # Header
+        for values in reader:
+            if any(values):
+                yield dict(zip(OUTPUT_FIELDS, values + [''] * (len(OUTPUT_FIELDS) - len(values))))
+
+
+SINK_TYPES = {
+    name: sink_class for name, sink_class, available in (
+        ('csv', CsvSink, True),
+        ('jsonl', JsonlSink, True),
+        ('sqlite', SqliteSink, True),
+        ('parquet', ParquetSink, PYARROW_INSTALLED),
+    ) if available
+}
+EXPORT_FORMATS = ('jsonl', 'sqlite', 'parquet')  # Copies that can be written next to the template
+
+
+def export_path(path, fmt):
+    """Where the fmt copy of the output at path goes: same name, that format's extension"""
+    return os.path.splitext(path)[0] + SINK_TYPES[fmt].extension
+
+
+def open_sink(path, fmt='csv', exports=(), **options):
+    """Open a sink for one of the SINK_TYPES formats, plus a streamed copy for each format in exports.
+
+    Options are RowSink's; with exports, the transform runs once per batch for all of the copies.
+    """
+    for name in (fmt, *exports):
+        if name not in SINK_TYPES:
+            needs = ' (needs pyarrow)' if name == 'parquet' else ''
+            raise ValueError(f"Unknown output format: {name}{needs}")
+    sink = SINK_TYPES[fmt](path, **options)
+    exports = [name for name in dict.fromkeys(exports) if name != fmt]
+    if not exports:
+        return sink
+    copy_options = {'append': options.get('append', False), 'transform': options.get('transform')}
+    copies = [SINK_TYPES[name](export_path(path, name), **copy_options) for name in exports]
+    return MultiSink([sink, *copies], options.get('flush_rows', 25), options.get('flush_interval', 5.0),
+                     options.get('transform'))
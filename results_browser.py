@@ -0,0 +1,178 @@
+import queue
+import threading
+import customtkinter as ctk
+from tkinter import ttk
+from output_sinks import CSV_HEADER, OUTPUT_FIELDS
+from results_store import ResultsStore
+
+ALL_CHOICES = "All"
+ROW_HEIGHT = 24  # Treeview row height in pixels, used to size the window of rows
+LOAD_POLL_MS = 50  # How often the Tk thread checks whether a background reload has finished
+COLUMN_WIDTHS = (260, 90, 280, 200, 90, 100, 110, 120, 90, 80)
+
+
+class ResultsBrowser(ctk.CTkFrame):
+    """Scrollable table of the saved rows that only ever holds the visible ones.
+
+    The Treeview gets one screenful of rows from ResultsStore; the
+    scrollbar, mouse wheel and Page Up/Down move an offset into the
+    filtered result instead of scrolling widgets, so 100k+ rows cost no
+    more to show than 30.
+    """
+
+    def __init__(self, parent, output_file):
+        super().__init__(parent, fg_color="transparent")
+        self.store = ResultsStore(output_file)
+        self.filters = {}
+        self.offset = 0
+        self.visible_rows = 20
+        self.total = 0
+        self.refreshing = False
+        self.loaded = queue.Queue()  # Outcome of the background reload; Tk is only touched from its own thread
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+        self.create_filter_bar()
+        self.create_table()
+
+    def create_filter_bar(self):
+        bar = ctk.CTkFrame(self, fg_color="transparent")
+        bar.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 10))
+
+        ctk.CTkLabel(bar, text="📍 Province:", font=ctk.CTkFont(size=13)).pack(side="left", padx=(0, 5))
+        self.province_menu = ctk.CTkOptionMenu(
+            bar, values=[ALL_CHOICES], width=140, command=lambda _: self.apply_filters()
+        )
+        self.province_menu.pack(side="left", padx=(0, 15))
+
+        ctk.CTkLabel(bar, text="🏫 Type:", font=ctk.CTkFont(size=13)).pack(side="left", padx=(0, 5))
+        self.facility_type_menu = ctk.CTkOptionMenu(
+            bar, values=[ALL_CHOICES], width=110, command=lambda _: self.apply_filters()
+        )
+        self.facility_type_menu.pack(side="left", padx=(0, 15))
+
+        ctk.CTkLabel(bar, text="📅 From:", font=ctk.CTkFont(size=13)).pack(side="left", padx=(0, 5))
+        self.date_from_entry = ctk.CTkEntry(bar, width=100, placeholder_text="YYYY-MM-DD")
+        self.date_from_entry.pack(side="left", padx=(0, 5))
+        ctk.CTkLabel(bar, text="To:", font=ctk.CTkFont(size=13)).pack(side="left", padx=(0, 5))
+        self.date_to_entry = ctk.CTkEntry(bar, width=100, placeholder_text="YYYY-MM-DD")
+        self.date_to_entry.pack(side="left", padx=(0, 15))
+
+        self.search_entry = ctk.CTkEntry(bar, width=180, placeholder_text="🔍 Title, name, email...")
+        self.search_entry.pack(side="left", padx=(0, 10))
+        for entry in (self.date_from_entry, self.date_to_entry, self.search_entry):
+            entry.bind("<Return>", lambda _: self.apply_filters())
+
+        ctk.CTkButton(bar, text="Apply", command=self.apply_filters, width=70).pack(side="left", padx=(0, 10))
+        ctk.CTkButton(bar, text="🔄 Refresh", command=self.refresh, width=90).pack(side="left", padx=(0, 15))
+
+        self.status_label = ctk.CTkLabel(bar, text="", font=ctk.CTkFont(size=12), text_color="gray")
+        self.status_label.pack(side="left")
+
+    def create_table(self):
+        self.tree = ttk.Treeview(self, columns=OUTPUT_FIELDS, show="headings", selectmode="browse")
+        for field, heading, width in zip(OUTPUT_FIELDS, CSV_HEADER, COLUMN_WIDTHS):
+            self.tree.heading(field, text=heading)
+            self.tree.column(field, width=width, anchor="w")
+        self.tree.grid(row=1, column=0, sticky="nsew")
+        self.scrollbar = ttk.Scrollbar(self, orient="vertical", command=self.on_scroll)
+        self.scrollbar.grid(row=1, column=1, sticky="ns")
+
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll_by(-1 if event.delta > 0 else 1) or "break")
+        self.tree.bind("<Button-4>", lambda _: self.scroll_by(-1) or "break")  # X11 wheel
+        self.tree.bind("<Button-5>", lambda _: self.scroll_by(1) or "break")
+        self.tree.bind("<Prior>", lambda _: self.scroll_by(-self.visible_rows) or "break")
+        self.tree.bind("<Next>", lambda _: self.scroll_by(self.visible_rows) or "break")
+
+    def refresh(self):
+        """Reload the source in the background (the first CSV import can take a moment), then redraw"""
+        if self.refreshing:
+            return
+        self.refreshing = True
+        self.status_label.configure(text="⏳ Loading results...")
+
+        def load():
+            error = None
+            try:
+                self.store.refresh()
+            except Exception as e:
+                error = e
+            self.loaded.put(error)
+
+        thread = threading.Thread(target=load)
+        thread.daemon = True
+        thread.start()
+        self.after(LOAD_POLL_MS, self.poll_loaded)
+
+    def poll_loaded(self):
+        try:
+            error = self.loaded.get_nowait()
+        except queue.Empty:
+            self.after(LOAD_POLL_MS, self.poll_loaded)
+            return
+        self.refreshed(error)
+
+    def refreshed(self, error):
+        self.refreshing = False
+        if error is not None:
+            self.status_label.configure(text=f"⚠️ Could not read results: {error}")
+            return
+        self.province_menu.configure(values=[ALL_CHOICES] + self.store.provinces())
+        self.facility_type_menu.configure(values=[ALL_CHOICES] + self.store.facility_types())
+        self.render()
+
+    def apply_filters(self):
+        if self.store.connection is None or self.refreshing:
+            return
+        choice = lambda menu: '' if menu.get() == ALL_CHOICES else menu.get()
+        self.filters = {
+            'province': choice(self.province_menu),
+            'facility_type': choice(self.facility_type_menu),
+            'date_from': self.date_from_entry.get().strip(),
+            'date_to': self.date_to_entry.get().strip(),
+            'search': self.search_entry.get().strip(),
+        }
+        self.offset = 0
+        self.render()
+
+    def on_resize(self, event):
+        visible_rows = max(5, event.height // ROW_HEIGHT - 1)  # Minus the heading
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.render()
+
+    def on_scroll(self, action, amount, unit=None):
+        if action == 'moveto':
+            self.scroll_to(int(float(amount) * self.total))
+        elif unit == 'pages':
+            self.scroll_by(int(amount) * self.visible_rows)
+        else:
+            self.scroll_by(int(amount))
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.offset + rows)
+
+    def scroll_to(self, offset):
+        offset = max(0, min(offset, self.total - self.visible_rows))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def render(self):
+        """Show the rows in the window at self.offset"""
+        if self.store.connection is None or self.refreshing:
+            return
+        self.total = self.store.count(self.filters)
+        self.offset = max(0, min(self.offset, self.total - self.visible_rows))
+        rows = self.store.rows(self.filters, self.offset, self.visible_rows)
+        self.tree.delete(*self.tree.get_children())
+        for row in rows:
+            self.tree.insert("", "end", values=[row[field] for field in OUTPUT_FIELDS])
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, (self.offset + len(rows)) / self.total)
+            self.status_label.configure(
+                text=f"Rows {self.offset + 1:,}-{self.offset + len(rows):,} of {self.total:,} ({self.store.source})"
+            )
+        else:
+            self.scrollbar.set(0, 1)
+            self.status_label.configure(text=f"No matching rows ({self.store.source or 'no results yet'})")
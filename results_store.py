@@ -0,0 +1,158 @@
+import csv
+import io
+import os
+import sqlite3
+from output_sinks import OUTPUT_FIELDS, export_path
+from row_normalizer import normalize_rows
+
+# Filter name -> SQL condition; the filter value fills every ? in it
+FILTER_CONDITIONS = {
+    'province': "province = ?",
+    'facility_type': "facility_type = ?",
+    'date_from': "creation_date >= ?",
+    'date_to': "creation_date <= ?",
+    'search': "(title LIKE '%' || ? || '%' OR name LIKE '%' || ? || '%' OR email LIKE '%' || ? || '%'"
+              " OR region LIKE '%' || ? || '%')",
+}
+BOUNDARY_BYTES = 256  # Bytes before the import position compared to tell an append from a rewrite
+EXPORT_MTIME_SLACK = 2.0  # Seconds the SQLite export may trail the template: each batch goes to the CSV first
+
+
+def has_columns(path):
+    """Whether a SQLite export has every OUTPUT_FIELDS column (one from an older version may not, until appended to)"""
+    connection = sqlite3.connect(path, timeout=30)
+    try:
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(jobs)")}
+    finally:
+        connection.close()
+    return set(OUTPUT_FIELDS) <= columns
+
+
+def export_is_current(export, output_file):
+    """Whether a SQLite export was written along with the template's latest rows, not left from an earlier run"""
+    if not os.path.exists(output_file):
+        return True
+    # Committed rows sit in the -wal file until a checkpoint, so the main file's mtime alone lags
+    written = max(os.path.getmtime(path) for path in (export, export + '-wal') if os.path.exists(path))
+    return written >= os.path.getmtime(output_file) - EXPORT_MTIME_SLACK
+
+
+class ResultsStore:
+    """Filtered, windowed reads of the saved rows, without loading them all.
+
+    Reads the '<output>.sqlite' export when a crawl keeps it up to date
+    with the template (it is queried live), else the template CSV through
+    an in-memory SQLite cache. The CSV only ever grows between rewrites, so a refresh imports
+    just the bytes appended since the last one.
+    """
+
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self.connection = None
+        self.source = None
+        self.imported_bytes = 0
+        self.boundary = b''  # Last bytes imported, to check the file was only appended to
+        self.csv_mtime = None
+        self.counts = {}  # Row count per filter set, until the next refresh
+
+    def refresh(self):
+        """Pick up rows saved since the last call"""
+        self.counts = {}
+        sqlite_export = export_path(self.output_file, 'sqlite')
+        if (os.path.exists(sqlite_export) and export_is_current(sqlite_export, self.output_file)
+                and (self.source == sqlite_export or has_columns(sqlite_export))):
+            if self.source != sqlite_export:
+                self.close()
+                # Not opened read-only: a WAL database needs its -shm file, which only a writer can create
+                self.connection = sqlite3.connect(sqlite_export, timeout=30, check_same_thread=False)
+                self.source = sqlite_export
+            return
+        if self.source != self.output_file:
+            self.close()
+            self.open_cache()
+        self.import_csv()
+
+    def open_cache(self):
+        self.connection = sqlite3.connect(':memory:', check_same_thread=False)
+        self.connection.execute(f"CREATE TABLE jobs (id INTEGER PRIMARY KEY, {', '.join(OUTPUT_FIELDS)})")
+        for column in ('creation_date', 'facility_type', 'province'):
+            self.connection.execute(f"CREATE INDEX jobs_{column} ON jobs ({column})")
+        self.source = self.output_file
+        self.imported_bytes = 0
+        self.boundary = b''
+        self.csv_mtime = None
+
+    def import_csv(self):
+        try:
+            stat = os.stat(self.output_file)
+        except OSError:
+            self.connection.execute("DELETE FROM jobs")
+            self.imported_bytes = 0
+            return
+        if stat.st_mtime == self.csv_mtime and stat.st_size == self.imported_bytes:
+            return
+        with open(self.output_file, 'rb') as csv_file:
+            csv_file.seek(self.imported_bytes - len(self.boundary))
+            if csv_file.read(len(self.boundary)) != self.boundary:
+                # Rewritten (new crawl or merge), not appended to
+                self.connection.execute("DELETE FROM jobs")
+                self.imported_bytes = 0
+                self.boundary = b''
+                csv_file.seek(0)
+            data = csv_file.read()
+        complete = data[:data.rfind(b'\n') + 1]  # A row still being written waits for the next refresh
+        reader = csv.reader(io.StringIO(complete.decode('utf-8'), newline=''))
+        if self.imported_bytes == 0:
+            next(reader, None)  # Header
+        rows = [dict(zip(OUTPUT_FIELDS, values + [''] * len(OUTPUT_FIELDS))) for values in reader if any(values)]
+        if rows and not rows[0]['province']:
+            rows = normalize_rows(rows)  # A template from before the Province/City/District columns
+        self.connection.executemany(
+            f"INSERT INTO jobs ({', '.join(OUTPUT_FIELDS)}) VALUES ({', '.join('?' * len(OUTPUT_FIELDS))})",
+            ([row[field] for field in OUTPUT_FIELDS] for row in rows)
+        )
+        self.connection.commit()
+        self.imported_bytes += len(complete)
+        self.boundary = (self.boundary + complete)[-BOUNDARY_BYTES:]
+        self.csv_mtime = stat.st_mtime
+
+    def where(self, filters):
+        conditions = []
+        params = []
+        for name, value in sorted((filters or {}).items()):
+            if not value:
+                continue
+            condition = FILTER_CONDITIONS[name]
+            conditions.append(condition)
+            params.extend([value] * condition.count('?'))
+        return (' WHERE ' + ' AND '.join(conditions)) if conditions else '', params
+
+    def count(self, filters=None):
+        key = tuple(sorted((filters or {}).items()))
+        if key not in self.counts:
+            where, params = self.where(filters)
+            self.counts[key] = self.connection.execute(f"SELECT COUNT(*) FROM jobs{where}", params).fetchone()[0]
+        return self.counts[key]
+
+    def rows(self, filters=None, offset=0, limit=50):
+        """One window of matching rows, newest first, as OUTPUT_FIELDS dicts"""
+        where, params = self.where(filters)
+        cursor = self.connection.execute(
+            f"SELECT {', '.join(OUTPUT_FIELDS)} FROM jobs{where} ORDER BY creation_date DESC, id DESC LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        )
+        return [dict(zip(OUTPUT_FIELDS, row)) for row in cursor]
+
+    def provinces(self):
+        cursor = self.connection.execute("SELECT DISTINCT province FROM jobs ORDER BY 1")
+        return [row[0] for row in cursor if row[0]]
+
+    def facility_types(self):
+        cursor = self.connection.execute("SELECT DISTINCT facility_type FROM jobs ORDER BY 1")
+        return [row[0] for row in cursor if row[0]]
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+        self.connection = None
+        self.source = None
@@ -0,0 +1,157 @@
+"""
+Clean-up stage for saved rows, run on each batch before it is written.
+
+Emails are normalized and validated with precompiled patterns; addresses
+are split into province / city / district (시도 / 시군구 / 읍면동) with an
+index of Korean administrative divisions built once at import. Rows of
+one facility repeat the same address and email, so both lookups are
+memoized per distinct string.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+NORMALIZED_FIELDS = ['province', 'city', 'district', 'email_valid']
+CACHE_SIZE = 65536
+
+# 시도 -> 시군구; a city with 일반구 lists them after a colon
+ADMINISTRATIVE_DIVISIONS = {
+    '서울특별시': '종로구 중구 용산구 성동구 광진구 동대문구 중랑구 성북구 강북구 도봉구 노원구 은평구 서대문구 마포구 '
+             '양천구 강서구 구로구 금천구 영등포구 동작구 관악구 서초구 강남구 송파구 강동구',
+    '부산광역시': '중구 서구 동구 영도구 부산진구 동래구 남구 북구 해운대구 사하구 금정구 강서구 연제구 수영구 사상구 기장군',
+    '대구광역시': '중구 동구 서구 남구 북구 수성구 달서구 달성군 군위군',
+    # 제물포구, 영종구 and 검단구 replaced 중구, 동구 and part of 서구 in July 2026; older addresses keep the old names
+    '인천광역시': '중구 동구 미추홀구 연수구 남동구 부평구 계양구 서구 강화군 옹진군 제물포구 영종구 검단구',
+    '광주광역시': '동구 서구 남구 북구 광산구',
+    '대전광역시': '동구 중구 서구 유성구 대덕구',
+    '울산광역시': '중구 남구 동구 북구 울주군',
+    '세종특별자치시': '',
+    '경기도': '수원시:장안구,권선구,팔달구,영통구 성남시:수정구,중원구,분당구 의정부시 안양시:만안구,동안구 '
+           '부천시:원미구,소사구,오정구 광명시 평택시 동두천시 안산시:상록구,단원구 고양시:덕양구,일산동구,일산서구 '
+           '과천시 구리시 남양주시 오산시 시흥시 군포시 의왕시 하남시 용인시:처인구,기흥구,수지구 파주시 이천시 안성시 '
+           '김포시 화성시:만세구,효행구,병점구,동탄구 광주시 양주시 포천시 여주시 연천군 가평군 양평군',
+    '강원특별자치도': '춘천시 원주시 강릉시 동해시 태백시 속초시 삼척시 홍천군 횡성군 영월군 평창군 정선군 철원군 화천군 '
+               '양구군 인제군 고성군 양양군',
+    '충청북도': '청주시:상당구,서원구,흥덕구,청원구 충주시 제천시 보은군 옥천군 영동군 증평군 진천군 괴산군 음성군 단양군',
+    '충청남도': '천안시:동남구,서북구 공주시 보령시 아산시 서산시 논산시 계룡시 당진시 금산군 부여군 서천군 청양군 홍성군 '
+            '예산군 태안군',
+    '전북특별자치도': '전주시:완산구,덕진구 군산시 익산시 정읍시 남원시 김제시 완주군 진안군 무주군 장수군 임실군 순창군 '
+               '고창군 부안군',
+    '전라남도': '목포시 여수시 순천시 나주시 광양시 담양군 곡성군 구례군 고흥군 보성군 화순군 장흥군 강진군 해남군 영암군 '
+            '무안군 함평군 영광군 장성군 완도군 진도군 신안군',
+    '경상북도': '포항시:남구,북구 경주시 김천시 안동시 구미시 영주시 영천시 상주시 문경시 경산시 의성군 청송군 영양군 '
+            '영덕군 청도군 고령군 성주군 칠곡군 예천군 봉화군 울진군 울릉군',
+    '경상남도': '창원시:의창구,성산구,마산합포구,마산회원구,진해구 진주시 통영시 사천시 김해시 밀양시 거제시 양산시 '
+            '의령군 함안군 창녕군 고성군 남해군 하동군 산청군 함양군 거창군 합천군',
+    '제주특별자치도': '제주시 서귀포시',
+}
+# Short and former names, in addition to the full name and its first two characters (서울, 부산, 경기 ...)
+PROVINCE_ALIASES = {
+    '충북': '충청북도', '충남': '충청남도', '전북': '전북특별자치도', '전라북도': '전북특별자치도',
+    '전남': '전라남도', '경북': '경상북도', '경남': '경상남도', '강원도': '강원특별자치도',
+    '제주도': '제주특별자치도', '세종시': '세종특별자치시',
+}
+
+EMAIL_PATTERN = re.compile(
+    r"^[a-z0-9.!#$%&'*+/=?^_`{|}~-]+@[a-z0-9](?:[a-z0-9-]*[a-z0-9])?(?:\.[a-z0-9](?:[a-z0-9-]*[a-z0-9])?)*\.[a-z]{2,}$"
+)
+EMAIL_AT_PATTERN = re.compile(r'\s*(?:\[at\]|\(at\)|\{at\}|\sat\s)\s*', re.IGNORECASE)
+EMAIL_DOT_PATTERN = re.compile(r'\s*(?:\[dot\]|\(dot\)|\{dot\})\s*', re.IGNORECASE)
+EMAIL_TRIM_PATTERN = re.compile(r'^(?:mailto:|[\s<("\'])+|[\s>)"\'.,;:]+$', re.IGNORECASE)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+EMAIL_DOMAIN_FIXES = {  # Common typos of the big Korean providers
+    'naver.co': 'naver.com', 'navercom': 'naver.com', 'nate.co': 'nate.com', 'hanmail.ner': 'hanmail.net',
+    'hanmail.com': 'hanmail.net', 'daum.com': 'daum.net', 'gmail.co': 'gmail.com', 'gmial.com': 'gmail.com',
+}
+DISTRICT_SUFFIXES = ('읍', '면', '동', '가', '리', '로', '길')
+
+
+def build_region_index():
+    """(alias -> province, province -> {시군구 -> tuple of 일반구})"""
+    aliases = dict(PROVINCE_ALIASES)
+    cities = {}
+    for province, listing in ADMINISTRATIVE_DIVISIONS.items():
+        aliases[province] = province
+        aliases.setdefault(province[:2], province)
+        cities[province] = {}
+        for entry in listing.split():
+            city, _, wards = entry.partition(':')
+            cities[province][city] = tuple(wards.split(',')) if wards else ()
+    return aliases, cities
+
+
+PROVINCE_INDEX, CITY_INDEX = build_region_index()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def canonical_province(name):
+    """Full province name for '서울', '경남', '서울시', '강원도' ...; '' when unknown"""
+    name = (name or '').strip()
+    if name in PROVINCE_INDEX:
+        return PROVINCE_INDEX[name]
+    if name.endswith('시') and name[:-1] in PROVINCE_INDEX:
+        return PROVINCE_INDEX[name[:-1]]
+    return ''
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def split_region(region):
+    """(province, city, district) of a free-form address; parts that can't be matched are ''.
+
+    '경상남도 창원시 의창구 북면' -> ('경상남도', '창원시 의창구', '북면')
+    '서울 강남구 역삼동 123-4' -> ('서울특별시', '강남구', '역삼동')
+    """
+    tokens = WHITESPACE_PATTERN.split(unicodedata.normalize('NFKC', region or '').strip())
+    if not tokens or not tokens[0]:
+        return '', '', ''
+    province = canonical_province(tokens[0])
+    if not province:
+        return '', '', ''
+    rest = tokens[1:]
+    city = ''
+    cities = CITY_INDEX[province]
+    if rest and rest[0] in cities:
+        city = rest.pop(0)
+        if rest and rest[0] in cities[city]:
+            city = f"{city} {rest.pop(0)}"
+    district = rest[0] if rest and rest[0].endswith(DISTRICT_SUFFIXES) and not rest[0][0].isdigit() else ''
+    return province, city, district
+
+
+def province_of(area):
+    """Canonical province of a results-list area cell or an address; '' when unknown"""
+    return split_region(area)[0]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def normalize_email(email):
+    """Lowercased address with spacing, obfuscation ([at], (dot)) and common domain typos fixed; '' if invalid"""
+    email = unicodedata.normalize('NFKC', email or '')
+    email = EMAIL_AT_PATTERN.sub('@', email)
+    email = EMAIL_DOT_PATTERN.sub('.', email)
+    email = WHITESPACE_PATTERN.sub('', EMAIL_TRIM_PATTERN.sub('', email)).lower()
+    local, at, domain = email.rpartition('@')
+    if at:
+        email = f"{local}@{EMAIL_DOMAIN_FIXES.get(domain, domain)}"
+    return email if EMAIL_PATTERN.match(email) else ''
+
+
+def normalize_rows(rows):
+    """Batch stage for a sink: clean emails and add NORMALIZED_FIELDS to every row.
+
+    An email that can't be repaired is kept as written, with email_valid N.
+    """
+    normalized = []
+    for row in rows:
+        email = normalize_email(row.get('email', ''))
+        province, city, district = split_region(row.get('region', ''))
+        normalized.append({
+            **row,
+            'email': email or row.get('email', ''),
+            'province': province,
+            'city': city,
+            'district': district,
+            'email_valid': ('Y' if email else 'N') if row.get('email') else '',
+        })
+    return normalized
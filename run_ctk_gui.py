@@ -2,6 +2,8 @@
 """
 CustomTkinter Job Automation GUI Launcher
 This script launches the advanced GUI application with customtkinter styling.
+
+    python run_ctk_gui.py --debug-startup   # Print where the startup time went
 """
 
 import sys
@@ -10,11 +12,16 @@ import os
 # Add current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from startup_timer import StartupTimer, debug_requested
+
 try:
+    startup_timer = StartupTimer() if debug_requested() else None
     from job_automation_gui_ctk import main
+    if startup_timer:
+        startup_timer.mark('imports')
     print("🚀 Starting CustomTkinter Job Automation GUI...")
     print("✨ Features: Modern Dark/Light Themes, Advanced Styling, Beautiful UI")
-    main()
+    main(startup_timer)
 except ImportError as e:
     print(f"❌ Error importing required modules: {e}")
     print("📦 Please make sure all dependencies are installed:")
@@ -0,0 +1,313 @@
+import asyncio
+import copy
+import multiprocessing
+import os
+import queue
+import threading
+from automation_engine import AutomationEngine, create_backend, days_back_cutoff, find_last_page
+from contact_index import row_key
+from listing_index import content_hash
+from output_sinks import open_sink, read_csv_rows
+from row_normalizer import normalize_rows
+
+STOP_POLL_INTERVAL = 0.2  # Seconds between a worker's checks for stop / last page updates
+
+
+def shard_file(path, shard_index):
+    return f"{path}.shard{shard_index + 1}"
+
+
+def run_shard(config, events, stop_event, last_page):
+    """Worker process: crawl one shard and forward its events, tagged with the shard index"""
+    engine = AutomationEngine(config)
+
+    def forward(event):
+        if event['type'] == 'last_page' and event['page'] >= 0:
+            with last_page.get_lock():
+                if not last_page.value or event['page'] < last_page.value:
+                    last_page.value = event['page']
+        events.put({**event, 'shard': config.shard_index})
+
+    def watch():
+        while not stop_event.wait(STOP_POLL_INTERVAL):
+            if last_page.value:
+                engine.limit_pages(last_page.value)
+        engine.request_stop()
+
+    if last_page.value:
+        engine.limit_pages(last_page.value)  # Probed by the coordinator before the workers started
+    engine.subscribe(forward)
+    watcher = threading.Thread(target=watch)
+    watcher.daemon = True
+    watcher.start()
+    engine.run_sync()
+
+
+def merge_outputs(output_file, shard_files, output_format='csv', append=False, key=content_hash, exports=(),
+                  transform=None):
+    """Merge shard CSVs into the output, dropping rows whose key was seen; returns (rows written, duplicates)"""
+    seen = set()
+    if append and os.path.exists(output_file) and output_format == 'csv':
+        seen.update(key(row) for row in read_csv_rows(output_file))
+    rows = []
+    duplicates = 0
+    for path in shard_files:
+        if not os.path.exists(path):
+            continue
+        for row in read_csv_rows(path):
+            digest = key(row)
+            if digest in seen:
+                duplicates += 1
+                continue
+            seen.add(digest)
+            rows.append(row)
+    # Newest first, like the site's own ordering
+    rows.sort(key=lambda row: row['creation_date'], reverse=True)
+    # The transform is idempotent: shard rows already went through it, rows of an older output being appended to haven't
+    with open_sink(output_file, output_format, exports, append=append, transform=transform) as sink:
+        for row in rows:
+            sink.write_row(row)
+    return len(rows), duplicates
+
+
+class ShardCoordinator:
+    """Split the results pager across worker processes and merge what they save.
+
+    Shard k of N crawls pages k+1, k+1+N, ... with its own backend (and
+    browser), its own CSV and checkpoint, and the shared listing index.
+    A fresh run first binary-searches the pager for the last page in the
+    date window, so no worker starts on a page past it. When a shard finds the last page worth crawling (end of the pager, the
+    date cutoff or a fully known page) it publishes it so the others stop
+    there too. At the end the shard files are de-duplicated into the
+    template; this also drops the repeats from listings moving between
+    pages mid-crawl, or from a jump past the end that the site clamps to
+    its last page. Publishes the same events as AutomationEngine, plus
+    'shard_progress' with one dict per worker.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.subscribers = []
+        self.stop_requested = False
+        self.total_saved = 0
+        self.high_water_mark = None  # Newest creation date any shard saved
+        self.errors = []
+        self.shards = [
+            {'shard': index, 'page': index + 1, 'saved': 0, 'state': 'starting'}
+            for index in range(config.shard_count)
+        ]
+
+    @property
+    def current_page(self):
+        """Furthest page any worker has reached"""
+        return max(shard['page'] for shard in self.shards)
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def emit(self, event_type, **kwargs):
+        event = {'type': event_type, **kwargs}
+        for callback in self.subscribers:
+            callback(event)
+
+    def log(self, text):
+        self.emit('log', text=text)
+
+    def request_stop(self):
+        """Ask every worker to stop; safe to call from any thread"""
+        self.stop_requested = True
+
+    def shard_config(self, index):
+        shard_config = copy.copy(self.config)
+        shard_config.shard_index = index
+        shard_config.output_file = shard_file(self.config.output_file, index)
+        shard_config.output_format = 'csv'
+        shard_config.export_formats = ()  # Written once, by the merge
+        shard_config.checkpoint_file = shard_file(self.config.checkpoint_file, index)
+        shard_config.metrics_file = shard_file(self.config.metrics_file, index) if self.config.metrics_file else None
+        shard_config.prometheus_file = None
+        if self.config.user_data_dir:
+            # Chromium locks a profile directory to one browser
+            shard_config.user_data_dir = shard_file(self.config.user_data_dir, index)
+        return shard_config
+
+    def shard_indexes(self):
+        """Shards to run: all of them, or on resume only those with a checkpoint left"""
+        config = self.config
+        everything = list(range(config.shard_count))
+        if not config.resume:
+            for index in everything:
+                for path in (shard_file(config.output_file, index), shard_file(config.checkpoint_file, index)):
+                    if os.path.exists(path):
+                        os.remove(path)
+            return everything
+        unfinished = [index for index in everything if os.path.exists(shard_file(config.checkpoint_file, index))]
+        if not unfinished:
+            self.log("⏯️ No shard checkpoints found - starting from page 1")
+            return everything
+        return unfinished
+
+    async def run(self):
+        """Same interface as AutomationEngine.run; the coordination loop blocks, so it runs in a thread"""
+        await asyncio.to_thread(self.run_sync)
+
+    def run_sync(self):
+        try:
+            self.run_shards()
+        except Exception as e:
+            self.emit('error', text=f"Automation error: {str(e)}")
+            self.log(f"❌ Error: {str(e)}")
+        finally:
+            self.emit('finished')
+
+    def probe_last_page(self):
+        """Last page in the date window, found with O(log n) page loads before any worker starts"""
+        config = self.config
+        cutoff_date = None
+        if config.date_filter_enabled:
+            cutoff_date = days_back_cutoff(config.days_back)
+
+        async def probe():
+            backend = create_backend(config, self.log, date_from=cutoff_date.strftime("%Y-%m-%d") if cutoff_date else None)
+            try:
+                await backend.open()
+                return await find_last_page(backend, cutoff_date)
+            finally:
+                await backend.close()
+
+        last_page = asyncio.run(probe())
+        self.log(f"🔎 Listings in range end on page {last_page}")
+        self.emit('stats_update', total_pages=last_page)
+        return last_page
+
+    def run_shards(self):
+        config = self.config
+        indexes = self.shard_indexes()
+        for shard in self.shards:
+            if shard['shard'] not in indexes:
+                shard['state'] = 'done'
+
+        context = multiprocessing.get_context('spawn')
+        events = context.Queue()
+        stop_event = context.Event()
+        last_page = context.Value('i', 0)
+        if not config.resume:
+            # Resumed shards keep the date window of their checkpoints and publish the end themselves
+            try:
+                last_page.value = self.probe_last_page()
+            except Exception as e:
+                self.log(f"⚠️ Could not probe the last page ({str(e)}) - the workers will find it")
+            else:
+                for shard in self.shards:
+                    if shard['page'] > last_page.value:
+                        shard['state'] = 'done'
+                indexes = [index for index in indexes if index < last_page.value]
+        self.log(f"🧩 Splitting the crawl across {len(indexes)} worker processes")
+        processes = [
+            context.Process(target=run_shard, args=(self.shard_config(index), events, stop_event, last_page))
+            for index in indexes
+        ]
+        for process in processes:
+            process.daemon = True
+            process.start()
+
+        running = set(indexes)
+        while running:
+            if self.stop_requested:
+                stop_event.set()
+            try:
+                event = events.get(timeout=STOP_POLL_INTERVAL)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    break  # A worker died without reporting 'finished'
+                continue
+            if event['type'] == 'finished':
+                running.discard(event['shard'])
+            self.handle_shard_event(event)
+        for process in processes:
+            process.join()
+
+        for shard in self.shards:
+            if shard['state'] in ('starting', 'running'):
+                shard['state'] = 'failed'
+                self.log(f"❌ W{shard['shard'] + 1} exited without finishing")
+        self.emit('shard_progress', shards=[dict(shard) for shard in self.shards])
+        failed = [f"W{shard['shard'] + 1}" for shard in self.shards if shard['state'] == 'failed']
+        if failed:
+            # Merging now would write a template missing the failed workers' pages (or an empty one)
+            self.log(f"❌ {', '.join(failed)} failed - {config.output_file} left unchanged, "
+                     f"the workers' own outputs are kept")
+            if not self.errors:
+                self.errors.append(f"{len(failed)} worker processes exited without finishing")
+                self.emit('error', text=f"{self.errors[-1]} - results were not merged")
+            return
+        self.merge(indexes)
+
+    def handle_shard_event(self, event):
+        shard = self.shards[event['shard']]
+        name = f"W{event['shard'] + 1}"
+        msg_type = event['type']
+        if msg_type == 'log':
+            self.log(f"[{name}] {event['text']}")
+            return
+        if msg_type == 'stats_update':
+            shard['page'] = event.get('current_page', shard['page'])
+            shard['saved'] = event.get('total_saved', shard['saved'])
+            shard['state'] = 'running'
+            if 'memory_mb' in event:
+                shard['memory_mb'] = event['memory_mb']
+                shard['recycles'] = event['recycles']
+            self.total_saved = sum(each['saved'] for each in self.shards)
+            self.emit('stats_update', total_saved=self.total_saved, current_page=self.current_page,
+                      memory_mb=sum(each.get('memory_mb', 0) for each in self.shards),
+                      recycles=sum(each.get('recycles', 0) for each in self.shards))
+        elif msg_type == 'current_job':
+            creation_date = event['data'].get('creation_date', '')
+            if creation_date > (self.high_water_mark or ''):
+                self.high_water_mark = creation_date
+            self.emit('current_job', data=event['data'])
+        elif msg_type == 'throughput':
+            shard['listings_per_minute'] = event['listings_per_minute']
+            self.emit('throughput', listings_per_minute=sum(each.get('listings_per_minute', 0) for each in self.shards),
+                      page_eta=None)
+        elif msg_type == 'date_cutoff':
+            shard['state'] = 'cutoff'
+        elif msg_type == 'complete':
+            shard['state'] = 'complete'
+        elif msg_type == 'error':
+            shard['state'] = 'failed'  # Kept when its 'finished' follows
+            self.errors.append(event['text'])
+            self.emit('error', text=f"{name}: {event['text']}")
+        elif msg_type == 'finished':
+            if shard['state'] in ('starting', 'running'):
+                shard['state'] = 'stopped' if self.stop_requested else 'done'
+        self.emit('shard_progress', shards=[dict(each) for each in self.shards])
+
+    def merge(self, indexes):
+        config = self.config
+        shard_outputs = [shard_file(config.output_file, index) for index in range(config.shard_count)]
+        # Shards de-duplicate contacts only among their own rows; repeats across shards go here
+        key = content_hash if config.contact_policy == 'keep' else row_key
+        written, duplicates = merge_outputs(
+            config.output_file, shard_outputs, config.output_format, config.appending, key, config.export_formats,
+            normalize_rows if config.normalize_rows else None
+        )
+        self.total_saved = written
+        for shard in self.shards:
+            self.log(f"📊 W{shard['shard'] + 1}: {shard['saved']} saved, last page {shard['page']} ({shard['state']})")
+        self.log(f"🧩 Merged {written} rows into {config.output_file} ({duplicates} duplicates dropped)")
+
+        unfinished = [index for index in indexes if os.path.exists(shard_file(config.checkpoint_file, index))]
+        if unfinished:
+            self.log(f"💾 {len(unfinished)} workers saved their progress - use Resume to continue")
+            return
+        for path in shard_outputs:
+            if os.path.exists(path):
+                os.remove(path)
+        if self.stop_requested or self.errors:
+            return
+        if any(shard['state'] == 'cutoff' for shard in self.shards):
+            self.emit('date_cutoff')
+        else:
+            self.emit('complete')
+        self.log(f"📄 Results saved to original template: {config.output_file}")
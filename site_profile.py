@@ -0,0 +1,54 @@
+"""
+Navigation contract of the childcare.go.kr job offer board.
+
+The listings page drives everything through small JS helpers that submit
+its search form: fnSearch (search with the current filters), page_next
+(same form, next pageIndex) and fnGoBoardSl(id) (post the listing ID to the
+detail view). Both fetch backends and the local fixture server share the
+names below, so a change on the site only needs to be made here.
+"""
+
+import os
+
+DEFAULT_LIST_URL = 'https://central.childcare.go.kr/ccef/job/JobOfferSlPL.jsp?flag=SlPL'
+# Point the crawl at a local stand-in server (see fixture_server.py)
+LIST_URL = os.environ.get('JOB_AUTOMATION_LIST_URL', DEFAULT_LIST_URL)
+DETAIL_PATH = 'JobOfferSlPV.jsp'
+
+# Search form fields
+FLAG_FIELD = 'flag'
+LIST_FLAG = 'SlPL'
+DETAIL_FLAG = 'SlPV'
+DEADLINE_FIELD = 'endYn'
+HIRING_VALUE = 'N'  # 구인중
+PAGE_INDEX_FIELD = 'pageIndex'
+DETAIL_ID_FIELD = 'slSeq'
+# Registration date lower bound (YYYY-MM-DD). Only filled in when the search
+# form actually has this field; otherwise the date window is checked per row.
+DATE_FROM_FIELD = 'searchRegDtFrom'
+
+# Selectors
+SEARCH_BUTTON_SELECTOR = 'a[href="#fnSearch"][onclick*="fnSearch"]'
+RESULT_ROWS_SELECTOR = 'table tbody tr'
+TITLE_LINK_SELECTOR = 'td:nth-child(3) a[onclick*="fnGoBoardSl"]'
+CREATION_DATE_SELECTOR = 'td:nth-child(8)'
+# The area column is taken from fixtures/job_list.html, not a captured page; the crawl warns when
+# none of a page's area cells names a province, so verify it against the live site when that shows up
+AREA_SELECTOR = 'td:nth-child(2)'  # Province (시도)
+# Also from the fixture: the 'skip' contact policy keys facilities on this cell, and the crawl warns
+# when most of a page's cells are empty or look like dates or numbers
+FACILITY_NAME_SELECTOR = 'td:nth-child(4)'  # 어린이집명
+NEXT_PAGE_SELECTOR = 'a[href="#page_next"][class="next"]'
+# Handler of a listing's title link, for re-opening a saved listing without its results row
+DETAIL_ONCLICK = "fnGoBoardSl('{listing_id}')"
+
+# Detail page fields in the first table's body rows:
+# (field, row, td position in the row, header label expected in that row, first text node only)
+# The labels come from fixtures/job_detail.html, not a captured page; a mismatch is logged and the
+# field is still read by position, so update them from the live site when the warning shows up
+DETAIL_FIELDS = (
+    ('facility_type', 2, 0, '시설유형', True),  # Followed by a tag <span>
+    ('region', 4, 0, '주소', False),
+    ('name', 5, 0, '담당자', False),
+    ('email', 6, 1, '이메일', False),
+)
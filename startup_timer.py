@@ -0,0 +1,80 @@
+"""
+Where the GUI's startup time goes, for --debug-startup.
+
+Phases are marked against the moment the launcher started; imports are
+timed by wrapping __import__, which gives the same self/cumulative
+breakdown as `python -X importtime` without restarting the interpreter.
+Only the standard library modules Python has already loaded are used
+here, so the timer can be set up before anything it measures.
+"""
+
+import builtins
+import os
+import sys
+import time
+
+DEBUG_ENV = 'JOB_AUTOMATION_DEBUG_STARTUP'  # Set to 1 for the report without the command line flag
+REPORT_IMPORTS = 15  # Slowest imports listed in the report
+
+
+def debug_requested(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    return '--debug-startup' in argv or os.environ.get(DEBUG_ENV, '') not in ('', '0')
+
+
+class StartupTimer:
+    """Phase marks and per-module import times from the launcher to an interactive window"""
+
+    def __init__(self, track_imports=True):
+        self.started = time.perf_counter()
+        self.marks = []  # (phase, seconds since start)
+        self.imports = {}  # module: [self seconds, cumulative seconds], first import only
+        self.stack = []  # Seconds spent in nested imports, one entry per import in progress
+        self.original_import = None
+        if track_imports:
+            self.original_import = builtins.__import__
+            builtins.__import__ = self.timed_import
+
+    def timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        module = name
+        if level:
+            package = (globals or {}).get('__package__') or ''
+            package = package.rsplit('.', level - 1)[0] if level > 1 else package
+            module = f"{package}.{name}" if name else package
+        if module in sys.modules:
+            return self.original_import(name, globals, locals, fromlist, level)
+        self.stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            cumulative = time.perf_counter() - started
+            nested = self.stack.pop()
+            if self.stack:
+                self.stack[-1] += cumulative
+            self.imports.setdefault(module, [cumulative - nested, cumulative])
+
+    def stop_tracking(self):
+        if self.original_import is not None:
+            builtins.__import__ = self.original_import
+            self.original_import = None
+
+    def mark(self, phase):
+        self.marks.append((phase, time.perf_counter() - self.started))
+
+    def elapsed(self, phase):
+        return next((seconds for name, seconds in self.marks if name == phase), None)
+
+    def report(self, top=REPORT_IMPORTS):
+        """Lines of the timing report: each phase, then the slowest imports like -X importtime"""
+        lines = ["⏱️ Startup timing (ms since the launcher started):"]
+        previous = 0.0
+        for phase, seconds in self.marks:
+            lines.append(f"   {phase:<20} {seconds * 1000:>8.0f}   (+{(seconds - previous) * 1000:.0f})")
+            previous = seconds
+        if self.imports:
+            lines.append(f"📦 Slowest imports (self | cumulative ms), {len(self.imports)} modules imported:")
+            slowest = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)[:top]
+            for name, (own, cumulative) in slowest:
+                lines.append(f"   {own * 1000:>8.1f} | {cumulative * 1000:>8.1f} | {name}")
+        return lines